@@ -0,0 +1,33 @@
+"""
+Whole-group marginfi account decoding, one Borsh decode per account vs NumPy columns.
+
+Run with `poetry run python -m benches.bench_columnar`.
+"""
+
+from marginpy.account import MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET, MarginfiAccount
+from marginpy.utils.columnar import decode_marginfi_accounts
+from marginpy.utils.data_conversion import wrapped_fixed_to_float
+
+from benches.utils import load_fixture_data, run
+
+N_ACCOUNTS = 1_000
+
+ACCOUNTS_DATA = [
+    load_fixture_data("marginfi_account_2")[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET]
+] * N_ACCOUNTS
+
+
+def decode_borsh():
+    for data in ACCOUNTS_DATA:
+        account = MarginfiAccount.decode(data)
+        wrapped_fixed_to_float(account.deposit_record)
+        wrapped_fixed_to_float(account.borrow_record)
+
+
+if __name__ == "__main__":
+    run("1k marginfi accounts decoding (Borsh)", decode_borsh, number=1)
+    run(
+        "1k marginfi accounts decoding (NumPy)",
+        lambda: decode_marginfi_accounts(ACCOUNTS_DATA),
+        number=100,
+    )
@@ -0,0 +1,47 @@
+"""
+Native marginfi account/group decoding, against the Borsh layouts of the generated client.
+
+Run with `poetry run python -m benches.bench_decoding`.
+"""
+
+from marginpy import decoding
+from marginpy.account import MarginfiAccount
+from marginpy.group import MarginfiGroup
+from marginpy.utils.data_conversion import wrapped_fixed_to_float
+
+from benches.utils import load_fixture_data, run
+
+MARGINFI_ACCOUNTS = [
+    load_fixture_data("marginfi_account_1"),
+    load_fixture_data("marginfi_account_2"),
+]
+MARGINFI_GROUP = load_fixture_data("marginfi_group_2")
+
+
+def decode_accounts_borsh():
+    for data in MARGINFI_ACCOUNTS:
+        account = MarginfiAccount.decode(data)
+        wrapped_fixed_to_float(account.deposit_record)
+        wrapped_fixed_to_float(account.borrow_record)
+
+
+def decode_accounts_native():
+    for data in MARGINFI_ACCOUNTS:
+        account = decoding.decode_marginfi_account(data)
+        account.deposit_record  # pylint: disable=pointless-statement
+        account.borrow_record  # pylint: disable=pointless-statement
+
+
+if __name__ == "__main__":
+    run("marginfi accounts decoding (Borsh)", decode_accounts_borsh, number=100)
+    run("marginfi accounts decoding (native)", decode_accounts_native, number=10_000)
+    run(
+        "marginfi group decoding (Borsh)",
+        lambda: MarginfiGroup.decode(MARGINFI_GROUP),
+        number=100,
+    )
+    run(
+        "marginfi group decoding (native)",
+        lambda: decoding.decode_marginfi_group(MARGINFI_GROUP),
+        number=10_000,
+    )
@@ -0,0 +1,34 @@
+"""
+Cold vs warm marginfi client construction.
+
+Run with `poetry run python -m benches.bench_idl`.
+"""
+
+from anchorpy import Provider, Wallet
+from marginpy import Environment, MarginfiClient, MarginfiConfig, MarginfiGroup
+from marginpy.utils.idl import IDL_REGISTRY, get_accounts_coder, get_program
+from solana.rpc.async_api import AsyncClient
+
+from benches.utils import load_fixture_data, run
+
+CONFIG = MarginfiConfig(Environment.DEVNET)
+GROUP_DATA = load_fixture_data("marginfi_group_2")
+RPC_CLIENT = AsyncClient("http://localhost:8899")
+
+
+def build_client() -> MarginfiClient:
+    provider = Provider(RPC_CLIENT, Wallet.dummy())
+    program = get_program(CONFIG.program_id, provider)
+    get_accounts_coder()
+    group = MarginfiGroup.from_account_data_raw(CONFIG, program, GROUP_DATA)
+    return MarginfiClient(CONFIG, program, group)
+
+
+def build_client_cold() -> MarginfiClient:
+    IDL_REGISTRY.invalidate()
+    return build_client()
+
+
+if __name__ == "__main__":
+    run("client construction (cold IDL registry)", build_client_cold, number=100)
+    run("client construction (warm IDL registry)", build_client, number=100)
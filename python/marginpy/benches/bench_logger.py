@@ -0,0 +1,45 @@
+"""
+Per-call cost of acquiring a logger, installing the handler on every call vs once.
+
+Run with `poetry run python -m benches.bench_logger`.
+"""
+
+import logging
+
+import coloredlogs  # type: ignore
+from marginpy.logger import get_context_logger, get_logger
+from solana.publickey import PublicKey
+
+from benches.utils import run
+
+NAME = "marginpy.account.MarginfiAccount"
+PUBKEY = PublicKey(bytes(range(32)))
+
+
+def get_logger_reinstall() -> logging.Logger:
+    logger = logging.getLogger(f"{NAME}.{PUBKEY}")
+    coloredlogs.install(
+        logger=logger,
+        level=logger.getEffectiveLevel(),
+        milliseconds=True,
+        fmt="[%(asctime)s] %(name)s %(levelname)s %(message)s",
+    )
+    return logger
+
+
+if __name__ == "__main__":
+    run(
+        "get logger + debug (install on every call)",
+        lambda: get_logger_reinstall().debug("Depositing %s", 1),
+        number=10_000,
+    )
+    run(
+        "get logger + debug (cached)",
+        lambda: get_logger(NAME).debug("Depositing %s", 1),
+        number=100_000,
+    )
+    run(
+        "get context logger + debug (cached)",
+        lambda: get_context_logger(NAME, account=PUBKEY).debug("Depositing %s", 1),
+        number=100_000,
+    )
@@ -0,0 +1,62 @@
+"""
+Native observation throughput, single-threaded vs fanned out across a thread pool.
+
+The native observation functions release the GIL, so the thread pool should scale with cores.
+
+Run with `poetry run python -m benches.bench_observation`.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from marginpy import utp_observation
+
+from benches.utils import load_fixture_data, run
+
+N_OBSERVATIONS = 1_000
+N_WORKERS = os.cpu_count() or 1
+
+MANGO_GROUP = load_fixture_data("mango_group")
+MANGO_ACCOUNT = load_fixture_data("mango_account")
+MANGO_CACHE = load_fixture_data("mango_cache")
+
+ZO_MARGIN = load_fixture_data("zo_margin")
+ZO_CONTROL = load_fixture_data("zo_control")
+ZO_STATE = load_fixture_data("zo_state")
+ZO_CACHE = load_fixture_data("zo_cache")
+
+
+def observe_mango(_=None):
+    return utp_observation.mango.get_observation(
+        MANGO_GROUP, MANGO_ACCOUNT, MANGO_CACHE
+    )
+
+
+def observe_zo(_=None):
+    return utp_observation.zo.get_observation(ZO_MARGIN, ZO_CONTROL, ZO_STATE, ZO_CACHE)
+
+
+def sequential(observe):
+    return lambda: [observe() for _ in range(N_OBSERVATIONS)]
+
+
+def threaded(executor, observe):
+    return lambda: list(executor.map(observe, range(N_OBSERVATIONS)))
+
+
+if __name__ == "__main__":
+    with ThreadPoolExecutor(max_workers=N_WORKERS) as executor:
+        for name, observe in [("Mango", observe_mango), ("01", observe_zo)]:
+            run(f"1k {name} observations (sequential)", sequential(observe), number=5)
+            run(
+                f"1k {name} observations ({N_WORKERS} threads)",
+                threaded(executor, observe),
+                number=5,
+            )
+        run(
+            "1k Mango observations (batch)",
+            lambda: utp_observation.mango.get_observations(
+                MANGO_GROUP, MANGO_CACHE, [MANGO_ACCOUNT] * N_OBSERVATIONS
+            ),
+            number=5,
+        )
@@ -0,0 +1,36 @@
+"""
+Raw vs memoized PDA derivation.
+
+Run with `poetry run python -m benches.bench_pda`.
+"""
+
+from marginpy import Environment, MarginfiConfig
+from marginpy.constants import PDA_UTP_AUTH_SEED
+from marginpy.utils.pda import get_utp_authority
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+
+from benches.utils import run
+
+CONFIG = MarginfiConfig(Environment.DEVNET)
+UTP_PROGRAM_ID = CONFIG.mango.program_id
+AUTHORITY_SEEDS = [Keypair().public_key for _ in range(1_000)]
+
+
+def derive_raw() -> None:
+    for authority_seed in AUTHORITY_SEEDS:
+        PublicKey.find_program_address(
+            [PDA_UTP_AUTH_SEED, bytes(UTP_PROGRAM_ID), bytes(authority_seed)],
+            CONFIG.program_id,
+        )
+
+
+def derive_memoized() -> None:
+    for authority_seed in AUTHORITY_SEEDS:
+        get_utp_authority(UTP_PROGRAM_ID, authority_seed, CONFIG.program_id)
+
+
+if __name__ == "__main__":
+    run("1k UTP authorities (find_program_address)", derive_raw, number=10)
+    derive_memoized()
+    run("1k UTP authorities (memoized, warm)", derive_memoized, number=10)
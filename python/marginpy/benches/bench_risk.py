@@ -0,0 +1,70 @@
+"""
+Group-wide health computation, one account at a time on Python floats vs one vectorized pass,
+on floats or exact I80F48.
+
+Run with `poetry run python -m benches.bench_risk`.
+"""
+
+from math import inf
+
+import numpy as np
+from marginpy.bank import Bank
+from marginpy.group import MarginfiGroup
+from marginpy.risk import UtpObservationArrays, compute_group_risk
+from marginpy.types import LendingSide, MarginRequirement, UtpIndex
+from marginpy.utils.columnar import decode_marginfi_accounts
+
+from benches.utils import load_fixture_data, run
+
+N_ACCOUNTS = 10_000
+
+BANK = Bank(MarginfiGroup.decode(load_fixture_data("marginfi_group_2")).bank)
+ACCOUNTS = decode_marginfi_accounts(
+    [load_fixture_data("marginfi_account_2")] * N_ACCOUNTS
+)
+ACCOUNTS.borrow_record[:] = np.linspace(0, 2 * ACCOUNTS.deposit_record[0], N_ACCOUNTS)
+OBSERVATIONS = {
+    utp_index: UtpObservationArrays(
+        equity=np.ones(N_ACCOUNTS),
+        free_collateral=np.ones(N_ACCOUNTS),
+        observed=np.ones(N_ACCOUNTS, dtype=bool),
+    )
+    for utp_index in UtpIndex
+}
+
+
+def compute_per_account():
+    health = []
+    for i in range(N_ACCOUNTS):
+        assets = BANK.compute_native_amount(
+            ACCOUNTS.deposit_record[i], LendingSide.DEPOSIT
+        )
+        for utp_index in UtpIndex:
+            if ACCOUNTS.active_utps[i, utp_index.value]:
+                assets += OBSERVATIONS[utp_index].free_collateral[i]
+        liabilities = BANK.compute_native_amount(
+            ACCOUNTS.borrow_record[i], LendingSide.BORROW
+        )
+        equity = assets - liabilities
+        for mreq_type in MarginRequirement:
+            requirement = liabilities * BANK.compute_margin_ratio(mreq_type)
+            health.append(equity / requirement if requirement > 0 else inf)
+    return health
+
+
+if __name__ == "__main__":
+    run("10k accounts health (per account)", compute_per_account, number=3)
+    run(
+        "10k accounts health (vectorized)",
+        lambda: compute_group_risk(ACCOUNTS, BANK, OBSERVATIONS).below(
+            MarginRequirement.MAINTENANCE
+        ),
+        number=100,
+    )
+    run(
+        "10k accounts health (vectorized, exact)",
+        lambda: compute_group_risk(ACCOUNTS, BANK, OBSERVATIONS, exact=True).below(
+            MarginRequirement.MAINTENANCE
+        ),
+        number=100,
+    )
@@ -0,0 +1,50 @@
+"""
+Memory held by bulk-loaded marginfi accounts, as full `MarginfiAccount` instances vs snapshots.
+
+Run with `poetry run python -m benches.bench_snapshot`.
+"""
+
+from anchorpy import Program, Provider, Wallet
+from marginpy import MarginfiAccount, MarginfiClient, MarginfiConfig, MarginfiGroup
+from marginpy.snapshot import MarginfiAccountSnapshot
+from marginpy.types import Environment
+from marginpy.utils.columnar import decode_marginfi_accounts
+from marginpy.utils.idl import get_idl
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from benches.utils import load_fixture_data, measure_memory, run
+
+N_ACCOUNTS = 10_000
+
+CONFIG = MarginfiConfig(Environment.DEVNET)
+PROGRAM = Program(
+    get_idl(),
+    CONFIG.program_id,
+    provider=Provider(AsyncClient("http://localhost:8899"), Wallet.dummy()),
+)
+GROUP = MarginfiGroup.from_account_data_raw(
+    CONFIG, PROGRAM, load_fixture_data("marginfi_group_2")
+)
+CLIENT = MarginfiClient(CONFIG, PROGRAM, GROUP)
+ACCOUNT_DATA = load_fixture_data("marginfi_account_2")
+ADDRESSES = [PublicKey(i.to_bytes(32, "little")) for i in range(1, N_ACCOUNTS + 1)]
+
+
+def load_accounts():
+    return [
+        MarginfiAccount.from_account_data_raw(address, CLIENT, ACCOUNT_DATA, GROUP)
+        for address in ADDRESSES
+    ]
+
+
+def load_snapshots():
+    arrays = decode_marginfi_accounts([ACCOUNT_DATA] * N_ACCOUNTS, addresses=ADDRESSES)
+    return MarginfiAccountSnapshot.from_arrays(arrays, CLIENT, GROUP)
+
+
+if __name__ == "__main__":
+    measure_memory("10k accounts memory (MarginfiAccount)", load_accounts)
+    measure_memory("10k accounts memory (snapshots)", load_snapshots)
+    run("10k accounts load (MarginfiAccount)", load_accounts, number=1)
+    run("10k accounts load (snapshots)", load_snapshots, number=10)
@@ -0,0 +1,114 @@
+"""
+01 orderbook decoding, node by node into NamedTuples vs one vectorized pass, and top of book
+walks vs cache hits.
+
+Run with `poetry run python -m benches.bench_zo_orderbook`.
+"""
+
+import base64
+import random
+
+from marginpy.utp.zo.utils.client import util
+from marginpy.utp.zo.utils.client.dex import (
+    AccountFlag,
+    Orderbook,
+    Slab,
+    decode_slab_leaves,
+    decode_slab_top_leaves,
+)
+from solana.publickey import PublicKey
+
+from benches.utils import run
+from tests.utils import ZO_MARKET, make_slab_data
+
+N_ORDERS = 4_000
+
+RNG = random.Random(0)
+CONTROLS = [PublicKey(bytes([i + 1] * 32)) for i in range(100)]
+SLABS = {
+    side: make_slab_data(
+        side,
+        [
+            (
+                RNG.randrange(1, 10_000) << 64 | RNG.randrange(2**64),
+                RNG.randrange(1, 1_000),
+                RNG.choice(CONTROLS),
+            )
+            for _ in range(N_ORDERS)
+        ],
+    )
+    for side in (AccountFlag.BIDS, AccountFlag.ASKS)
+}
+
+SLABS_BASE64 = {side: base64.b64encode(slab).decode() for side, slab in SLABS.items()}
+CACHED_SLABS_BASE64 = {
+    side: base64.b64encode(slab).decode() for side, slab in SLABS.items()
+}
+
+
+def decode_legacy():
+    kw = {
+        "base_decimals": ZO_MARKET.base_decimals,
+        "quote_decimals": ZO_MARKET.quote_decimals,
+        "base_lot_size": ZO_MARKET.base_lot_size,
+        "quote_lot_size": ZO_MARKET.quote_lot_size,
+    }
+    bids = Slab.from_bytes(SLABS[AccountFlag.BIDS])
+    asks = Slab.from_bytes(SLABS[AccountFlag.ASKS])
+    return [
+        (
+            util.lots_to_price(o.key >> 64, **kw),
+            util.lots_to_size(
+                o.quantity,
+                decimals=ZO_MARKET.base_decimals,
+                lot_size=ZO_MARKET.base_lot_size,
+            ),
+        )
+        for slab in (reversed(bids), iter(asks))
+        for o in slab
+    ]
+
+
+def decode_vectorized():
+    return Orderbook(
+        decode_slab_leaves(SLABS[AccountFlag.BIDS])[1],
+        decode_slab_leaves(SLABS[AccountFlag.ASKS])[1],
+        ZO_MARKET,
+    )
+
+
+def build_all_orders(orderbook: Orderbook):
+    return list(orderbook.bids) + list(orderbook.asks)
+
+
+def is_orderbook_data_unchanged():
+    # Same check as `Zo.load_orderbooks`, against freshly fetched (distinct) strings
+    return (
+        CACHED_SLABS_BASE64[AccountFlag.BIDS] == SLABS_BASE64[AccountFlag.BIDS]
+        and CACHED_SLABS_BASE64[AccountFlag.ASKS] == SLABS_BASE64[AccountFlag.ASKS]
+    )
+
+
+if __name__ == "__main__":
+    run("2x4k orders book (node by node)", decode_legacy, number=10)
+    run("2x4k orders book (vectorized)", decode_vectorized, number=1_000)
+    run(
+        "2x4k orders book (vectorized, own orders)",
+        lambda: decode_vectorized().bids.orders_of(CONTROLS[0]),
+        number=1_000,
+    )
+    run(
+        "2x4k orders book (vectorized, all orders built)",
+        lambda: build_all_orders(decode_vectorized()),
+        number=10,
+    )
+    run(
+        "2x4k orders book (top 10 levels walked)",
+        lambda: [decode_slab_top_leaves(slab, 10) for slab in SLABS.values()],
+        number=10_000,
+    )
+    run(
+        "2x4k orders book (cache hit, data compared)",
+        is_orderbook_data_unchanged,
+        number=1_000,
+    )
@@ -0,0 +1,48 @@
+import json
+import os
+import timeit
+import tracemalloc
+from typing import Any, Callable
+
+from marginpy.utils.data_conversion import b64str_to_bytes
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "../tests/fixtures/accounts")
+
+
+def load_fixture_data(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as f:
+        account_info_raw = json.load(f)
+    return b64str_to_bytes(account_info_raw["account"]["data"][0])
+
+
+def run(label: str, func: Callable[[], Any], number: int = 1_000) -> float:
+    """
+    Times `func` over `number` runs and prints the mean duration per call.
+
+    Returns:
+        float: mean duration per call, in seconds
+    """
+
+    per_call = timeit.timeit(func, number=number) / number
+    print(f"{label:<48} {per_call * 1e6:>12.2f} us/call")
+    return per_call
+
+
+def measure_memory(label: str, func: Callable[[], Any]) -> int:
+    """
+    Measures the memory still allocated by the result of `func` once it returns, and prints it.
+
+    Returns:
+        int: allocated memory, in bytes
+    """
+
+    tracemalloc.start()
+    try:
+        # Kept alive until measured
+        result = func()
+        allocated, _ = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    print(f"{label:<48} {allocated / 2**20:>12.2f} MiB")
+    return allocated
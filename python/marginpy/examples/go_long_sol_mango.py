@@ -39,10 +39,7 @@ async def main():
     await account.mango.activate()
     await account.mango.deposit(DEPOSIT_AMOUNT)
 
-    with mango.ContextBuilder.build(
-        cluster_name=account.mango.config.cluster, group_name=account.mango.config.group_name
-    ) as context:
-        market = mango.market(context, "SOL-PERP")
+    market = mango.market(account.mango.context, "SOL-PERP")
 
     await account.mango.place_perp_order(
         perp_market=market,
@@ -7,11 +7,13 @@ from marginpy.client import MarginfiClient
 from marginpy.config import MarginfiConfig
 from marginpy.group import MarginfiGroup
 from marginpy.logger import setup_logging
-from marginpy.marginpy import utp_observation
+from marginpy.marginpy import decoding, utp_observation
+from marginpy.snapshot import MarginfiAccountSnapshot
 from marginpy.types import Environment, UtpIndex
 
 __all__ = [
     "MarginfiAccount",
+    "MarginfiAccountSnapshot",
     "Bank",
     "MarginfiClient",
     "MarginfiConfig",
@@ -23,6 +25,7 @@ __all__ = [
     "constants",
     "types",
     "utp_observation",
+    "decoding",
     "setup_logging",
 ]
 
@@ -1,8 +1,10 @@
+import asyncio
 from math import inf
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from anchorpy import AccountsCoder, Program
-from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from anchorpy import Program
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from marginpy.constants import COLLATERAL_SCALING_FACTOR, UTP_OBSERVATION_TIMEOUT
 from marginpy.group import MarginfiGroup
 from marginpy.instructions import (
     DeactivateUtpAccounts,
@@ -17,10 +19,11 @@ from marginpy.instructions import (
     make_handle_bankruptcy_ix,
     make_withdraw_ix,
 )
-from marginpy.logger import get_logger
+from marginpy.logger import get_context_logger, get_logger
 from marginpy.types import (
     UTP_NAME,
     AccountBalances,
+    AccountBalancesFixed,
     BankVaultType,
     EquityType,
     InstructionsWrapper,
@@ -31,16 +34,17 @@ from marginpy.types import (
     UtpIndex,
 )
 from marginpy.utils.data_conversion import (
-    b64str_to_bytes,
     json_to_account_info,
     ui_to_native,
     wrapped_fixed_to_float,
 )
-from marginpy.utils.misc import load_idl
+from marginpy.utils.fixed import I80F48
+from marginpy.utils.idl import get_accounts_coder
+from marginpy.utils.misc import get_multiple_accounts_data
 from marginpy.utils.pda import get_bank_authority
 from marginpy.utp.account import UtpAccount
 from marginpy.utp.mango import UtpMangoAccount
-from marginpy.utp.observation import UtpObservation
+from marginpy.utp.observation import UtpObservation, UtpObservationError
 from marginpy.utp.zo import UtpZoAccount
 from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
@@ -53,6 +57,12 @@ if TYPE_CHECKING:
     from marginpy.client import MarginfiClient
     from marginpy.config import MarginfiConfig
 
+MARGINFI_ACCOUNT_SIZE = ACCOUNT_DISCRIMINATOR_SIZE + MarginfiAccountData.layout.sizeof()
+# `reserved_space` is the last field of the account: everything before it is enough to compute health
+MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET = (
+    MARGINFI_ACCOUNT_SIZE - MarginfiAccountData.layout.subcons[-1].sizeof()
+)
+
 
 class MarginfiAccount:
     """
@@ -67,6 +77,8 @@ class MarginfiAccount:
     _authority: PublicKey
     _deposit_record: float
     _borrow_record: float
+    _deposit_record_fixed: I80F48
+    _borrow_record_fixed: I80F48
 
     mango: UtpMangoAccount
     zo: UtpZoAccount
@@ -81,6 +93,8 @@ class MarginfiAccount:
         borrow_record: float,
         mango_utp_data: UtpData,
         zo_utp_data: UtpData,
+        deposit_record_fixed: Optional[I80F48] = None,
+        borrow_record_fixed: Optional[I80F48] = None,
     ) -> None:
         self._pubkey = marginfi_account_pk
         self._client = client
@@ -92,6 +106,17 @@ class MarginfiAccount:
 
         self._deposit_record = deposit_record
         self._borrow_record = borrow_record
+        # Raw records, derived from the scaled ones when not provided
+        self._deposit_record_fixed = (
+            deposit_record_fixed
+            if deposit_record_fixed is not None
+            else I80F48.from_number(deposit_record * COLLATERAL_SCALING_FACTOR)
+        )
+        self._borrow_record_fixed = (
+            borrow_record_fixed
+            if borrow_record_fixed is not None
+            else I80F48.from_number(borrow_record * COLLATERAL_SCALING_FACTOR)
+        )
 
         # --- Factories
 
@@ -116,13 +141,15 @@ class MarginfiAccount:
             marginfi_account_pk,
             account_data.authority,
             client,
-            await MarginfiGroup.fetch(client.config, client.program),
+            await client.get_group(),
             wrapped_fixed_to_float(account_data.deposit_record)
             / COLLATERAL_SCALING_FACTOR,
             wrapped_fixed_to_float(account_data.borrow_record)
             / COLLATERAL_SCALING_FACTOR,
             MarginfiAccount._pack_utp_data(account_data, UtpIndex.MANGO),
             MarginfiAccount._pack_utp_data(account_data, UtpIndex.ZO),
+            I80F48.from_wrapped(account_data.deposit_record),
+            I80F48.from_wrapped(account_data.borrow_record),
         )
 
         logger.info("marginfi account loaded:\n%s", account)
@@ -160,6 +187,8 @@ class MarginfiAccount:
             / COLLATERAL_SCALING_FACTOR,
             MarginfiAccount._pack_utp_data(account_data, UtpIndex.MANGO),
             MarginfiAccount._pack_utp_data(account_data, UtpIndex.ZO),
+            I80F48.from_wrapped(account_data.deposit_record),
+            I80F48.from_wrapped(account_data.borrow_record),
         )
 
         return account
@@ -228,6 +257,26 @@ class MarginfiAccount:
             self._borrow_record, LendingSide.BORROW
         )
 
+    @property
+    def deposits_fixed(self) -> I80F48:
+        """
+        Exact deposits, in native units.
+        """
+
+        return self.group.bank.compute_native_amount_fixed(
+            self._deposit_record_fixed, LendingSide.DEPOSIT
+        )
+
+    @property
+    def borrows_fixed(self) -> I80F48:
+        """
+        Exact borrows, in native units.
+        """
+
+        return self.group.bank.compute_native_amount_fixed(
+            self._borrow_record_fixed, LendingSide.BORROW
+        )
+
     # --- Getters / Setters (internal)
 
     @property
@@ -299,8 +348,13 @@ class MarginfiAccount:
     def decode(encoded: bytes) -> MarginfiAccountData:
         """
         Decodes marginfi account data according to the Anchor IDL.
+
+        Data sliced right before `reserved_space` (see `MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET`)
+        is accepted, and decoded with zeroed reserved space.
         """
 
+        if len(encoded) == MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET:
+            encoded = encoded.ljust(MARGINFI_ACCOUNT_SIZE, b"\0")
         return MarginfiAccountData.decode(encoded)  # type: ignore
 
     @staticmethod
@@ -309,40 +363,72 @@ class MarginfiAccount:
         Encodes marginfi account data according to the Anchor IDL.
         """
 
-        coder = AccountsCoder(load_idl())
+        coder = get_accounts_coder()
         return coder.build(decoded)
 
     async def reload(self, observe_utps=False) -> None:
         """
         Updates instance data by fetching and storing the latest on-chain state.
 
+        When `observe_utps` is set, the observation accounts of all active UTPs are fetched
+        along with the marginfi group and account, in a single round trip at a single slot.
+
         Args:
             observe_utps (bool, optional): flag to request UTP observation as well. Defaults to False.
 
         Raises:
+            Exception: group or account not found
             Exception: mismatch between the expected group address and the one decoded from the account data
         """
 
         logger = self.get_logger()
         logger.debug("Reloading account data for %s", self.pubkey)
 
-        marginfi_group_ai, marginfi_account_ai = await self.load_group_and_account_ai()
-        marginfi_account_data = MarginfiAccount.decode(b64str_to_bytes(marginfi_account_ai.data[0]))  # type: ignore
+        observed_utps = self.active_utps if observe_utps else []
+        observation_accounts = await asyncio.gather(
+            *[utp.get_observation_accounts() for utp in observed_utps]
+        )
+        pubkeys = [self._config.group_pk, self.pubkey]
+        for metas in observation_accounts:
+            pubkeys.extend(meta.pubkey for meta in metas)
+
+        accounts_data, slot = await get_multiple_accounts_data(
+            self._program.provider.connection, pubkeys
+        )
+        logger.debug("Loaded %s accounts at slot %s", len(pubkeys), slot)
+
+        [marginfi_group_data, marginfi_account_data_raw] = accounts_data[:2]
+        if marginfi_group_data is None:
+            raise Exception(f"Marginfi group {self._config.group_pk} not found")
+        if marginfi_account_data_raw is None:
+            raise Exception(f"Marginfi account {self.pubkey} not found")
+
+        marginfi_account_data = MarginfiAccount.decode(marginfi_account_data_raw)
         if not marginfi_account_data.marginfi_group == self._config.group_pk:
             raise Exception(
                 "Marginfi account tied to group"
                 f" {marginfi_account_data.marginfi_group}, Expected"
                 " {self._config.group_pk}"
             )
-        self._group = MarginfiGroup.from_account_data_raw(
-            self._config,
-            self._program,
-            b64str_to_bytes(marginfi_group_ai.data[0]),  # type: ignore
+
+        # UTP addresses are captured before the update, to detect prefetched data gone stale
+        prefetched = {}
+        offset = 2
+        for utp, metas in zip(observed_utps, observation_accounts):
+            prefetched[utp.index] = (
+                utp.address,
+                pubkeys[offset : offset + len(metas)],  # noqa: E203
+                accounts_data[offset : offset + len(metas)],  # noqa: E203
+            )
+            offset += len(metas)
+
+        self._group = self.client.group_cache.update_from_account_data_raw(
+            marginfi_group_data, slot
         )
         self._update_from_account_data(marginfi_account_data)
 
         if observe_utps:
-            await self.observe_utps()
+            await self._observe_utps(prefetched)
 
     def _update_from_account_data(self, data: MarginfiAccountData) -> None:
         self._authority = data.authority
@@ -352,6 +438,8 @@ class MarginfiAccount:
         self._borrow_record = (
             wrapped_fixed_to_float(data.borrow_record) / COLLATERAL_SCALING_FACTOR
         )
+        self._deposit_record_fixed = I80F48.from_wrapped(data.deposit_record)
+        self._borrow_record_fixed = I80F48.from_wrapped(data.borrow_record)
 
         self.mango._update(  # pylint: disable=protected-access
             self._pack_utp_data(  # pylint: disable=protected-access
@@ -497,22 +585,99 @@ class MarginfiAccount:
 
         logger = self.get_logger()
 
-        accounts = []
-        for utp in self.active_utps:
-            accounts.extend(await utp.get_observation_accounts())
+        utp_accounts = await asyncio.gather(
+            *[utp.get_observation_accounts() for utp in self.active_utps]
+        )
+        accounts = [account for accounts in utp_accounts for account in accounts]
         logger.debug("Loading %s observation accounts", len(accounts))
         return accounts
 
-    async def observe_utps(self) -> dict[UtpIndex, UtpObservation]:
+    async def observe_utps(
+        self,
+        timeout: float = UTP_OBSERVATION_TIMEOUT,
+        raise_on_error: bool = True,
+    ) -> dict[UtpIndex, UtpObservation]:
+        """
+        Observes all active UTPs concurrently and caches the result.
+
+        Successful observations are cached even when other UTPs fail or time out.
+
+        Args:
+            timeout (float, optional): per-UTP observation timeout, in seconds. Defaults to UTP_OBSERVATION_TIMEOUT.
+            raise_on_error (bool, optional): flag to raise if any UTP could not be observed. Defaults to True.
+
+        Raises:
+            Exception: the single UTP observation that failed or timed out, as is (only if `raise_on_error` is set)
+            UtpObservationError: several UTP observations failed or timed out (only if `raise_on_error` is set)
+
+        Returns:
+            dict[UtpIndex, UtpObservation]: observations of the UTPs that were successfully observed
         """
-        Observes all active UTPs and cache the result.
+
+        return await self._observe_utps({}, timeout, raise_on_error)
+
+    async def _observe_utps(
+        self,
+        prefetched: dict[
+            UtpIndex, Tuple[PublicKey, List[PublicKey], List[Optional[bytes]]]
+        ],
+        timeout: float = UTP_OBSERVATION_TIMEOUT,
+        raise_on_error: bool = True,
+    ) -> dict[UtpIndex, UtpObservation]:
+        """
+        [internal] Observes all active UTPs, from prefetched observation accounts when still valid.
+
+        Args:
+            prefetched (dict): UTP address, observation account addresses and data, per UTP index
         """
 
         logger = self.get_logger()
         logger.debug("Observing UTP accounts")
 
-        observation_cache = {utp.index: await utp.observe() for utp in self.active_utps}
+        async def observe(utp: UtpAccount) -> UtpObservation:
+            if utp.index in prefetched:
+                address, pubkeys, accounts_data = prefetched[utp.index]
+                if address == utp.address:
+                    return utp.observe_from_data(pubkeys, accounts_data)
+            return await utp.observe()
+
+        active_utps = self.active_utps
+        results = await asyncio.gather(
+            *[asyncio.wait_for(observe(utp), timeout) for utp in active_utps],
+            return_exceptions=True,
+        )
+
+        observation_cache = {}
+        errors: dict[UtpIndex, Exception] = {}
+        for utp, result in zip(active_utps, results):
+            if isinstance(result, Exception):
+                errors[utp.index] = result
+            elif isinstance(result, BaseException):
+                # Cancellation and interrupts are not observation failures
+                raise result
+            else:
+                observation_cache[utp.index] = result
+
+        for utp_index, error in errors.items():
+            if isinstance(error, asyncio.TimeoutError):
+                logger.warning(
+                    "Failed to observe %s UTP: timed out after %ss",
+                    UTP_NAME[utp_index],
+                    timeout,
+                )
+            else:
+                logger.warning(
+                    "Failed to observe %s UTP: %r", UTP_NAME[utp_index], error
+                )
+
         self._observation_cache = observation_cache
+
+        if errors and raise_on_error:
+            first_error = next(iter(errors.values()))
+            if len(errors) == 1:
+                raise first_error
+            raise UtpObservationError(errors) from first_error
+
         return observation_cache
 
     async def load_group_and_account_ai(self) -> Tuple[AccountInfo, AccountInfo]:
@@ -569,6 +734,36 @@ class MarginfiAccount:
     def compute_margin_requirement(self, mreq_type: MarginRequirement) -> float:
         return self.borrows * self.group.bank.compute_margin_ratio(mreq_type)
 
+    def compute_balances_fixed(
+        self, equity_type: EquityType = EquityType.INIT_REQ_ADJUSTED
+    ) -> AccountBalancesFixed:
+        """
+        Exact counterpart of `compute_balances`, in native units.
+        """
+
+        assets = self.deposits_fixed
+        for utp in self.active_utps:
+            assets += (
+                utp.free_collateral_fixed
+                if equity_type == EquityType.INIT_REQ_ADJUSTED
+                else utp.equity_fixed
+            )
+        liabilities = self.borrows_fixed
+        equity = assets - liabilities
+
+        return AccountBalancesFixed(
+            equity=equity, assets=assets, liabilities=liabilities
+        )
+
+    def compute_margin_requirement_fixed(self, mreq_type: MarginRequirement) -> I80F48:
+        """
+        Exact counterpart of `compute_margin_requirement`, in native units.
+        """
+
+        return self.borrows_fixed * self.group.bank.compute_margin_ratio_fixed(
+            mreq_type
+        )
+
     def __repr__(self):
         balances = self.compute_balances()
         margin_ratio = (
@@ -604,4 +799,4 @@ Marginfi account:
         return buffer
 
     def get_logger(self):
-        return get_logger(f"{__name__}.MarginfiAccount.{self.pubkey}")
+        return get_context_logger(f"{__name__}.MarginfiAccount", account=self.pubkey)
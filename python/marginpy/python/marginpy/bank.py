@@ -1,16 +1,24 @@
 from datetime import datetime
+from decimal import Decimal
 
 from marginpy.constants import COLLATERAL_SCALING_FACTOR, PARTIAL_LIQUIDATION_FACTOR
 from marginpy.types import BankData, LendingSide, MarginRequirement
 from marginpy.utils.data_conversion import wrapped_fixed_to_float
+from marginpy.utils.fixed import I80F48
 from solana.publickey import PublicKey
 
+_PARTIAL_LIQUIDATION_FACTOR_FIXED = I80F48.from_number(
+    Decimal(str(PARTIAL_LIQUIDATION_FACTOR))
+)
+
 
 class Bank:
     """
     Bank struct mirroring on-chain data.
 
     Contains the state of the marginfi group.
+    Accumulators and margin ratios are also kept as exact I80F48 (`*_fixed` attributes),
+    for computations that must match on-chain arithmetic.
     """
 
     scaling_factor_c: float
@@ -32,6 +40,10 @@ class Bank:
     maint_margin_ratio: float
     account_deposit_limit: float
     lp_deposit_limit: float
+    deposit_accumulator_fixed: I80F48
+    borrow_accumulator_fixed: I80F48
+    init_margin_ratio_fixed: I80F48
+    maint_margin_ratio_fixed: I80F48
 
     def __init__(self, data: BankData) -> None:
         self.scaling_factor_c = wrapped_fixed_to_float(data.scaling_factor_c)
@@ -70,6 +82,11 @@ class Bank:
             wrapped_fixed_to_float(data.lp_deposit_limit) / COLLATERAL_SCALING_FACTOR
         )
 
+        self.deposit_accumulator_fixed = I80F48.from_wrapped(data.deposit_accumulator)
+        self.borrow_accumulator_fixed = I80F48.from_wrapped(data.borrow_accumulator)
+        self.init_margin_ratio_fixed = I80F48.from_wrapped(data.init_margin_ratio)
+        self.maint_margin_ratio_fixed = I80F48.from_wrapped(data.maint_margin_ratio)
+
     def compute_native_amount(
         self,
         record_amount: float,
@@ -117,3 +134,44 @@ class Bank:
             return self.maint_margin_ratio + PARTIAL_LIQUIDATION_FACTOR * (self.init_margin_ratio - self.maint_margin_ratio)
 
         raise Exception(f"Unknown margin requirement type: {mreq_type}")
+
+    def compute_native_amount_fixed(
+        self,
+        record_amount: I80F48,
+        side: LendingSide,
+    ) -> I80F48:
+        """
+        Exact counterpart of `compute_native_amount`, on raw (unscaled) records.
+
+        Raises:
+            Exception: unknown side
+        """
+
+        if side == LendingSide.BORROW:
+            return record_amount * self.borrow_accumulator_fixed
+
+        if side == LendingSide.DEPOSIT:
+            return record_amount * self.deposit_accumulator_fixed
+
+        raise Exception(f"Unknown lending side: {side}")
+
+    def compute_margin_ratio_fixed(self, mreq_type: MarginRequirement) -> I80F48:
+        """
+        Exact counterpart of `compute_margin_ratio`.
+
+        Raises:
+            Exception: unknown margin requirement type
+        """
+
+        if mreq_type is MarginRequirement.INITIAL:
+            return self.init_margin_ratio_fixed
+
+        if mreq_type is MarginRequirement.MAINTENANCE:
+            return self.maint_margin_ratio_fixed
+
+        if mreq_type is MarginRequirement.PARTIAL_LIQUIDATION:
+            return self.maint_margin_ratio_fixed + _PARTIAL_LIQUIDATION_FACTOR_FIXED * (
+                self.init_margin_ratio_fixed - self.maint_margin_ratio_fixed
+            )
+
+        raise Exception(f"Unknown margin requirement type: {mreq_type}")
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-from builtins import enumerate
-from typing import Any, Dict, List, Literal, Tuple, Union
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple, Union
 
-from anchorpy import AccountsCoder, Program, ProgramAccount, Provider, Wallet
+from anchorpy import Program, ProgramAccount, Provider, Wallet
 from based58 import b58encode
-from marginpy.account import MarginfiAccount
+from marginpy.account import MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET, MarginfiAccount
 from marginpy.config import MarginfiConfig
-from marginpy.group import MarginfiGroup
+from marginpy.constants import MARGINFI_ACCOUNTS_LOAD_CONCURRENCY, MAX_MULTIPLE_ACCOUNTS
+from marginpy.group import MarginfiGroup, MarginfiGroupCache
 from marginpy.instructions import (
     InitMarginfiAccountAccounts,
     make_init_marginfi_account_ix,
 )
 from marginpy.logger import get_logger
+from marginpy.snapshot import MarginfiAccountSnapshot
 from marginpy.types import AccountType, Environment
-from marginpy.utils.misc import handle_override, load_idl
+from marginpy.utils.columnar import MarginfiAccountArrays, decode_marginfi_accounts
+from marginpy.utils.data_conversion import b64str_to_bytes
+from marginpy.utils.idl import get_accounts_coder, get_program
+from marginpy.utils.misc import get_multiple_accounts_data, handle_override
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.rpc import types
@@ -32,7 +37,7 @@ class MarginfiClient:
 
     _program: Program
     _config: "MarginfiConfig"
-    _group: MarginfiGroup
+    _group_cache: MarginfiGroupCache
 
     def __init__(
         self,
@@ -50,7 +55,7 @@ class MarginfiClient:
 
         self._config = config
         self._program = program
-        self._group = group
+        self._group_cache = MarginfiGroupCache(config, program, group)
 
     # --- Factories
 
@@ -89,7 +94,7 @@ class MarginfiClient:
             opts = config.tx_opts
 
         provider = Provider(rpc_client, wallet, opts)
-        program = Program(load_idl(), config.program_id, provider=provider)
+        program = get_program(config.program_id, provider)
         group = await MarginfiGroup.fetch(config, program)
         return MarginfiClient(config, program, group)
 
@@ -177,7 +182,32 @@ class MarginfiClient:
 
     @property
     def group(self) -> MarginfiGroup:
-        return self._group
+        """
+        Latest cached marginfi group, see `get_group` to refresh it once stale.
+        """
+
+        return self._group_cache.group  # type: ignore
+
+    @property
+    def group_cache(self) -> MarginfiGroupCache:
+        return self._group_cache
+
+    async def get_group(self, max_age: Optional[float] = None) -> MarginfiGroup:
+        """
+        Gets the marginfi group shared by all accounts of the client, refetching it once stale.
+
+        Args:
+            max_age (Optional[float], optional): maximum age of the group, in seconds. Defaults to MARGINFI_GROUP_TTL.
+        """
+
+        return await self._group_cache.get(max_age)
+
+    async def refresh_group(self) -> MarginfiGroup:
+        """
+        Refetches the marginfi group shared by all accounts of the client.
+        """
+
+        return await self._group_cache.refresh()
 
     @property
     def config(self) -> "MarginfiConfig":
@@ -235,7 +265,7 @@ class MarginfiClient:
             "Loading marginfi accounts under user %s", self.provider.wallet.public_key
         )
 
-        marginfi_group = await MarginfiGroup.fetch(self._config, self._program)
+        marginfi_group = await self.get_group()
         all_accounts = await self._program.account["MarginfiAccount"].all(
             memcmp_opts=[
                 # authority is the first field in the account, so only offset is the discriminant
@@ -248,7 +278,7 @@ class MarginfiClient:
                 # marginfiGroup is the second field in the account after the authority,
                 # so offset by the discriminant and a pubkey
                 MemcmpOpts(
-                    bytes=self._group.pubkey.to_base58().decode("utf-8"), offset=8 + 32
+                    bytes=self.group.pubkey.to_base58().decode("utf-8"), offset=8 + 32
                 ),
             ]
         )
@@ -274,56 +304,182 @@ class MarginfiClient:
             "Loading all marginfi account addresses in group %s", self.group.pubkey
         )
 
-        coder = AccountsCoder(load_idl())
-        discriminator: bytes = coder.acc_name_to_discriminator[
-            AccountType.MARGINFI_ACCOUNT.value
+        return await self.load_all_program_account_addresses(
+            AccountType.MARGINFI_ACCOUNT
+        )
+
+    async def load_all_marginfi_accounts(
+        self, skip_reserved_space: bool = True
+    ) -> List[MarginfiAccount]:
+        """
+        Retrieves all marginfi accounts in the underlying group, in a single `getProgramAccounts` call.
+
+        Args:
+            skip_reserved_space (bool, optional): flag to only transfer the account data preceding
+                `reserved_space`. Defaults to True.
+        """
+
+        logger = self._get_logger()
+        logger.debug("Loading all marginfi accounts in group %s", self.group.pubkey)
+
+        marginfi_group, program_accounts = await asyncio.gather(
+            self.get_group(),
+            self._get_all_marginfi_accounts_data(skip_reserved_space),
+        )
+
+        return [
+            MarginfiAccount.from_account_data_raw(
+                address, self, account_data, marginfi_group
+            )
+            for address, account_data in program_accounts
         ]
-        rpc_response = await self._program.provider.connection.get_program_accounts(
-            self.program_id,
-            encoding="base64",
-            commitment=self._program.provider.connection.commitment,
-            data_slice=DataSliceOpts(offset=0, length=0),
-            memcmp_opts=[
-                MemcmpOpts(
-                    bytes=self._group.pubkey.to_base58().decode("utf-8"), offset=8 + 32
-                ),
-                MemcmpOpts(offset=0, bytes=b58encode(discriminator).decode("ascii")),
-            ],
+
+    async def load_all_marginfi_accounts_arrays(
+        self, skip_reserved_space: bool = True
+    ) -> MarginfiAccountArrays:
+        """
+        Retrieves all marginfi accounts in the underlying group as NumPy columns, in a single `getProgramAccounts` call.
+
+        All accounts are decoded at once, without instantiating any `MarginfiAccount`.
+
+        Args:
+            skip_reserved_space (bool, optional): flag to only transfer the account data preceding
+                `reserved_space`. Defaults to True.
+        """
+
+        logger = self._get_logger()
+        logger.debug(
+            "Loading all marginfi accounts in group %s as arrays", self.group.pubkey
         )
-        if "error" in rpc_response.keys():
-            raise Exception(
-                "Error while fetching marginfi accounts addresses:"
-                f" {rpc_response['error']}"
+
+        program_accounts = await self._get_all_marginfi_accounts_data(
+            skip_reserved_space
+        )
+
+        return decode_marginfi_accounts(
+            [account_data for _, account_data in program_accounts],
+            addresses=[address for address, _ in program_accounts],
+        )
+
+    async def load_all_marginfi_account_snapshots(
+        self, skip_reserved_space: bool = True
+    ) -> List[MarginfiAccountSnapshot]:
+        """
+        Retrieves all marginfi accounts in the underlying group as compact snapshots,
+        in a single `getProgramAccounts` call.
+
+        Snapshots share one group, and only build UTP proxies when turned into a `MarginfiAccount`.
+
+        Args:
+            skip_reserved_space (bool, optional): flag to only transfer the account data preceding
+                `reserved_space`. Defaults to True.
+        """
+
+        logger = self._get_logger()
+        logger.debug(
+            "Loading all marginfi accounts in group %s as snapshots", self.group.pubkey
+        )
+
+        marginfi_group, program_accounts = await asyncio.gather(
+            self.get_group(),
+            self._get_all_marginfi_accounts_data(skip_reserved_space),
+        )
+        arrays = decode_marginfi_accounts(
+            [account_data for _, account_data in program_accounts],
+            addresses=[address for address, _ in program_accounts],
+        )
+
+        return MarginfiAccountSnapshot.from_arrays(arrays, self, marginfi_group)
+
+    async def _get_all_marginfi_accounts_data(
+        self, skip_reserved_space: bool
+    ) -> List[Tuple[PublicKey, bytes]]:
+        """
+        [internal] Fetches the address and raw data of all marginfi accounts in the underlying group.
+        """
+
+        data_slice = (
+            DataSliceOpts(offset=0, length=MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET)
+            if skip_reserved_space
+            else None
+        )
+        program_accounts = await self._get_program_accounts(
+            AccountType.MARGINFI_ACCOUNT, data_slice
+        )
+
+        return [
+            (
+                PublicKey(program_account["pubkey"]),
+                b64str_to_bytes(program_account["account"]["data"][0]),
             )
-        accounts = rpc_response["result"]
-        return [a["pubkey"] for a in accounts if a is not None]
+            for program_account in program_accounts
+        ]
 
-    async def load_all_marginfi_accounts(self) -> List[MarginfiAccount]:
+    async def iter_marginfi_accounts(
+        self,
+        chunk_size: int = MAX_MULTIPLE_ACCOUNTS,
+        max_concurrency: int = MARGINFI_ACCOUNTS_LOAD_CONCURRENCY,
+    ) -> AsyncIterator[List[MarginfiAccount]]:
         """
-        Retrieves all marginfi accounts in the underlying group.
+        Streams all marginfi accounts in the underlying group, one chunk at a time.
+
+        Chunks are fetched concurrently and yielded as soon as they arrive, hence not in address order.
+
+        Args:
+            chunk_size (int, optional): number of accounts per `getMultipleAccounts` call.
+                Defaults to MAX_MULTIPLE_ACCOUNTS.
+            max_concurrency (int, optional): maximum number of chunks in flight.
+                Defaults to MARGINFI_ACCOUNTS_LOAD_CONCURRENCY.
         """
 
         logger = self._get_logger()
-        logger.debug("Loading all marginfi accounts in group %s", self.group.pubkey)
+        logger.debug("Streaming all marginfi accounts in group %s", self.group.pubkey)
 
-        marginfi_group = await MarginfiGroup.fetch(self._config, self._program)
+        marginfi_group = await self.get_group()
         marginfi_account_addresses = await self.load_all_marginfi_account_addresses()
-        fetch_results = await self._program.account[
-            AccountType.MARGINFI_ACCOUNT.value
-        ].fetch_multiple(marginfi_account_addresses)
-        all_accounts = []
-        for i, account_data in enumerate(fetch_results):
-            if account_data is None:
-                continue
-            all_accounts.append(
-                MarginfiAccount.from_account_data(
-                    marginfi_account_addresses[i],
-                    self,
-                    account_data,  # type: ignore
-                    marginfi_group,
+        chunks = iter(
+            [
+                marginfi_account_addresses[i : i + chunk_size]  # noqa: E203
+                for i in range(0, len(marginfi_account_addresses), chunk_size)
+            ]
+        )
+
+        pending: set = set()
+        try:
+            while True:
+                while len(pending) < max_concurrency:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.add(
+                        asyncio.ensure_future(
+                            self._load_marginfi_accounts_chunk(chunk, marginfi_group)
+                        )
+                    )
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _load_marginfi_accounts_chunk(
+        self, addresses: List[PublicKey], marginfi_group: MarginfiGroup
+    ) -> List[MarginfiAccount]:
+        accounts_data, _ = await get_multiple_accounts_data(
+            self._program.provider.connection, addresses
+        )
+        return [
+            MarginfiAccount.from_account_data_raw(
+                address, self, account_data, marginfi_group
             )
-        return all_accounts
+            for address, account_data in zip(addresses, accounts_data)
+            if account_data is not None
+        ]
 
     async def load_marginfi_account(
         self, address: Union[str, PublicKey], observe_utps: bool = True
@@ -354,27 +510,41 @@ class MarginfiClient:
         logger = self._get_logger()
         logger.debug("Loading all marginfi %s account addresses", account_type)
 
-        coder = AccountsCoder(load_idl())
+        program_accounts = await self._get_program_accounts(
+            account_type, DataSliceOpts(offset=0, length=0)
+        )
+        return [a["pubkey"] for a in program_accounts if a is not None]
+
+    async def _get_program_accounts(
+        self, account_type: AccountType, data_slice: Optional[DataSliceOpts]
+    ) -> List[Dict[str, Any]]:
+        """
+        [internal] Fetches all accounts of the specified type in the underlying group, with base64-encoded data.
+
+        Raises:
+            Exception: RPC call errors out
+        """
+
+        coder = get_accounts_coder()
         discriminator: bytes = coder.acc_name_to_discriminator[account_type.value]
         rpc_response = await self._program.provider.connection.get_program_accounts(
             self.program_id,
             encoding="base64",
             commitment=self._program.provider.connection.commitment,
-            data_slice=DataSliceOpts(offset=0, length=0),
+            data_slice=data_slice,
             memcmp_opts=[
                 MemcmpOpts(
-                    bytes=self._group.pubkey.to_base58().decode("utf-8"), offset=8 + 32
+                    bytes=self.group.pubkey.to_base58().decode("utf-8"), offset=8 + 32
                 ),
                 MemcmpOpts(offset=0, bytes=b58encode(discriminator).decode("ascii")),
             ],
         )
         if "error" in rpc_response.keys():
             raise Exception(
-                "Error while fetching marginfi accounts addresses:"
+                f"Error while fetching marginfi {account_type.value} accounts:"
                 f" {rpc_response['error']}"
             )
-        accounts = rpc_response["result"]
-        return [a["pubkey"] for a in accounts if a is not None]
+        return rpc_response["result"]
 
     async def terminate(self) -> None:
         """
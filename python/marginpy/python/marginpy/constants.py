@@ -15,3 +15,11 @@ COLLATERAL_SCALING_FACTOR = 10**COLLATERAL_DECIMALS
 LIQUIDATOR_LIQUIDATION_FEE = 0.025
 INSURANCE_VAULT_LIQUIDATION_FEE = 0.025
 PARTIAL_LIQUIDATION_FACTOR = 0.2
+ZO_CLIENT_MAX_AGE = 60  # seconds
+ZO_STATIC_MAX_AGE = 3600  # seconds
+MANGO_GROUP_TTL = 60  # seconds
+PDA_CACHE_SIZE = 4096
+UTP_OBSERVATION_TIMEOUT = 10  # seconds
+MAX_MULTIPLE_ACCOUNTS = 100  # getMultipleAccounts RPC limit
+MARGINFI_ACCOUNTS_LOAD_CONCURRENCY = 4
+MARGINFI_GROUP_TTL = 10  # seconds
@@ -1,13 +1,17 @@
-from typing import TYPE_CHECKING
+import asyncio
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, List, Optional
 
-from anchorpy import AccountsCoder, Program
+from anchorpy import Program
 from marginpy.bank import Bank
+from marginpy.constants import MARGINFI_GROUP_TTL
 from marginpy.instructions import (
     UpdateInterestAccumulatorAccounts,
     make_update_interest_accumulator_ix,
 )
 from marginpy.types import MarginfiGroupData
-from marginpy.utils.misc import load_idl
+from marginpy.utils.idl import get_accounts_coder
+from marginpy.utils.misc import get_multiple_accounts_data
 from marginpy.utils.pda import get_bank_authority
 from solana.publickey import PublicKey
 from solana.transaction import Transaction, TransactionInstruction, TransactionSignature
@@ -141,7 +145,7 @@ class MarginfiGroup:
         Encodes marginfi group data according to the Anchor IDL.
         """
 
-        coder = AccountsCoder(load_idl())
+        coder = get_accounts_coder()
         return coder.build(decoded)
 
     async def reload(self) -> None:
@@ -173,3 +177,136 @@ class MarginfiGroup:
         update_ix = await self.make_update_interest_accumulator_ix()
         tx = Transaction().add(update_ix)
         return await self._program.provider.send(tx)
+
+
+class MarginfiGroupCache:
+    """
+    Cache of the marginfi group of a client, shared by all account factories and reloads.
+
+    The group is refetched once older than the TTL, and is never replaced by data read at an older slot.
+    Concurrent refreshes are coalesced into a single fetch.
+    """
+
+    _group: Optional[MarginfiGroup]
+    _data: Optional[bytes]
+    _slot: int
+    _timestamp: datetime
+    _pending: Optional["asyncio.Future[MarginfiGroup]"]
+    _refresh_hooks: List[Callable[[MarginfiGroup, int], None]]
+
+    def __init__(
+        self,
+        config: "MarginfiConfig",
+        program: Program,
+        group: Optional[MarginfiGroup] = None,
+        slot: int = 0,
+        ttl: float = MARGINFI_GROUP_TTL,
+    ) -> None:
+        """
+        Args:
+            config (MarginfiConfig): marginfi config
+            program (Program): marginfi Anchor program
+            group (Optional[MarginfiGroup], optional): freshly loaded group to start from. Defaults to None.
+            slot (int, optional): slot the group was read at. Defaults to 0, i.e. unknown.
+            ttl (float, optional): maximum age of the cached group, in seconds. Defaults to MARGINFI_GROUP_TTL.
+        """
+
+        self._config = config
+        self._program = program
+        self.ttl = ttl
+        self._group = group
+        self._data = None
+        self._slot = slot
+        self._timestamp = datetime.now() if group is not None else datetime.min
+        self._pending = None
+        self._refresh_hooks = []
+
+    @property
+    def group(self) -> Optional[MarginfiGroup]:
+        """
+        Latest cached group, however old.
+        """
+
+        return self._group
+
+    @property
+    def slot(self) -> int:
+        return self._slot
+
+    @property
+    def age(self) -> float:
+        return (datetime.now() - self._timestamp).total_seconds()
+
+    def add_refresh_hook(self, hook: Callable[[MarginfiGroup, int], None]) -> None:
+        """
+        Registers a callback, invoked with the new group and its slot whenever the cached group changes.
+        """
+
+        self._refresh_hooks.append(hook)
+
+    async def get(self, max_age: Optional[float] = None) -> MarginfiGroup:
+        """
+        Gets the cached group, refreshing it once stale.
+
+        Args:
+            max_age (Optional[float], optional): maximum age of the group, in seconds. Defaults to the cache TTL.
+        """
+
+        if max_age is None:
+            max_age = self.ttl
+        if self._group is None or self.age > max_age:
+            return await self.refresh()
+        return self._group
+
+    async def refresh(self) -> MarginfiGroup:
+        """
+        Fetches the latest group, joining the refresh already in flight if any.
+
+        Raises:
+            Exception: group not found
+        """
+
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.ensure_future(self._fetch())
+        return await asyncio.shield(self._pending)
+
+    async def _fetch(self) -> MarginfiGroup:
+        [data], slot = await get_multiple_accounts_data(
+            self._program.provider.connection, [self._config.group_pk]
+        )
+        if data is None:
+            raise Exception(f"Marginfi group {self._config.group_pk} not found")
+        return self.update_from_account_data_raw(data, slot)
+
+    def update_from_account_data_raw(self, data: bytes, slot: int) -> MarginfiGroup:
+        """
+        Gets the group for account data read at the specified slot, updating the cache if not older.
+
+        Data identical to the cached one is not decoded again.
+
+        Returns:
+            MarginfiGroup: group decoded from the specified data
+        """
+
+        if data == self._data and self._group is not None:
+            if slot >= self._slot:
+                self._slot = slot
+                self._timestamp = datetime.now()
+            return self._group
+
+        group = MarginfiGroup.from_account_data_raw(self._config, self._program, data)
+        if slot >= self._slot:
+            self._group = group
+            self._data = data
+            self._slot = slot
+            self._timestamp = datetime.now()
+            for hook in self._refresh_hooks:
+                hook(group, slot)
+        return group
+
+    def invalidate(self) -> None:
+        """
+        Marks the cached group as stale, forcing a refetch on next access.
+        """
+
+        self._timestamp = datetime.min
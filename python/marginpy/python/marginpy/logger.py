@@ -1,6 +1,7 @@
 import logging
 import sys
-from typing import Any
+from functools import lru_cache
+from typing import Any, MutableMapping, Tuple
 
 import coloredlogs  # type: ignore
 
@@ -27,10 +28,31 @@ def setup_logging(level: Any = logging.WARN) -> None:
     )
 
 
+@lru_cache(maxsize=None)
+def _install_handler(root_name: str) -> None:
+    """
+    [internal] Installs the colored handler on the specified top-level logger, once per process.
+
+    Child loggers propagate to it, rather than each getting a handler of their own.
+    """
+
+    root_logger = logging.getLogger(root_name)
+    coloredlogs.install(
+        logger=root_logger,
+        level=root_logger.getEffectiveLevel(),
+        milliseconds=True,
+        fmt="[%(asctime)s] %(name)s %(levelname)s %(message)s",
+    )
+
+
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
     Fetches or creates named logger.
 
+    Loggers are cached, and the handler is installed only once for all loggers of a top-level package.
+    Names should be static (e.g. module and class): pass per-instance context through `get_context_logger`.
+
     Args:
         name (str): logger name
 
@@ -38,11 +60,33 @@ def get_logger(name: str) -> logging.Logger:
         logging.Logger: logger
     """
 
-    logger = logging.getLogger(name)
-    coloredlogs.install(
-        logger=logger,
-        level=logger.getEffectiveLevel(),
-        milliseconds=True,
-        fmt="[%(asctime)s] %(name)s %(levelname)s %(message)s",
-    )
-    return logger
+    _install_handler(name.split(".", 1)[0])
+    return logging.getLogger(name)
+
+
+class ContextLoggerAdapter(logging.LoggerAdapter):
+    """
+    Logger adapter attaching context fields (e.g. an account address) to every record.
+
+    Fields are set as record attributes, and prefixed to the message.
+    They are only formatted for records that are actually emitted.
+    """
+
+    def process(
+        self, msg: Any, kwargs: MutableMapping[str, Any]
+    ) -> Tuple[Any, MutableMapping[str, Any]]:
+        kwargs["extra"] = {**self.extra, **kwargs.get("extra", {})}  # type: ignore
+        context = " ".join(f"{key}={value}" for key, value in self.extra.items())  # type: ignore
+        return f"[{context}] {msg}", kwargs
+
+
+def get_context_logger(name: str, **context: Any) -> ContextLoggerAdapter:
+    """
+    Gets the named logger, wrapped to attach the specified context fields to every record.
+
+    Args:
+        name (str): logger name
+        context (Any): context fields, e.g. `account=pubkey`
+    """
+
+    return ContextLoggerAdapter(get_logger(name), context)
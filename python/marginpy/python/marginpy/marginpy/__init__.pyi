@@ -1,3 +1,3 @@
-from . import utp_observation
+from . import decoding, utp_observation
 
-__all__ = ["utp_observation"]
+__all__ = ["decoding", "utp_observation"]
@@ -0,0 +1,49 @@
+from mmap import mmap
+from typing import List, Union
+
+AccountData = Union[bytes, bytearray, memoryview, mmap]
+
+class UtpAccountConfigRaw:
+    address: bytes
+    authority_seed: bytes
+    authority_bump: int
+    utp_address_book: List[bytes]
+
+class MarginfiAccountRaw:
+    authority: bytes
+    marginfi_group: bytes
+    deposit_record: float
+    borrow_record: float
+    active_utps: List[bool]
+    utp_account_config: List[UtpAccountConfigRaw]
+
+class BankRaw:
+    scaling_factor_c: float
+    fixed_fee: float
+    interest_fee: float
+    deposit_accumulator: float
+    borrow_accumulator: float
+    last_update: int
+    total_deposits_record: float
+    total_borrows_record: float
+    mint: bytes
+    vault: bytes
+    vault_authority_pda_bump: int
+    insurance_vault: bytes
+    insurance_vault_authority_pda_bump: int
+    insurance_vault_outstanding_transfers: float
+    fee_vault: bytes
+    fee_vault_authority_pda_bump: int
+    fee_vault_outstanding_transfers: float
+    init_margin_ratio: float
+    maint_margin_ratio: float
+    account_deposit_limit: float
+    lp_deposit_limit: float
+
+class MarginfiGroupRaw:
+    admin: bytes
+    bank: BankRaw
+    paused: bool
+
+def decode_marginfi_account(data: AccountData) -> MarginfiAccountRaw: ...
+def decode_marginfi_group(data: AccountData) -> MarginfiGroupRaw: ...
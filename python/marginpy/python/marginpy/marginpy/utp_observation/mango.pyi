@@ -1,8 +1,18 @@
-from typing import TYPE_CHECKING
+from mmap import mmap
+from typing import TYPE_CHECKING, List, Union
 
 if TYPE_CHECKING:
-    from marginpy.utp.observation import ObservationRaw
+    from marginpy.utp.observation import ObservationBatchRaw, ObservationRaw
+
+AccountData = Union[bytes, bytearray, memoryview, mmap]
 
 def get_observation(
-    mango_group_data: bytes, mango_account_data: bytes, mango_cache_data: bytes
+    mango_group_data: AccountData,
+    mango_account_data: AccountData,
+    mango_cache_data: AccountData,
 ) -> ObservationRaw: ...
+def get_observations(
+    mango_group_data: AccountData,
+    mango_cache_data: AccountData,
+    mango_accounts_data: List[AccountData],
+) -> ObservationBatchRaw: ...
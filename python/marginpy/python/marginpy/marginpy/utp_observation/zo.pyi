@@ -1,11 +1,33 @@
-from typing import TYPE_CHECKING
+from mmap import mmap
+from typing import TYPE_CHECKING, List, Union
 
 if TYPE_CHECKING:
-    from marginpy.utp.observation import ObservationRaw
+    from marginpy.utp.observation import ObservationBatchRaw, ObservationRaw
+
+AccountData = Union[bytes, bytearray, memoryview, mmap]
 
 def get_observation(
-    zo_margin_data: bytes,
-    zo_control_data: bytes,
-    zo_state_data: bytes,
-    zo_cache_data: bytes,
+    zo_margin_data: AccountData,
+    zo_control_data: AccountData,
+    zo_state_data: AccountData,
+    zo_cache_data: AccountData,
 ) -> ObservationRaw: ...
+def get_observations(
+    zo_state_data: AccountData,
+    zo_cache_data: AccountData,
+    zo_margins_data: List[AccountData],
+    zo_controls_data: List[AccountData],
+) -> ObservationBatchRaw: ...
+
+class ObservationContext:
+    def __init__(
+        self, zo_state_data: AccountData, zo_cache_data: AccountData
+    ) -> None: ...
+    def get_observation(
+        self, zo_margin_data: AccountData, zo_control_data: AccountData
+    ) -> ObservationRaw: ...
+    def get_observations(
+        self,
+        zo_margins_data: List[AccountData],
+        zo_controls_data: List[AccountData],
+    ) -> ObservationBatchRaw: ...
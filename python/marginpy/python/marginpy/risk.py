@@ -0,0 +1,231 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from marginpy.bank import Bank
+from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.types import EquityType, MarginRequirement, UtpIndex
+from marginpy.utils.columnar import MarginfiAccountArrays
+from marginpy.utils.fixed import bits_mul, bits_to_float
+from marginpy.utp.observation import ObservationBatchRaw, UtpObservation
+from solana.publickey import PublicKey
+
+
+@dataclass
+class UtpObservationArrays:
+    """
+    Observation columns of one UTP, row `i` belonging to the `i`-th account of the group.
+
+    Rows of accounts that were not observed are zeroed, and flagged in `observed`.
+    """
+
+    equity: np.ndarray
+    free_collateral: np.ndarray
+    observed: np.ndarray
+
+    @staticmethod
+    def from_raw_batch(raw: ObservationBatchRaw) -> "UtpObservationArrays":
+        """
+        Builds observation columns from a native batch observation.
+        """
+
+        return UtpObservationArrays(
+            equity=np.array(raw.equity, dtype=np.float64) / COLLATERAL_SCALING_FACTOR,
+            free_collateral=np.array(raw.free_collateral, dtype=np.float64)
+            / COLLATERAL_SCALING_FACTOR,
+            observed=np.array([error is None for error in raw.errors], dtype=bool),
+        )
+
+    @staticmethod
+    def from_observations(
+        observations: Sequence[Optional[UtpObservation]],
+    ) -> "UtpObservationArrays":
+        """
+        Builds observation columns from per-account observations, None for accounts not observed.
+        """
+
+        return UtpObservationArrays(
+            equity=np.array(
+                [o.equity if o is not None else 0 for o in observations],
+                dtype=np.float64,
+            ),
+            free_collateral=np.array(
+                [o.free_collateral if o is not None else 0 for o in observations],
+                dtype=np.float64,
+            ),
+            observed=np.array([o is not None for o in observations], dtype=bool),
+        )
+
+
+def _health(equity: np.ndarray, requirement: np.ndarray) -> np.ndarray:
+    return np.divide(
+        equity,
+        requirement,
+        out=np.full(len(equity), np.inf),
+        where=requirement > 0,
+    )
+
+
+@dataclass
+class GroupRisk:
+    """
+    Balances, margin requirements and health of every account of a group, as NumPy columns.
+
+    Mirrors `MarginfiAccount.compute_balances` and `MarginfiAccount.compute_margin_requirement`,
+    row `i` of every column belonging to the `i`-th account.
+    Health is equity over margin requirement, infinite without requirement.
+    """
+
+    equity_type: EquityType
+    deposits: np.ndarray
+    borrows: np.ndarray
+    assets: np.ndarray
+    liabilities: np.ndarray
+    equity: np.ndarray
+    requirements: Dict[MarginRequirement, np.ndarray]
+    health: Dict[MarginRequirement, np.ndarray]
+    is_fully_observed: np.ndarray
+    addresses: Optional[List[PublicKey]] = None
+
+    def __len__(self) -> int:
+        return len(self.equity)
+
+    @property
+    def margin_ratio(self) -> np.ndarray:
+        return _health(self.equity, self.liabilities)
+
+    def below(self, mreq_type: MarginRequirement, threshold: float = 1.0) -> np.ndarray:
+        """
+        Gets the indices of the accounts whose health is below the specified threshold, riskiest first.
+
+        Args:
+            mreq_type (MarginRequirement): margin requirement the health is computed against
+            threshold (float, optional): health threshold. Defaults to 1, i.e. requirement not met.
+        """
+
+        health = self.health[mreq_type]
+        indices = np.flatnonzero(health < threshold)
+        return indices[np.argsort(health[indices], kind="stable")]
+
+    def rank(
+        self, mreq_type: MarginRequirement, limit: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Gets the indices of the accounts sorted by increasing health, i.e. riskiest first.
+
+        Args:
+            mreq_type (MarginRequirement): margin requirement the health is computed against
+            limit (Optional[int], optional): maximum number of indices. Defaults to all accounts.
+        """
+
+        return np.argsort(self.health[mreq_type], kind="stable")[:limit]
+
+    def get_addresses(self, indices: Sequence[int]) -> List[PublicKey]:
+        """
+        Gets the addresses of the accounts at the specified indices.
+
+        Raises:
+            Exception: addresses unknown
+        """
+
+        if self.addresses is None:
+            raise Exception("Account addresses unknown")
+        return [self.addresses[i] for i in indices]
+
+
+def compute_group_risk(
+    accounts: MarginfiAccountArrays,
+    bank: Bank,
+    observations: Dict[UtpIndex, UtpObservationArrays],
+    equity_type: EquityType = EquityType.INIT_REQ_ADJUSTED,
+    exact: bool = False,
+) -> GroupRisk:
+    """
+    Computes balances, margin requirements and health of all accounts of a group in one vectorized pass.
+
+    Args:
+        accounts (MarginfiAccountArrays): columnar account state, e.g. from `load_all_marginfi_accounts_arrays`
+        bank (Bank): group bank, providing accumulators and margin ratios
+        observations (Dict[UtpIndex, UtpObservationArrays]): observation columns of each UTP, aligned with the accounts.
+            An active UTP without observation counts for zero, and flags the account as not fully observed.
+        equity_type (EquityType, optional): UTP contribution to assets, as in `compute_balances`.
+            Defaults to EquityType.INIT_REQ_ADJUSTED.
+        exact (bool, optional): flag to compute deposits, borrows and requirements with exact I80F48
+            arithmetic, converting to float only once per value. Defaults to False.
+
+    Raises:
+        Exception: observation columns not aligned with the accounts
+    """
+
+    n_accounts = len(accounts)
+    if exact:
+        borrows_bits = bits_mul(
+            accounts.borrow_record_bits, bank.borrow_accumulator_fixed.bits
+        )
+        deposits = (
+            bits_to_float(
+                bits_mul(
+                    accounts.deposit_record_bits, bank.deposit_accumulator_fixed.bits
+                )
+            )
+            / COLLATERAL_SCALING_FACTOR
+        )
+        borrows = bits_to_float(borrows_bits) / COLLATERAL_SCALING_FACTOR
+    else:
+        deposits = accounts.deposit_record * bank.deposit_accumulator
+        borrows = accounts.borrow_record * bank.borrow_accumulator
+
+    assets = deposits.copy()
+    is_fully_observed = np.ones(n_accounts, dtype=bool)
+    for utp_index in UtpIndex:
+        is_active = accounts.active_utps[:, utp_index.value]
+        observation = observations.get(utp_index)
+        if observation is None:
+            is_fully_observed &= ~is_active
+            continue
+        if len(observation.observed) != n_accounts:
+            raise Exception(
+                f"Got {len(observation.observed)} {utp_index.name} observations for"
+                f" {n_accounts} accounts"
+            )
+
+        contribution = (
+            observation.free_collateral
+            if equity_type == EquityType.INIT_REQ_ADJUSTED
+            else observation.equity
+        )
+        assets += np.where(is_active & observation.observed, contribution, 0)
+        is_fully_observed &= ~is_active | observation.observed
+
+    liabilities = borrows
+    equity = assets - liabilities
+
+    if exact:
+        requirements = {
+            mreq_type: bits_to_float(
+                bits_mul(borrows_bits, bank.compute_margin_ratio_fixed(mreq_type).bits)
+            )
+            / COLLATERAL_SCALING_FACTOR
+            for mreq_type in MarginRequirement
+        }
+    else:
+        requirements = {
+            mreq_type: borrows * bank.compute_margin_ratio(mreq_type)
+            for mreq_type in MarginRequirement
+        }
+
+    return GroupRisk(
+        equity_type=equity_type,
+        deposits=deposits,
+        borrows=borrows,
+        assets=assets,
+        liabilities=liabilities,
+        equity=equity,
+        requirements=requirements,
+        health={
+            mreq_type: _health(equity, requirement)
+            for mreq_type, requirement in requirements.items()
+        },
+        is_fully_observed=is_fully_observed,
+        addresses=accounts.addresses,
+    )
@@ -0,0 +1,244 @@
+from typing import TYPE_CHECKING, Any, List
+
+import numpy as np
+from marginpy.account import MarginfiAccount
+from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.generated_client.types.utp_account_config import UTPAccountConfig
+from marginpy.generated_client.types.wrapped_i80f48 import WrappedI80F48
+from marginpy.group import MarginfiGroup
+from marginpy.types import LendingSide, UtpData, UtpIndex
+from marginpy.utils.columnar import UTP_ACCOUNT_CONFIG_DTYPE, MarginfiAccountArrays
+from marginpy.utils.data_conversion import wrapped_fixed_to_float
+from marginpy.utils.fixed import I80F48
+from solana.publickey import PublicKey
+
+if TYPE_CHECKING:
+    from marginpy.client import MarginfiClient
+
+# UTP account configs kept by snapshots, from index 0 up to the last supported UTP
+_SNAPSHOT_UTPS_COUNT = max(utp_index.value for utp_index in UtpIndex) + 1
+
+
+class MarginfiAccountSnapshot:
+    """
+    Immutable, compact marginfi account state, as produced by the bulk loaders.
+
+    Snapshots of a same load share their client and group. UTP account configs are kept
+    as raw bytes, and only decoded along with the UTP proxies by `to_account`, for the
+    accounts that need to be acted upon.
+    """
+
+    __slots__ = (
+        "_pubkey",
+        "_authority",
+        "_client",
+        "_group",
+        "_deposit_record_bits",
+        "_borrow_record_bits",
+        "_active_utps",
+        "_utp_configs",
+    )
+
+    _pubkey: PublicKey
+    _authority: bytes
+    _client: "MarginfiClient"
+    _group: MarginfiGroup
+    _deposit_record_bits: int
+    _borrow_record_bits: int
+    _active_utps: int
+    _utp_configs: bytes
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pubkey: PublicKey,
+        authority: bytes,
+        client: "MarginfiClient",
+        group: MarginfiGroup,
+        deposit_record_bits: int,
+        borrow_record_bits: int,
+        active_utps: int,
+        utp_configs: bytes,
+    ) -> None:
+        """
+        [internal] Constructor, see `from_arrays`.
+
+        Args:
+            authority (bytes): raw authority public key
+            deposit_record_bits (int): raw I80F48 deposit record
+            borrow_record_bits (int): raw I80F48 borrow record
+            active_utps (int): active UTP flags, bit `i` for UTP index `i`
+            utp_configs (bytes): on-chain UTP account configs of the supported UTPs, concatenated
+        """
+
+        for name, value in (
+            ("_pubkey", pubkey),
+            ("_authority", authority),
+            ("_client", client),
+            ("_group", group),
+            ("_deposit_record_bits", deposit_record_bits),
+            ("_borrow_record_bits", borrow_record_bits),
+            ("_active_utps", active_utps),
+            ("_utp_configs", utp_configs),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    # --- Factories
+
+    @staticmethod
+    def from_arrays(
+        arrays: MarginfiAccountArrays,
+        client: "MarginfiClient",
+        marginfi_group: MarginfiGroup,
+    ) -> List["MarginfiAccountSnapshot"]:
+        """
+        Builds snapshots of columnar decoded accounts, all sharing the specified client and group.
+
+        Raises:
+            Exception: account addresses unknown
+            Exception: accounts tied to another group
+        """
+
+        if arrays.addresses is None:
+            raise Exception("Account addresses unknown")
+
+        raw = arrays.raw
+        group_pk = np.frombuffer(bytes(marginfi_group.pubkey), dtype=np.uint8)
+        foreign = np.flatnonzero((raw["marginfi_group"] != group_pk).any(axis=1))
+        if len(foreign) > 0:
+            raise Exception(
+                f"Marginfi accounts at indices {foreign.tolist()} not tied to group"
+                f" {marginfi_group.pubkey}"
+            )
+
+        utp_flags = arrays.active_utps[:, :_SNAPSHOT_UTPS_COUNT].astype(np.int64)
+        active_utps = (utp_flags << np.arange(_SNAPSHOT_UTPS_COUNT)).sum(axis=1)
+
+        configs_offset = raw.dtype.fields["utp_account_config"][1]
+        configs_size = _SNAPSHOT_UTPS_COUNT * UTP_ACCOUNT_CONFIG_DTYPE.itemsize
+        configs_end = configs_offset + configs_size
+        raw_bytes = np.ascontiguousarray(raw).view(np.uint8).reshape(len(raw), -1)
+        utp_configs = raw_bytes[:, configs_offset:configs_end]
+
+        return [
+            MarginfiAccountSnapshot(*fields)
+            for fields in zip(
+                arrays.addresses,
+                [authority.tobytes() for authority in arrays.authority],
+                [client] * len(arrays),
+                [marginfi_group] * len(arrays),
+                arrays.deposit_record_bits.tolist(),
+                arrays.borrow_record_bits.tolist(),
+                active_utps.tolist(),
+                [configs.tobytes() for configs in utp_configs],
+            )
+        ]
+
+    # --- Getters
+
+    @property
+    def pubkey(self) -> PublicKey:
+        return self._pubkey
+
+    @property
+    def authority(self) -> PublicKey:
+        return PublicKey(self._authority)
+
+    @property
+    def client(self) -> "MarginfiClient":
+        return self._client
+
+    @property
+    def group(self) -> MarginfiGroup:
+        return self._group
+
+    @property
+    def deposit_record(self) -> float:
+        return (
+            wrapped_fixed_to_float(WrappedI80F48(bits=self._deposit_record_bits))
+            / COLLATERAL_SCALING_FACTOR
+        )
+
+    @property
+    def borrow_record(self) -> float:
+        return (
+            wrapped_fixed_to_float(WrappedI80F48(bits=self._borrow_record_bits))
+            / COLLATERAL_SCALING_FACTOR
+        )
+
+    @property
+    def deposits(self) -> float:
+        return self._group.bank.compute_native_amount(
+            self.deposit_record, LendingSide.DEPOSIT
+        )
+
+    @property
+    def borrows(self) -> float:
+        return self._group.bank.compute_native_amount(
+            self.borrow_record, LendingSide.BORROW
+        )
+
+    @property
+    def deposits_fixed(self) -> I80F48:
+        return self._group.bank.compute_native_amount_fixed(
+            I80F48(self._deposit_record_bits), LendingSide.DEPOSIT
+        )
+
+    @property
+    def borrows_fixed(self) -> I80F48:
+        return self._group.bank.compute_native_amount_fixed(
+            I80F48(self._borrow_record_bits), LendingSide.BORROW
+        )
+
+    @property
+    def active_utps(self) -> List[UtpIndex]:
+        return [utp_index for utp_index in UtpIndex if self.is_utp_active(utp_index)]
+
+    def is_utp_active(self, utp_index: UtpIndex) -> bool:
+        return bool(self._active_utps >> utp_index.value & 1)
+
+    def get_utp_data(self, utp_index: UtpIndex) -> UtpData:
+        """
+        Decodes the data of the specified UTP.
+        """
+
+        config_size = UTP_ACCOUNT_CONFIG_DTYPE.itemsize
+        start = utp_index.value * config_size
+        account_config = UTPAccountConfig.from_decoded(
+            UTPAccountConfig.layout.parse(
+                self._utp_configs[start : start + config_size]  # noqa: E203
+            )
+        )
+        return UtpData(
+            account_config=account_config, is_active=self.is_utp_active(utp_index)
+        )
+
+    def to_account(self) -> MarginfiAccount:
+        """
+        Instantiates the full `MarginfiAccount`, with its UTP proxies, to act on the account.
+        """
+
+        return MarginfiAccount(
+            self._pubkey,
+            self.authority,
+            self._client,
+            self._group,
+            self.deposit_record,
+            self.borrow_record,
+            self.get_utp_data(UtpIndex.MANGO),
+            self.get_utp_data(UtpIndex.ZO),
+            I80F48(self._deposit_record_bits),
+            I80F48(self._borrow_record_bits),
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"MarginfiAccountSnapshot(pubkey={self._pubkey},"
+            f" deposits={self.deposits}, borrows={self.borrows},"
+            f" active_utps={[utp_index.name for utp_index in self.active_utps]})"
+        )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
 import marginpy.generated_client.types as gen_types
 from marginpy.generated_client.accounts import MarginfiAccount, MarginfiGroup
@@ -10,6 +10,9 @@ from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.transaction import TransactionInstruction
 
+if TYPE_CHECKING:
+    from marginpy.utils.fixed import I80F48
+
 
 class Environment(Enum):
     LOCALNET = "localnet"
@@ -89,6 +92,17 @@ class AccountBalances:
     liabilities: float
 
 
+@dataclass
+class AccountBalancesFixed:
+    """
+    Exact account balances, in native units (see `MarginfiAccount.compute_balances_fixed`).
+    """
+
+    equity: "I80F48"
+    assets: "I80F48"
+    liabilities: "I80F48"
+
+
 class MarginRequirement(Enum):
     INITIAL = "INITIAL"
     PARTIAL_LIQUIDATION = "PARTIAL_LIQUIDATION"
@@ -1,7 +1,10 @@
-from . import data_conversion, instructions, misc, pda
+from . import columnar, data_conversion, fixed, idl, instructions, misc, pda
 
 __all__ = [
+    "columnar",
     "data_conversion",
+    "fixed",
+    "idl",
     "instructions",
     "misc",
     "pda",
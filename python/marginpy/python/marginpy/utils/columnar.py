@@ -0,0 +1,251 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.generated_client.types.utp_account_config import UTPAccountConfig
+from marginpy.types import MarginfiAccountData
+from marginpy.utils.fixed import i80f48_bits
+from solana.publickey import PublicKey
+
+
+def _layout_offsets(layout, start: int = 0) -> dict:
+    """
+    [internal] Byte offset of every field of a Borsh struct layout.
+    """
+
+    offsets = {}
+    offset = start
+    for subcon in layout.subcons:
+        offsets[subcon.name] = offset
+        offset += subcon.sizeof()
+    offsets[None] = offset
+    return offsets
+
+
+_UTP_ACCOUNT_CONFIG_OFFSETS = _layout_offsets(UTPAccountConfig.layout)
+_MARGINFI_ACCOUNT_OFFSETS = _layout_offsets(
+    MarginfiAccountData.layout, ACCOUNT_DISCRIMINATOR_SIZE
+)
+
+# Raw I80F48, split in two 64-bit halves as NumPy has no 128-bit integers
+I80F48_DTYPE = np.dtype([("lo", "<u8"), ("hi", "<i8")])
+
+UTP_ACCOUNT_CONFIG_DTYPE = np.dtype(
+    {
+        "names": ["address", "authority_seed", "authority_bump", "utp_address_book"],
+        "formats": [("u1", 32), ("u1", 32), "u1", ("u1", (4, 32))],
+        "offsets": [
+            _UTP_ACCOUNT_CONFIG_OFFSETS["address"],
+            _UTP_ACCOUNT_CONFIG_OFFSETS["authority_seed"],
+            _UTP_ACCOUNT_CONFIG_OFFSETS["authority_bump"],
+            _UTP_ACCOUNT_CONFIG_OFFSETS["utp_address_book"],
+        ],
+        "itemsize": _UTP_ACCOUNT_CONFIG_OFFSETS[None],
+    }
+)
+
+
+def _marginfi_account_dtype(itemsize: int) -> np.dtype:
+    """
+    [internal] Marginfi account fields read in bulk, in records of `itemsize` bytes.
+    """
+
+    return np.dtype(
+        {
+            "names": [
+                "discriminator",
+                "authority",
+                "marginfi_group",
+                "deposit_record",
+                "borrow_record",
+                "active_utps",
+                "utp_account_config",
+            ],
+            "formats": [
+                "<u8",
+                ("u1", 32),
+                ("u1", 32),
+                I80F48_DTYPE,
+                I80F48_DTYPE,
+                ("?", 32),
+                (UTP_ACCOUNT_CONFIG_DTYPE, 32),
+            ],
+            "offsets": [
+                0,
+                _MARGINFI_ACCOUNT_OFFSETS["authority"],
+                _MARGINFI_ACCOUNT_OFFSETS["marginfi_group"],
+                _MARGINFI_ACCOUNT_OFFSETS["deposit_record"],
+                _MARGINFI_ACCOUNT_OFFSETS["borrow_record"],
+                _MARGINFI_ACCOUNT_OFFSETS["active_utps"],
+                _MARGINFI_ACCOUNT_OFFSETS["utp_account_config"],
+            ],
+            "itemsize": itemsize,
+        }
+    )
+
+
+# Marginfi account data up to `reserved_space`, as fetched by `load_all_marginfi_accounts`
+MARGINFI_ACCOUNT_DTYPE = _marginfi_account_dtype(
+    _MARGINFI_ACCOUNT_OFFSETS["reserved_space"]
+)
+# Whole marginfi account data, `reserved_space` left out of the fields
+MARGINFI_ACCOUNT_FULL_DTYPE = _marginfi_account_dtype(_MARGINFI_ACCOUNT_OFFSETS[None])
+
+_MARGINFI_ACCOUNT_DISCRIMINATOR = int.from_bytes(
+    MarginfiAccountData.discriminator, "little"
+)
+_I80F48_FRACTIONAL_BITS = 48
+
+
+def i80f48_to_float(raw: np.ndarray) -> np.ndarray:
+    """
+    Converts an array of raw I80F48 (`I80F48_DTYPE`) to float64, rounded to 6 decimals like `wrapped_fixed_to_float`.
+
+    Values are accurate to float64 precision, but may differ from `wrapped_fixed_to_float` in the last ulp.
+    """
+
+    value = raw["hi"].astype(np.float64) * 2.0 ** (64 - _I80F48_FRACTIONAL_BITS)
+    value += raw["lo"].astype(np.float64) * 2.0**-_I80F48_FRACTIONAL_BITS
+    return np.round(value, 6)
+
+
+def i80f48_to_int(raw: np.ndarray) -> np.ndarray:
+    """
+    Converts an array of raw I80F48 (`I80F48_DTYPE`) to int64, rounding towards negative infinity.
+
+    Integer parts beyond the int64 range wrap around.
+    """
+
+    integer_high = raw["hi"] << np.int64(64 - _I80F48_FRACTIONAL_BITS)
+    integer_low = (raw["lo"] >> np.uint64(_I80F48_FRACTIONAL_BITS)).astype(np.int64)
+    return integer_high | integer_low
+
+
+@dataclass
+class MarginfiAccountArrays:
+    """
+    Columnar view over many marginfi accounts, row `i` of every column belonging to the `i`-th account.
+
+    Attributes:
+        raw (np.ndarray): structured array over the on-chain layout (`MARGINFI_ACCOUNT_DTYPE`)
+        authority (np.ndarray): (n, 32) uint8 authority public keys
+        deposit_record (np.ndarray): (n,) float64 deposit records, in the unit of `MarginfiAccount` records
+        borrow_record (np.ndarray): (n,) float64 borrow records, in the unit of `MarginfiAccount` records
+        active_utps (np.ndarray): (n, 32) bool active UTP flags, indexed by `UtpIndex`
+        utp_address (np.ndarray): (n, 32, 32) uint8 UTP account public keys, indexed by `UtpIndex`
+        addresses (Optional[List[PublicKey]]): marginfi account addresses, when known
+    """
+
+    raw: np.ndarray
+    authority: np.ndarray
+    deposit_record: np.ndarray
+    borrow_record: np.ndarray
+    active_utps: np.ndarray
+    utp_address: np.ndarray
+    addresses: Optional[List[PublicKey]] = None
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    @property
+    def deposit_record_bits(self) -> np.ndarray:
+        """
+        Exact raw (unscaled) deposit records, as an object array of I80F48 bits.
+        """
+
+        return i80f48_bits(self.raw["deposit_record"])
+
+    @property
+    def borrow_record_bits(self) -> np.ndarray:
+        """
+        Exact raw (unscaled) borrow records, as an object array of I80F48 bits.
+        """
+
+        return i80f48_bits(self.raw["borrow_record"])
+
+    def authority_pubkey(self, index: int) -> PublicKey:
+        return PublicKey(self.authority[index].tobytes())
+
+    def utp_address_pubkey(self, index: int, utp_index: int) -> PublicKey:
+        return PublicKey(self.utp_address[index, utp_index].tobytes())
+
+
+def _infer_account_size(length: int) -> int:
+    sliced_size = MARGINFI_ACCOUNT_DTYPE.itemsize
+    full_size = MARGINFI_ACCOUNT_FULL_DTYPE.itemsize
+    is_sliced = length % sliced_size == 0
+    is_full = length % full_size == 0
+    if is_sliced and is_full and length > 0:
+        raise Exception(f"Ambiguous buffer of {length} bytes: specify the account size")
+    if is_full:
+        return full_size
+    if is_sliced:
+        return sliced_size
+    raise Exception(
+        f"Buffer of {length} bytes is neither a multiple of {full_size} (whole"
+        f" accounts) nor of {sliced_size} (accounts sliced before reserved space)"
+    )
+
+
+def decode_marginfi_accounts(
+    data: Union[bytes, bytearray, memoryview, Sequence[bytes]],
+    account_size: Optional[int] = None,
+    addresses: Optional[List[PublicKey]] = None,
+) -> MarginfiAccountArrays:
+    """
+    Decodes many marginfi accounts at once into NumPy columns.
+
+    Accounts are passed either as a list of buffers, whole or sliced before `reserved_space`,
+    or as a single buffer of concatenated accounts of the same size.
+
+    Args:
+        data (Union[bytes, bytearray, memoryview, Sequence[bytes]]): raw account data
+        account_size (Optional[int], optional): size of each account in a concatenated buffer.
+            Defaults to the size inferred from the buffer length.
+        addresses (Optional[List[PublicKey]], optional): addresses of the accounts, passed through as is.
+
+    Raises:
+        Exception: account data too short, or not a marginfi account
+    """
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        if account_size is None:
+            account_size = _infer_account_size(len(data))
+        dtype = (
+            MARGINFI_ACCOUNT_FULL_DTYPE
+            if account_size == MARGINFI_ACCOUNT_FULL_DTYPE.itemsize
+            else MARGINFI_ACCOUNT_DTYPE
+        )
+        if account_size != dtype.itemsize:
+            raise Exception(f"Unsupported marginfi account size: {account_size}")
+        raw = np.frombuffer(data, dtype=dtype)
+    else:
+        sliced_size = MARGINFI_ACCOUNT_DTYPE.itemsize
+        short = [
+            i for i, account_data in enumerate(data) if len(account_data) < sliced_size
+        ]
+        if short:
+            raise Exception(f"Marginfi account data too short at indices {short}")
+        raw = np.frombuffer(
+            b"".join(account_data[:sliced_size] for account_data in data),
+            dtype=MARGINFI_ACCOUNT_DTYPE,
+        )
+
+    invalid = np.flatnonzero(raw["discriminator"] != _MARGINFI_ACCOUNT_DISCRIMINATOR)
+    if len(invalid) > 0:
+        raise Exception(
+            f"Invalid marginfi account discriminator at indices {invalid.tolist()}"
+        )
+
+    return MarginfiAccountArrays(
+        raw=raw,
+        authority=raw["authority"],
+        deposit_record=i80f48_to_float(raw["deposit_record"])
+        / COLLATERAL_SCALING_FACTOR,
+        borrow_record=i80f48_to_float(raw["borrow_record"]) / COLLATERAL_SCALING_FACTOR,
+        active_utps=raw["active_utps"],
+        utp_address=raw["utp_account_config"]["address"],
+        addresses=addresses,
+    )
@@ -0,0 +1,168 @@
+from decimal import Decimal
+from fractions import Fraction
+from functools import total_ordering
+from typing import Union
+
+import numpy as np
+from marginpy.generated_client.types.wrapped_i80f48 import WrappedI80F48
+
+I80F48_FRACTIONAL_BITS = 48
+I80F48_ONE_BITS = 1 << I80F48_FRACTIONAL_BITS
+I80F48_MIN_BITS = -(1 << 127)
+I80F48_MAX_BITS = (1 << 127) - 1
+
+_Operand = Union["I80F48", int]
+
+
+@total_ordering
+class I80F48:
+    """
+    Exact I80F48 fixed-point number, as stored on-chain.
+
+    Arithmetic is carried out on the raw bits, as Python integers: sums and differences are exact,
+    products and quotients are rounded towards negative infinity.
+    Values are only turned into floats when explicitly converted.
+
+    Raises:
+        Exception: result out of the I80F48 range
+    """
+
+    __slots__ = ("bits",)
+
+    bits: int
+
+    def __init__(self, bits: int) -> None:
+        if not I80F48_MIN_BITS <= bits <= I80F48_MAX_BITS:
+            raise Exception(f"I80F48 overflow: {bits} bits")
+        self.bits = bits
+
+    # --- Factories
+
+    @staticmethod
+    def from_wrapped(raw: WrappedI80F48) -> "I80F48":
+        return I80F48(raw.bits)
+
+    @staticmethod
+    def from_int(value: int) -> "I80F48":
+        return I80F48(value << I80F48_FRACTIONAL_BITS)
+
+    @staticmethod
+    def from_number(value: Union[int, float, Fraction, Decimal]) -> "I80F48":
+        """
+        Converts a number to the nearest I80F48, ties to even.
+        """
+
+        return I80F48(round(Fraction(value) * I80F48_ONE_BITS))
+
+    # --- Conversions
+
+    def to_float(self) -> float:
+        """
+        Converts to the nearest float (not rounded to 6 decimals, unlike `wrapped_fixed_to_float`).
+        """
+
+        return self.bits / I80F48_ONE_BITS
+
+    def to_fraction(self) -> Fraction:
+        return Fraction(self.bits, I80F48_ONE_BITS)
+
+    def floor(self) -> int:
+        return self.bits >> I80F48_FRACTIONAL_BITS
+
+    def __float__(self) -> float:
+        return self.to_float()
+
+    def __int__(self) -> int:
+        return int(self.to_fraction())
+
+    # --- Arithmetic
+
+    @staticmethod
+    def _bits_of(other: _Operand) -> int:
+        if isinstance(other, I80F48):
+            return other.bits
+        if isinstance(other, int):
+            return other << I80F48_FRACTIONAL_BITS
+        raise TypeError(f"Unsupported I80F48 operand: {type(other).__name__}")
+
+    def __add__(self, other: _Operand) -> "I80F48":
+        return I80F48(self.bits + I80F48._bits_of(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other: _Operand) -> "I80F48":
+        return I80F48(self.bits - I80F48._bits_of(other))
+
+    def __rsub__(self, other: _Operand) -> "I80F48":
+        return I80F48(I80F48._bits_of(other) - self.bits)
+
+    def __mul__(self, other: _Operand) -> "I80F48":
+        if isinstance(other, int):
+            return I80F48(self.bits * other)
+        return I80F48((self.bits * I80F48._bits_of(other)) >> I80F48_FRACTIONAL_BITS)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: _Operand) -> "I80F48":
+        divisor = I80F48._bits_of(other)
+        if divisor == 0:
+            raise ZeroDivisionError("I80F48 division by zero")
+        return I80F48((self.bits << I80F48_FRACTIONAL_BITS) // divisor)
+
+    def __rtruediv__(self, other: _Operand) -> "I80F48":
+        return I80F48(I80F48._bits_of(other)) / self
+
+    def __neg__(self) -> "I80F48":
+        return I80F48(-self.bits)
+
+    def __abs__(self) -> "I80F48":
+        return I80F48(abs(self.bits))
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    # --- Comparisons
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (I80F48, int)):
+            return NotImplemented
+        return self.bits == I80F48._bits_of(other)
+
+    def __lt__(self, other: _Operand) -> bool:
+        return self.bits < I80F48._bits_of(other)
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"I80F48({self.to_float()})"
+
+
+# --- Vectorized batch form, over NumPy object arrays of raw bits (Python integers)
+
+
+def i80f48_bits(raw: np.ndarray) -> np.ndarray:
+    """
+    Converts an array of raw I80F48, split in `lo` (uint64) and `hi` (int64) halves, to exact raw bits.
+
+    Returns:
+        np.ndarray: object array of Python integers
+    """
+
+    return (raw["hi"].astype(object) << 64) | raw["lo"].astype(object)
+
+
+def bits_mul(a_bits: np.ndarray, b_bits: Union[np.ndarray, int]) -> np.ndarray:
+    """
+    Multiplies raw I80F48 bits element-wise, rounding towards negative infinity like `I80F48.__mul__`.
+    """
+
+    return (a_bits * b_bits) >> I80F48_FRACTIONAL_BITS
+
+
+def bits_to_float(bits: np.ndarray) -> np.ndarray:
+    """
+    Converts raw I80F48 bits to the nearest float64 values, element-wise.
+    """
+
+    return (bits / I80F48_ONE_BITS).astype(np.float64)
@@ -0,0 +1,135 @@
+import json
+import os
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from anchorpy import AccountsCoder, Idl, Program, Provider
+from solana.publickey import PublicKey
+
+MARGINFI_IDL_PATH = os.path.join(os.path.dirname(__file__), "../idl.json")
+ZO_IDL_PATH = os.path.join(os.path.dirname(__file__), "../utp/zo/utils/idl.json")
+
+
+def _normalize_path(idl_path: Optional[str]) -> str:
+    return os.path.realpath(idl_path if idl_path is not None else MARGINFI_IDL_PATH)
+
+
+class IdlRegistry:
+    """
+    Process-wide cache of decoded Anchor IDLs, and of the objects derived from them.
+
+    IDLs and accounts coders are keyed by the (normalized) IDL path.
+    Programs are additionally keyed by program ID and provider, and are only
+    weakly referenced: an entry disappears as soon as no client holds on to it.
+    """
+
+    _idls: Dict[str, Idl]
+    _accounts_coders: Dict[str, AccountsCoder]
+    _programs: "WeakValueDictionary[Tuple[str, str, int], Program]"
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._idls = {}
+        self._accounts_coders = {}
+        self._programs = WeakValueDictionary()
+
+    def get_idl(self, idl_path: Optional[str] = None) -> Idl:
+        """
+        Gets the decoded IDL found at the specified path, parsing it only on first access.
+
+        Args:
+            idl_path (Optional[str], optional): path to the IDL JSON file. Defaults to the marginfi IDL.
+        """
+
+        key = _normalize_path(idl_path)
+        with self._lock:
+            idl = self._idls.get(key)
+            if idl is None:
+                with open(key, "r", encoding="utf-8") as idl_raw:
+                    raw_idl = json.load(idl_raw)
+                idl = Idl.from_json(raw_idl)
+                self._idls[key] = idl
+        return idl
+
+    def get_accounts_coder(self, idl_path: Optional[str] = None) -> AccountsCoder:
+        """
+        Gets the accounts coder built from the IDL found at the specified path.
+
+        Args:
+            idl_path (Optional[str], optional): path to the IDL JSON file. Defaults to the marginfi IDL.
+        """
+
+        key = _normalize_path(idl_path)
+        coder = self._accounts_coders.get(key)
+        if coder is None:
+            coder = AccountsCoder(self.get_idl(key))
+            with self._lock:
+                coder = self._accounts_coders.setdefault(key, coder)
+        return coder
+
+    def get_program(
+        self,
+        program_id: PublicKey,
+        provider: Provider,
+        idl_path: Optional[str] = None,
+    ) -> Program:
+        """
+        Gets the Anchor program for the specified program ID and provider.
+
+        Args:
+            program_id (PublicKey): program ID
+            provider (Provider): provider the program is bound to
+            idl_path (Optional[str], optional): path to the IDL JSON file. Defaults to the marginfi IDL.
+        """
+
+        path = _normalize_path(idl_path)
+        key = (path, str(program_id), id(provider))
+        program = self._programs.get(key)
+        if program is None or program.provider is not provider:
+            program = Program(self.get_idl(path), program_id, provider=provider)
+            with self._lock:
+                self._programs[key] = program
+        return program
+
+    def invalidate(self, idl_path: Optional[str] = None) -> None:
+        """
+        Drops cached entries, forcing the IDL to be re-read on next access.
+
+        Args:
+            idl_path (Optional[str], optional): path of the IDL to invalidate. Defaults to all IDLs.
+        """
+
+        with self._lock:
+            if idl_path is None:
+                self._idls.clear()
+                self._accounts_coders.clear()
+                self._programs.clear()
+                return
+
+            key = _normalize_path(idl_path)
+            self._idls.pop(key, None)
+            self._accounts_coders.pop(key, None)
+            for program_key in [k for k in self._programs.keys() if k[0] == key]:
+                self._programs.pop(program_key, None)
+
+
+IDL_REGISTRY = IdlRegistry()
+
+
+def get_idl(idl_path: Optional[str] = None) -> Idl:
+    return IDL_REGISTRY.get_idl(idl_path)
+
+
+def get_accounts_coder(idl_path: Optional[str] = None) -> AccountsCoder:
+    return IDL_REGISTRY.get_accounts_coder(idl_path)
+
+
+def get_program(
+    program_id: PublicKey, provider: Provider, idl_path: Optional[str] = None
+) -> Program:
+    return IDL_REGISTRY.get_program(program_id, provider, idl_path)
+
+
+def invalidate_idl_cache(idl_path: Optional[str] = None) -> None:
+    IDL_REGISTRY.invalidate(idl_path)
@@ -1,11 +1,14 @@
-import json
-import os
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
 from anchorpy import Idl
+from marginpy.constants import MAX_MULTIPLE_ACCOUNTS
+from marginpy.utils.data_conversion import b64str_to_bytes
+from marginpy.utils.idl import get_idl
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment
 from solana.transaction import Transaction
 from spl.token.instructions import (
     create_associated_token_account,
@@ -14,12 +17,7 @@ from spl.token.instructions import (
 
 
 def load_idl(idl_path: Optional[str] = None) -> Idl:
-    if idl_path is None:
-        idl_path = os.path.join(os.path.dirname(__file__), "../idl.json")
-    with open(idl_path, "r", encoding="utf-8") as idl_raw:
-        raw_idl = json.load(idl_raw)
-    idl = Idl.from_json(raw_idl)
-    return idl
+    return get_idl(idl_path)
 
 
 # empty dictionnary default safe here because we do use `overrides` read-only
@@ -66,3 +64,52 @@ async def get_or_create_ata(
         await rpc_client.confirm_transaction(resp["result"])
 
     return ata
+
+
+async def get_multiple_accounts_data(
+    rpc_client: AsyncClient,
+    pubkeys: List[PublicKey],
+    commitment: Optional[Commitment] = None,
+) -> Tuple[List[Optional[bytes]], int]:
+    """Fetches the data of the specified accounts, in as few `getMultipleAccounts` calls as the RPC limit allows
+
+    Accounts fetched in the same chunk (up to MAX_MULTIPLE_ACCOUNTS) are read at the same slot.
+
+    Args:
+        rpc_client (AsyncClient): RPC client
+        pubkeys (List[PublicKey]): account addresses
+        commitment (Optional[Commitment], optional): bank state to query. Defaults to the RPC client commitment.
+
+    Raises:
+        Exception: RPC call errors out
+
+    Returns:
+        Tuple[List[Optional[bytes]], int]: account data ordered as `pubkeys` (None for missing accounts),
+            and the lowest slot the data was read at
+    """
+
+    chunks = [
+        pubkeys[i : i + MAX_MULTIPLE_ACCOUNTS]  # noqa: E203
+        for i in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS)
+    ]
+    responses = await asyncio.gather(
+        *[
+            rpc_client.get_multiple_accounts(chunk, commitment=commitment)  # type: ignore
+            for chunk in chunks
+        ]
+    )
+
+    accounts_data: List[Optional[bytes]] = []
+    slots = []
+    for chunk, response in zip(chunks, responses):
+        if "error" in response.keys():
+            raise Exception(f"Error while fetching {chunk}: {response['error']}")
+        slots.append(response["result"]["context"]["slot"])
+        accounts_data.extend(
+            b64str_to_bytes(account_info["data"][0])
+            if account_info is not None
+            else None
+            for account_info in response["result"]["value"]
+        )
+
+    return accounts_data, min(slots, default=0)
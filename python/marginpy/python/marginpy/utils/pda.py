@@ -1,9 +1,11 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import Sequence, Tuple
 
 from marginpy.constants import (
     PDA_BANK_FEE_VAULT_SEED,
     PDA_BANK_INSURANCE_VAULT_SEED,
     PDA_BANK_VAULT_SEED,
+    PDA_CACHE_SIZE,
     PDA_UTP_AUTH_SEED,
     VERY_VERBOSE_ERROR,
 )
@@ -24,10 +26,38 @@ def get_vault_seeds(vault_type: BankVaultType) -> bytes:
     raise Exception(VERY_VERBOSE_ERROR)
 
 
+@lru_cache(maxsize=PDA_CACHE_SIZE)
+def _find_program_address(
+    seeds: Tuple[bytes, ...], program_id: bytes
+) -> Tuple[PublicKey, int]:
+    return PublicKey.find_program_address(list(seeds), PublicKey(program_id))
+
+
+def find_program_address(
+    seeds: Sequence[bytes], program_id: PublicKey
+) -> Tuple[PublicKey, int]:
+    """
+    Memoized `PublicKey.find_program_address`.
+
+    Bump searches are SHA-256 loops, and the same PDAs get derived for every instruction built.
+    Results are kept in a bounded LRU cache (see `clear_pda_cache`).
+
+    Args:
+        seeds (Sequence[bytes]): PDA seeds
+        program_id (PublicKey): owner program ID
+    """
+
+    return _find_program_address(tuple(seeds), bytes(program_id))
+
+
+def clear_pda_cache() -> None:
+    _find_program_address.cache_clear()
+
+
 def get_utp_authority(
     utp_program_id: PublicKey, authority_seed: PublicKey, program_id: PublicKey
 ) -> Tuple[PublicKey, int]:
-    return PublicKey.find_program_address(
+    return find_program_address(
         [PDA_UTP_AUTH_SEED, bytes(utp_program_id), bytes(authority_seed)], program_id
     )
 
@@ -37,6 +67,6 @@ def get_bank_authority(
     program_id: PublicKey,
     bank_vault_type: BankVaultType = BankVaultType.LIQUIDITY_VAULT,
 ) -> Tuple[PublicKey, int]:
-    return PublicKey.find_program_address(
+    return find_program_address(
         [get_vault_seeds(bank_vault_type), bytes(marginfi_group_pk)], program_id
     )
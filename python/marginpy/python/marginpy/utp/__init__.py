@@ -1,11 +1,12 @@
 from . import mango, zo
 from .account import UtpAccount
-from .observation import EMPTY_OBSERVATION, UtpObservation
+from .observation import EMPTY_OBSERVATION, UtpObservation, UtpObservationError
 
 __all__ = [
     "UtpAccount",
     "EMPTY_OBSERVATION",
     "UtpObservation",
+    "UtpObservationError",
     "mango",
     "zo",
 ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import spl.token.instructions as spl_token_ixs
 from anchorpy import Program
@@ -20,6 +20,8 @@ from marginpy.types import (
     UtpData,
     UtpIndex,
 )
+from marginpy.utils.fixed import I80F48
+from marginpy.utils.misc import get_multiple_accounts_data
 from marginpy.utils.pda import get_utp_authority
 from marginpy.utp.observation import EMPTY_OBSERVATION, UtpObservation
 from solana import system_program
@@ -72,9 +74,25 @@ class UtpAccount(ABC):
         pass
 
     @abstractmethod
-    async def observe(self) -> UtpObservation:
+    def observe_from_data(
+        self, pubkeys: List[PublicKey], accounts_data: List[Optional[bytes]]
+    ) -> UtpObservation:
         pass
 
+    async def observe(self) -> UtpObservation:
+        """
+        Retrieves the UTP observation directly from the UTP accounts and refreshes the cache.
+        """
+
+        logger = get_logger(f"{__name__}.UtpAccount.{UTP_NAME[self.index]}")
+        logger.debug("Observing %s accounts", UTP_NAME[self.index])
+
+        pubkeys = [meta.pubkey for meta in await self.get_observation_accounts()]
+        accounts_data, _ = await get_multiple_accounts_data(
+            self._program.provider.connection, pubkeys
+        )
+        return self.observe_from_data(pubkeys, accounts_data)
+
     @abstractmethod
     async def deposit(self, ui_amount: float) -> TransactionSignature:
         pass
@@ -124,6 +142,14 @@ class UtpAccount(ABC):
     def free_collateral(self) -> float:
         return self.cached_observation.free_collateral
 
+    @property
+    def equity_fixed(self) -> I80F48:
+        return self.cached_observation.equity_fixed
+
+    @property
+    def free_collateral_fixed(self) -> I80F48:
+        return self.cached_observation.free_collateral_fixed
+
     @property
     def init_margin_requirement(self) -> float:
         return self.cached_observation.init_margin_requirement
@@ -1,20 +1,16 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import TYPE_CHECKING, List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import mango
-from marginpy.logger import get_logger
+from marginpy.logger import get_context_logger
 from marginpy.marginpy import utp_observation
 from marginpy.types import InstructionsWrapper
-from marginpy.utils.data_conversion import (
-    b64str_to_bytes,
-    json_to_account_info,
-    ui_to_native,
-)
-from marginpy.utils.pda import get_bank_authority
+from marginpy.utils.data_conversion import ui_to_native
+from marginpy.utils.pda import find_program_address, get_bank_authority
 from marginpy.utp.account import UtpAccount
 from marginpy.utp.mango.config import MangoConfig
+from marginpy.utp.mango.context import MANGO_CONTEXT_CACHE
 from marginpy.utp.mango.instructions import (
     ActivateAccounts,
     ActivateArgs,
@@ -33,7 +29,6 @@ from marginpy.utp.mango.instructions import (
     make_withdraw_ix,
 )
 from marginpy.utp.mango.types import (
-    USDC_TOKEN_DICT,
     MangoExpiryType,
     MangoOrderType,
     UtpMangoPlacePerpOrderOptions,
@@ -41,7 +36,6 @@ from marginpy.utp.mango.types import (
 from marginpy.utp.observation import UtpObservation
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
-from solana.rpc.types import RPCResponse
 from solana.transaction import AccountMeta, Transaction, TransactionSignature
 
 if TYPE_CHECKING:
@@ -84,6 +78,24 @@ class UtpMangoAccount(UtpAccount):
 
         return self._config.mango
 
+    @property
+    def context(self) -> mango.Context:
+        """
+        Gets the shared mango-explorer context for the configured Mango group.
+        """
+
+        return MANGO_CONTEXT_CACHE.get_context(self.config)
+
+    def get_mango_group(self, max_age: Optional[float] = None) -> mango.Group:
+        """
+        Gets the shared decoded Mango group, reloading it once older than `max_age` seconds.
+
+        Args:
+            max_age (float, optional): maximum age of the decoded group, in seconds. Defaults to MANGO_GROUP_TTL.
+        """
+
+        return MANGO_CONTEXT_CACHE.get_group(self.config, max_age)
+
     # --- Others
 
     async def make_activate_ix(self) -> InstructionsWrapper:
@@ -156,20 +168,7 @@ class UtpMangoAccount(UtpAccount):
             self._config.group_pk, self._program.program_id
         )
 
-        with mango.ContextBuilder.build(
-            cluster_name=self.config.cluster,
-            group_name=self.config.group_name,
-        ) as context:
-            mango_group = mango.Group.load(context)
-            token_bank = mango_group.token_bank_by_instrument(
-                USDC_TOKEN_DICT[self.config.cluster]
-            )
-            root_bank = token_bank.ensure_root_bank(context)
-            node_bank = root_bank.pick_node_bank(context)
-
-        root_bank_pk = root_bank.address
-        node_bank_pk = node_bank.address
-        vault_pk = node_bank.vault
+        mango_addresses = MANGO_CONTEXT_CACHE.get_static_addresses(self.config)
 
         create_proxy_token_account_ixs = await self.make_create_proxy_token_account_ixs(
             proxy_token_account_key,
@@ -189,10 +188,10 @@ class UtpMangoAccount(UtpAccount):
                 mango_account=self.address,
                 mango_program=self._config.mango.program_id,
                 mango_group=self._config.mango.group_pk,
-                mango_cache=mango_group.cache,
-                mango_root_bank=root_bank_pk,
-                mango_node_bank=node_bank_pk,
-                mango_vault=vault_pk,
+                mango_cache=mango_addresses.cache,
+                mango_root_bank=mango_addresses.root_bank,
+                mango_node_bank=mango_addresses.node_bank,
+                mango_vault=mango_addresses.vault,
             ),
             program_id=self._client.program_id,
             remaining_accounts=await self._marginfi_account.get_observation_accounts(),
@@ -222,19 +221,7 @@ class UtpMangoAccount(UtpAccount):
     async def make_withdraw_ix(self, ui_amount: float) -> InstructionsWrapper:
         mango_authority_pk, _ = await self.authority()
 
-        with mango.ContextBuilder.build(
-            cluster_name=self.config.cluster, group_name=self.config.group_name
-        ) as context:
-            mango_group = mango.Group.load(context)
-            token_bank = mango_group.token_bank_by_instrument(
-                USDC_TOKEN_DICT[self.config.cluster]
-            )
-            root_bank = token_bank.ensure_root_bank(context)
-            node_bank = root_bank.pick_node_bank(context)
-
-        root_bank_pk = root_bank.address
-        node_bank_pk = node_bank.address
-        vault_pk = node_bank.vault
+        mango_addresses = MANGO_CONTEXT_CACHE.get_static_addresses(self.config)
 
         remaining_accounts = await self._marginfi_account.get_observation_accounts()
 
@@ -249,11 +236,11 @@ class UtpMangoAccount(UtpAccount):
                 mango_account=self.address,
                 mango_program=self._config.mango.program_id,
                 mango_group=self._config.mango.group_pk,
-                mango_cache=mango_group.cache,
-                mango_root_bank=root_bank_pk,
-                mango_node_bank=node_bank_pk,
-                mango_vault=vault_pk,
-                mango_vault_authority=mango_group.signer_key,
+                mango_cache=mango_addresses.cache,
+                mango_root_bank=mango_addresses.root_bank,
+                mango_node_bank=mango_addresses.node_bank,
+                mango_vault=mango_addresses.vault,
+                mango_vault_authority=mango_addresses.signer_key,
             ),
             self._client.program_id,
             remaining_accounts,
@@ -324,10 +311,7 @@ class UtpMangoAccount(UtpAccount):
 
         mango_authority_pk, _ = await self.authority()
 
-        with mango.ContextBuilder.build(
-            cluster_name=self.config.cluster, group_name=self.config.group_name
-        ) as context:
-            mango_group = mango.Group.load(context)
+        mango_addresses = MANGO_CONTEXT_CACHE.get_static_addresses(self.config)
 
         remaining_accounts = await self._marginfi_account.get_observation_accounts()
 
@@ -355,7 +339,7 @@ class UtpMangoAccount(UtpAccount):
                 mango_account=self.address,
                 mango_program=self._config.mango.program_id,
                 mango_group=self._config.mango.group_pk,
-                mango_cache=mango_group.cache,
+                mango_cache=mango_addresses.cache,
                 mango_perp_market=perp_market.address,
                 mango_bids=perp_market.bids_address,
                 mango_asks=perp_market.asks_address,
@@ -455,10 +439,8 @@ class UtpMangoAccount(UtpAccount):
         Creates list of account metas required to observe a Mango account.
         """
 
-        with mango.ContextBuilder.build(
-            cluster_name=self.config.cluster, group_name=self.config.group_name
-        ) as context:
-            mango_group = mango.Group.load(context)
+        mango_addresses = MANGO_CONTEXT_CACHE.get_static_addresses(self.config)
+
         return [
             AccountMeta(
                 pubkey=self.address,
@@ -471,38 +453,31 @@ class UtpMangoAccount(UtpAccount):
                 is_writable=False,
             ),
             AccountMeta(
-                pubkey=mango_group.cache,
+                pubkey=mango_addresses.cache,
                 is_signer=False,
                 is_writable=False,
             ),
         ]
 
-    async def observe(self) -> UtpObservation:
-        """
-        Retrieves the Mango observation directly from the Mango accounts and refreshes the cache.
+    def observe_from_data(
+        self, pubkeys: List[PublicKey], accounts_data: List[Optional[bytes]]
+    ) -> UtpObservation:
         """
+        Computes the Mango observation from the raw observation accounts and refreshes the cache.
 
-        pubkeys = [m.pubkey for m in await self.get_observation_accounts()]
+        Args:
+            pubkeys (List[PublicKey]): observation account addresses, as listed by `get_observation_accounts`
+            accounts_data (List[Optional[bytes]]): matching account data (None for missing accounts)
+        """
 
-        response: RPCResponse = await self._program.provider.connection.get_multiple_accounts(
-            pubkeys  # type: ignore
-        )
-        if "error" in response.keys():
-            raise Exception(f"Error while fetching {pubkeys}: {response['error']}")
-        [mango_account_json, mango_group_json, mango_cache_json] = response["result"][
-            "value"
-        ]
-        if mango_account_json is None:
+        [mango_account_data, mango_group_data, mango_cache_data] = accounts_data
+        if mango_account_data is None:
             raise Exception(f"Mango account {pubkeys[0]} not found")
-        if mango_group_json is None:
+        if mango_group_data is None:
             raise Exception(f"Mango group {pubkeys[1]} not found")
-        if mango_cache_json is None:
+        if mango_cache_data is None:
             raise Exception(f"Mango cache {pubkeys[2]} not found")
 
-        mango_account_data = b64str_to_bytes(json_to_account_info(mango_account_json).data[0])  # type: ignore
-        mango_group_data = b64str_to_bytes(json_to_account_info(mango_group_json).data[0])  # type: ignore
-        mango_cache_data = b64str_to_bytes(json_to_account_info(mango_cache_json).data[0])  # type: ignore
-
         observation = utp_observation.mango.get_observation(
             mango_account_data=mango_account_data,
             mango_group_data=mango_group_data,
@@ -510,20 +485,12 @@ class UtpMangoAccount(UtpAccount):
         )
 
         self._cached_observation = UtpObservation.from_raw(observation)
-
-        return UtpObservation(
-            timestamp=datetime.fromtimestamp(observation.timestamp),
-            equity=observation.equity,
-            free_collateral=observation.free_collateral,
-            is_empty=observation.is_empty,
-            is_rebalance_deposit_needed=observation.is_rebalance_deposit_valid,
-            liquidation_value=observation.liquidation_value,
-            max_rebalance_deposit_amount=observation.max_rebalance_deposit_amount,
-            init_margin_requirement=observation.init_margin_requirement,
-        )
+        return self._cached_observation
 
     def get_logger(self):
-        return get_logger(f"{__name__}.UtpMangoAccount.{self.address}")
+        return get_context_logger(
+            f"{__name__}.UtpMangoAccount", utp_account=self.address
+        )
 
 
 def get_mango_account_pda(
@@ -536,7 +503,7 @@ def get_mango_account_pda(
     [internal] Computes the Mango account PDA tied to the specified user.
     """
 
-    return PublicKey.find_program_address(
+    return find_program_address(
         [
             bytes(mango_group_pk),
             bytes(authority),
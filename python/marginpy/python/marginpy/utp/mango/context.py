@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import mango
+from marginpy.constants import MANGO_GROUP_TTL
+from marginpy.utp.mango.config import MangoConfig
+from marginpy.utp.mango.types import USDC_TOKEN_DICT
+from solana.publickey import PublicKey
+
+
+@dataclass(frozen=True)
+class MangoStaticAddresses:
+    """
+    [internal] Mango group addresses that never change for a given group.
+    """
+
+    cache: PublicKey
+    signer_key: PublicKey
+    root_bank: PublicKey
+    node_bank: PublicKey
+    vault: PublicKey
+
+
+@dataclass
+class _MangoContextEntry:
+    context: mango.Context
+    group: Optional[mango.Group] = None
+    group_timestamp: datetime = datetime.min
+    addresses: Optional[MangoStaticAddresses] = None
+
+
+def _config_key(config: MangoConfig) -> Tuple[str, str, str]:
+    return (config.cluster, config.group_name, str(config.group_pk))
+
+
+class MangoContextCache:
+    """
+    [internal] Process-wide cache of mango-explorer contexts and decoded groups, one per Mango config.
+
+    Static addresses (cache, signer, USDC root/node bank and vault) are memoized until invalidated.
+    The decoded group is reloaded once older than the TTL.
+    """
+
+    _entries: Dict[Tuple[str, str, str], _MangoContextEntry]
+
+    def __init__(self, ttl: float = MANGO_GROUP_TTL) -> None:
+        self.ttl = ttl
+        self._lock = Lock()
+        self._entries = {}
+
+    def _get_entry(self, config: MangoConfig) -> _MangoContextEntry:
+        key = _config_key(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                context = mango.ContextBuilder.build(
+                    cluster_name=config.cluster, group_name=config.group_name
+                )
+                entry = _MangoContextEntry(context=context)
+                self._entries[key] = entry
+        return entry
+
+    def get_context(self, config: MangoConfig) -> mango.Context:
+        """
+        Gets the mango-explorer context for the specified config, building it on first access.
+        """
+
+        return self._get_entry(config).context
+
+    def get_group(
+        self, config: MangoConfig, max_age: Optional[float] = None
+    ) -> mango.Group:
+        """
+        Gets the decoded Mango group for the specified config, reloading it once stale.
+
+        Args:
+            config (MangoConfig): Mango config
+            max_age (Optional[float], optional): maximum age of the decoded group, in seconds.
+                Defaults to the cache TTL.
+        """
+
+        entry = self._get_entry(config)
+        if max_age is None:
+            max_age = self.ttl
+        group_age = (datetime.now() - entry.group_timestamp).total_seconds()
+        if entry.group is None or group_age > max_age:
+            entry.group = mango.Group.load(entry.context)
+            entry.group_timestamp = datetime.now()
+        return entry.group
+
+    def get_static_addresses(self, config: MangoConfig) -> MangoStaticAddresses:
+        """
+        Gets the static Mango group addresses required by the marginfi instructions.
+        """
+
+        entry = self._get_entry(config)
+        if entry.addresses is None:
+            group = self.get_group(config)
+            token_bank = group.token_bank_by_instrument(USDC_TOKEN_DICT[config.cluster])
+            root_bank = token_bank.ensure_root_bank(entry.context)
+            node_bank = root_bank.pick_node_bank(entry.context)
+            entry.addresses = MangoStaticAddresses(
+                cache=group.cache,
+                signer_key=group.signer_key,
+                root_bank=root_bank.address,
+                node_bank=node_bank.address,
+                vault=node_bank.vault,
+            )
+        return entry.addresses
+
+    def invalidate(self, config: Optional[MangoConfig] = None) -> None:
+        """
+        Drops cached entries (all of them by default) and disposes of their contexts.
+        """
+
+        with self._lock:
+            if config is None:
+                entries = list(self._entries.values())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(_config_key(config), None)
+                entries = [entry] if entry is not None else []
+
+        for entry in entries:
+            entry.context.dispose()
+
+
+MANGO_CONTEXT_CACHE = MangoContextCache()
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.types import UTP_NAME, UtpIndex
+from marginpy.utils.fixed import I80F48
 
 
 class ObservationRaw:
@@ -17,11 +20,25 @@ class ObservationRaw:
     liquidation_value: int
 
 
+class ObservationBatchRaw:
+    timestamp: int
+    free_collateral: List[int]
+    is_empty: List[bool]
+    is_rebalance_deposit_valid: List[bool]
+    max_rebalance_deposit_amount: List[int]
+    init_margin_requirement: List[int]
+    equity: List[int]
+    liquidation_value: List[int]
+    errors: List[Optional[str]]
+
+
 @dataclass
 class UtpObservation:
     """
     UtpObservation struct mirroring on-chain data.
     Contains a UTP health metrics.
+
+    Observations built from native ones also keep the exact native equity and free collateral.
     """
 
     timestamp: datetime
@@ -32,6 +49,28 @@ class UtpObservation:
     is_rebalance_deposit_needed: bool
     max_rebalance_deposit_amount: float
     is_empty: bool
+    equity_native: Optional[int] = None
+    free_collateral_native: Optional[int] = None
+
+    @property
+    def equity_fixed(self) -> I80F48:
+        """
+        Equity in native units, exact when observed natively.
+        """
+
+        if self.equity_native is not None:
+            return I80F48.from_int(self.equity_native)
+        return I80F48.from_number(self.equity * COLLATERAL_SCALING_FACTOR)
+
+    @property
+    def free_collateral_fixed(self) -> I80F48:
+        """
+        Free collateral in native units, exact when observed natively.
+        """
+
+        if self.free_collateral_native is not None:
+            return I80F48.from_int(self.free_collateral_native)
+        return I80F48.from_number(self.free_collateral * COLLATERAL_SCALING_FACTOR)
 
     @staticmethod
     def from_raw(raw: ObservationRaw) -> "UtpObservation":
@@ -46,8 +85,37 @@ class UtpObservation:
             max_rebalance_deposit_amount=raw.max_rebalance_deposit_amount
             / COLLATERAL_SCALING_FACTOR,
             is_empty=raw.is_empty,
+            equity_native=raw.equity,
+            free_collateral_native=raw.free_collateral,
         )
 
+    @staticmethod
+    def from_raw_batch(raw: ObservationBatchRaw) -> List[Optional["UtpObservation"]]:
+        """
+        Unpacks a batch observation, with None for the accounts that could not be observed.
+        """
+
+        timestamp = datetime.fromtimestamp(raw.timestamp)
+        return [
+            UtpObservation(
+                timestamp=timestamp,
+                equity=raw.equity[i] / COLLATERAL_SCALING_FACTOR,
+                free_collateral=raw.free_collateral[i] / COLLATERAL_SCALING_FACTOR,
+                init_margin_requirement=raw.init_margin_requirement[i]
+                / COLLATERAL_SCALING_FACTOR,
+                liquidation_value=raw.liquidation_value[i] / COLLATERAL_SCALING_FACTOR,
+                is_rebalance_deposit_needed=raw.is_rebalance_deposit_valid[i],
+                max_rebalance_deposit_amount=raw.max_rebalance_deposit_amount[i]
+                / COLLATERAL_SCALING_FACTOR,
+                is_empty=raw.is_empty[i],
+                equity_native=raw.equity[i],
+                free_collateral_native=raw.free_collateral[i],
+            )
+            if error is None
+            else None
+            for i, error in enumerate(raw.errors)
+        ]
+
     def __repr__(self):
         return (
             f"Timestamp: {self.timestamp}"
@@ -71,3 +139,18 @@ EMPTY_OBSERVATION = UtpObservation(
     max_rebalance_deposit_amount=0,
     is_empty=False,
 )
+
+
+class UtpObservationError(Exception):
+    """
+    Several UTPs could not be observed. The exception of each one is kept in `errors`.
+    """
+
+    errors: Dict[UtpIndex, Exception]
+
+    def __init__(self, errors: Dict[UtpIndex, Exception]):
+        self.errors = errors
+        failures = ", ".join(
+            f"{UTP_NAME[utp_index]} ({error!r})" for utp_index, error in errors.items()
+        )
+        super().__init__(f"Failed to observe UTPs: {failures}")
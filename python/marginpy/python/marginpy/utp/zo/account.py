@@ -1,18 +1,16 @@
 from __future__ import annotations
 
-from logging import Logger
-from typing import TYPE_CHECKING, List, Tuple
+from datetime import datetime
+from logging import LoggerAdapter
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from marginpy.logger import get_logger
+from marginpy.constants import ZO_CLIENT_MAX_AGE, ZO_STATIC_MAX_AGE
+from marginpy.logger import get_context_logger
 from marginpy.marginpy import utp_observation
 from marginpy.types import InstructionsWrapper
-from marginpy.utils.data_conversion import (
-    b64str_to_bytes,
-    json_to_account_info,
-    ui_to_native,
-)
+from marginpy.utils.data_conversion import ui_to_native
 from marginpy.utils.instructions import make_request_units_ix
-from marginpy.utils.pda import get_bank_authority
+from marginpy.utils.pda import find_program_address, get_bank_authority
 from marginpy.utp.account import UtpAccount
 from marginpy.utp.observation import UtpObservation
 from marginpy.utp.zo.instructions import (
@@ -46,7 +44,6 @@ from marginpy.utp.zo.utils.client.util import (
 )
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
-from solana.rpc.types import RPCResponse
 from solana.system_program import CreateAccountParams, create_account
 from solana.transaction import AccountMeta, Transaction, TransactionSignature
 
@@ -62,6 +59,9 @@ class UtpZoAccount(UtpAccount):
     !! Do not instantiate on its own !!
     """
 
+    _zo_client: Optional[Zo]
+    _zo_client_timestamp: datetime
+
     def __init__(
         self,
         client: MarginfiClient,
@@ -77,6 +77,8 @@ class UtpZoAccount(UtpAccount):
             account_data.is_active,
             account_data.account_config,
         )
+        self._zo_client = None
+        self._zo_client_timestamp = datetime.min
 
     # --- Getters / Setters
 
@@ -181,7 +183,9 @@ class UtpZoAccount(UtpAccount):
             zo_authority_pk,
         )
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client(
+            collateral_mint=self._marginfi_account.group.bank.mint
+        )
 
         remaining_accounts = await self._marginfi_account.get_observation_accounts()
         deposit_ix = make_deposit_ix(
@@ -228,7 +232,9 @@ class UtpZoAccount(UtpAccount):
     async def make_withdraw_ix(self, ui_amount: float) -> InstructionsWrapper:
         zo_authority_pk, _ = await self.authority()
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client(
+            collateral_mint=self._marginfi_account.group.bank.mint
+        )
 
         remaining_accounts = await self._marginfi_account.get_observation_accounts()
         ix = make_withdraw_ix(
@@ -280,7 +286,7 @@ class UtpZoAccount(UtpAccount):
 
         zo_authority_pk, _ = await self.authority()
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client(market_symbol=market_symbol)
         market_info = zo.markets[market_symbol]
         market = zo.dex_markets[market_symbol]
         oo_pk, _ = self.get_oo_adress_for_market(zo.margin.control, market_info.address)
@@ -376,7 +382,7 @@ class UtpZoAccount(UtpAccount):
     ) -> InstructionsWrapper:
         zo_authority_pk, _ = await self.authority()
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client(market_symbol=market_symbol)
         market_info = zo.markets[market_symbol]
         market = zo.dex_markets[market_symbol]
         oo_pk, _ = self.get_oo_adress_for_market(zo.margin.control, market_info.address)
@@ -443,7 +449,7 @@ class UtpZoAccount(UtpAccount):
     ) -> InstructionsWrapper:
         zo_authority_pk, _ = await self.authority()
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client(market_symbol=market_symbol)
 
         market_info = zo.markets[market_symbol]
         oo_pk, _ = self.get_oo_adress_for_market(zo.margin.control, market_info.address)
@@ -486,7 +492,7 @@ class UtpZoAccount(UtpAccount):
     async def make_settle_funds_ix(self, market_symbol: str) -> InstructionsWrapper:
         zo_authority_pk, _ = await self.authority()
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client(market_symbol=market_symbol)
         market_info = zo.markets[market_symbol]
         oo_pk, _ = self.get_oo_adress_for_market(zo.margin.control, market_info.address)
 
@@ -531,7 +537,7 @@ class UtpZoAccount(UtpAccount):
         Creates list of account metas required to observe a Zo account.
         """
 
-        zo = await self.get_zo_client(self.address)
+        zo = await self.get_zo_client()
 
         return [
             AccountMeta(
@@ -556,37 +562,26 @@ class UtpZoAccount(UtpAccount):
             ),
         ]
 
-    async def observe(self) -> UtpObservation:
-        """
-        Retrieves the 01 observation directly from the 01 accounts and refreshes the cache.
+    def observe_from_data(
+        self, pubkeys: List[PublicKey], accounts_data: List[Optional[bytes]]
+    ) -> UtpObservation:
         """
+        Computes the 01 observation from the raw observation accounts and refreshes the cache.
 
-        logger = self.get_logger()
-        logger.debug("Observing 01 accounts")
-
-        pubkeys = [m.pubkey for m in await self.get_observation_accounts()]
+        Args:
+            pubkeys (List[PublicKey]): observation account addresses, as listed by `get_observation_accounts`
+            accounts_data (List[Optional[bytes]]): matching account data (None for missing accounts)
+        """
 
-        response: RPCResponse = await self._program.provider.connection.get_multiple_accounts(
-            pubkeys  # type: ignore
-        )
-        if "error" in response.keys():
-            raise Exception(f"Error while fetching {pubkeys}: {response['error']}")
-        (zo_margin_json, zo_control_json, zo_state_json, zo_cache_json) = response[
-            "result"
-        ]["value"]
-        if zo_margin_json is None:
+        (zo_margin_data, zo_control_data, zo_state_data, zo_cache_data) = accounts_data
+        if zo_margin_data is None:
             raise Exception(f"01 margin {pubkeys[0]} not found")
-        if zo_control_json is None:
+        if zo_control_data is None:
             raise Exception(f"01 control {pubkeys[1]} not found")
-        if zo_state_json is None:
+        if zo_state_data is None:
             raise Exception(f"01 state {pubkeys[2]} not found")
-        if zo_cache_json is None:
-            raise Exception(f"01 state {pubkeys[3]} not found")
-
-        zo_margin_data = b64str_to_bytes(json_to_account_info(zo_margin_json).data[0])  # type: ignore
-        zo_control_data = b64str_to_bytes(json_to_account_info(zo_control_json).data[0])  # type: ignore
-        zo_state_data = b64str_to_bytes(json_to_account_info(zo_state_json).data[0])  # type: ignore
-        zo_cache_data = b64str_to_bytes(json_to_account_info(zo_cache_json).data[0])  # type: ignore
+        if zo_cache_data is None:
+            raise Exception(f"01 cache {pubkeys[3]} not found")
 
         observation = utp_observation.zo.get_observation(
             zo_cache_data=zo_cache_data,
@@ -606,19 +601,106 @@ class UtpZoAccount(UtpAccount):
         [internal] Computes the 01 account PDA tied to the specified user.
         """
 
-        return PublicKey.find_program_address(
+        return find_program_address(
             [bytes(authority), bytes(self.config.state_pk), b"marginv1"],
             self.config.program_id,
         )
 
-    async def get_zo_client(self, margin_pk: PublicKey = None) -> Zo:
-        return await Zo.new(
+    async def get_zo_client(
+        self,
+        margin_pk: PublicKey = None,
+        max_age: float = ZO_CLIENT_MAX_AGE,
+        market_symbol: Optional[str] = None,
+        collateral_mint: Optional[PublicKey] = None,
+    ) -> Zo:
+        """
+        Gets the 01 client owned by this UTP account.
+
+        The client is loaded on first use without orderbooks (instruction builders only need
+        the market metadata and the margin/control pair), then reused until older than `max_age`.
+        Its static data (01 State and dex markets) is fetched again once older than
+        ZO_STATIC_MAX_AGE, or if the specified market or collateral is unknown to it.
+
+        Args:
+            margin_pk (PublicKey, optional): 01 margin account to load. Defaults to the UTP account address.
+            max_age (float, optional): maximum age of the loaded data, in seconds. Defaults to ZO_CLIENT_MAX_AGE.
+            market_symbol (str, optional): market the client is used for. Defaults to None.
+            collateral_mint (PublicKey, optional): collateral mint the client is used for. Defaults to None.
+        """
+
+        if margin_pk is None:
+            margin_pk = self.address
+
+        if self._zo_client is None or self._zo_client.margin_key != margin_pk:
+            await self._load_zo_client(margin_pk)
+            return self._zo_client  # type: ignore
+
+        is_unknown = (
+            market_symbol is not None and market_symbol not in self._zo_client.markets
+        ) or (
+            collateral_mint is not None
+            and collateral_mint not in self._zo_client.collaterals
+        )
+        if is_unknown:
+            await self.refresh(reload_static=True)
+        elif (datetime.now() - self._zo_client_timestamp).total_seconds() > max_age:
+            await self.refresh()
+
+        return self._zo_client  # type: ignore
+
+    async def refresh(
+        self, load_orders: bool = False, reload_static: bool = False
+    ) -> None:
+        """
+        Refreshes the 01 client owned by this UTP account, loading it if needed.
+
+        Static data (01 State and dex markets) is also fetched again once older than ZO_STATIC_MAX_AGE.
+
+        Args:
+            load_orders (bool, optional): flag to also load orderbooks and open orders. Defaults to False.
+            reload_static (bool, optional): flag to fetch static data again regardless of its age. Defaults to False.
+        """
+
+        if self._zo_client is None:
+            await self._load_zo_client(self.address, load_orders)
+            return
+
+        static_timestamp = self._zo_client.static_timestamp
+        if (
+            static_timestamp is not None
+            and (datetime.now() - static_timestamp).total_seconds() > ZO_STATIC_MAX_AGE
+        ):
+            reload_static = True
+
+        await self._zo_client.refresh(
+            commitment=self._program.provider.opts.preflight_commitment,
+            load_orders=load_orders,
+            reload_static=reload_static,
+        )
+        self._zo_client_timestamp = datetime.now()
+
+    async def refresh_margin(self) -> None:
+        """
+        Refreshes the 01 margin/control pair only.
+        """
+
+        zo = await self.get_zo_client()
+        await zo.refresh_margin(
+            commitment=self._program.provider.opts.preflight_commitment
+        )
+
+    async def _load_zo_client(
+        self, margin_pk: PublicKey, load_orders: bool = False
+    ) -> None:
+        self._zo_client = await Zo.new(
             conn=self._program.provider.connection,
             cluster=self.config.cluster,
             tx_opts=self._program.provider.opts,
             payer=self._program.provider.wallet.payer,
             margin_pk=margin_pk,
+            load_orders=load_orders,
         )
+        self._zo_client_timestamp = datetime.now()
 
     def get_oo_adress_for_market(
         self,
@@ -629,10 +711,10 @@ class UtpZoAccount(UtpAccount):
         [internal] Compute the 01 account PDA tied to the specified user.
         """
 
-        return PublicKey.find_program_address(
+        return find_program_address(
             [bytes(zo_control), bytes(market_address)],
             self.config.dex_program,
         )
 
-    def get_logger(self) -> Logger:
-        return get_logger(f"{__name__}.UtpZoAccount.{self.address}")
+    def get_logger(self) -> LoggerAdapter:
+        return get_context_logger(f"{__name__}.UtpZoAccount", utp_account=self.address)
@@ -1,12 +1,20 @@
 import base64
 import enum
 import struct
-from typing import Generator, Literal, NamedTuple, NewType
-
+from typing import (
+    Generator,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    NewType,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
 from solana.publickey import PublicKey
 
-from . import util
-
 i128 = NewType("i128", int)
 u128 = NewType("u128", int)
 
@@ -90,7 +98,20 @@ class Market(NamedTuple):
         return cls.from_bytes(base64.b64decode(b))
 
     def _decode_orderbook_from_base64(self, bids: str, asks: str):
-        return Orderbook(Slab.from_base64(bids), Slab.from_base64(asks), self)
+        return Orderbook(
+            decode_slab_leaves(base64.b64decode(bids))[1],
+            decode_slab_leaves(base64.b64decode(asks))[1],
+            self,
+        )
+
+    def _decode_orderbook_top_from_base64(self, slab: str, n: int):
+        """Decodes the `n` best orders of one slab, walking only the top
+        of its tree."""
+        account_flags, leaves = decode_slab_top_leaves(base64.b64decode(slab), n)
+        side: Literal["bid", "ask"] = (
+            "bid" if AccountFlag.BIDS in account_flags else "ask"
+        )
+        return OrderbookSide(leaves, self, side)
 
 
 class SlabNode:
@@ -216,45 +237,158 @@ class Slab(NamedTuple):
         return cls.from_bytes(base64.b64decode(b))
 
 
-class Orderbook:
-    bids: list[Order]
-    asks: list[Order]
-
-    def __init__(self, bids: Slab, asks: Slab, mkt: Market):
-        kw = {
-            "base_decimals": mkt.base_decimals,
-            "quote_decimals": mkt.quote_decimals,
-            "base_lot_size": mkt.base_lot_size,
-            "quote_lot_size": mkt.quote_lot_size,
-        }
-        self.bids = [
-            Order._make(
-                [
-                    *o,
-                    util.lots_to_price(o.key >> 64, **kw),
-                    util.lots_to_size(
-                        o.quantity,
-                        decimals=mkt.base_decimals,
-                        lot_size=mkt.base_lot_size,
-                    ),
-                    "bid",
-                ]
-            )
-            for o in bids.__reversed__()
-        ]
+SLAB_NODE_SIZE = 72
+_SLAB_HEAD_FMT = "<QQQIIQ"
+_SLAB_HEAD_SIZE = struct.calcsize(_SLAB_HEAD_FMT)
+_SLAB_INNER_TAG = 1
+_SLAB_LEAF_TAG = 2
+
+# Slab node viewed as a leaf (see `SlabNode.Leaf`), the u128 key split in two u64 halves
+SLAB_LEAF_DTYPE = np.dtype(
+    {
+        "names": [
+            "tag",
+            "owner_slot",
+            "fee_tier",
+            "key_lo",
+            "key_hi",
+            "control",
+            "quantity",
+            "client_order_id",
+        ],
+        "formats": ["<u4", "u1", "u1", "<u8", "<u8", ("u1", 32), "<u8", "<u8"],
+        "offsets": [0, 4, 5, 8, 16, 24, 56, 64],
+        "itemsize": SLAB_NODE_SIZE,
+    }
+)
+
+
+def _slab_account_flags(b: bytes) -> AccountFlag:
+    account_flags = AccountFlag(struct.unpack_from("<Q", b)[0])
+    if AccountFlag.INITIALIZED not in account_flags or (
+        (AccountFlag.BIDS in account_flags) == (AccountFlag.ASKS in account_flags)
+    ):
+        raise ValueError("invalid account_flags for slab")
+    return account_flags
+
+
+def decode_slab_leaves(b: bytes) -> Tuple[AccountFlag, np.ndarray]:
+    """Decodes all leaves of a slab in one pass, sorted by ascending key
+    (i.e. price, then order sequence number), as `SLAB_LEAF_DTYPE` records."""
+    b = strip_padding(b)
+    account_flags = _slab_account_flags(b)
+    bump_index = struct.unpack_from("<Q", b, 8)[0]
+
+    n_nodes = min(bump_index, (len(b) - _SLAB_HEAD_SIZE) // SLAB_NODE_SIZE)
+    nodes = np.frombuffer(
+        b, dtype=SLAB_LEAF_DTYPE, count=n_nodes, offset=_SLAB_HEAD_SIZE
+    )
+    leaves = nodes[nodes["tag"] == _SLAB_LEAF_TAG]
+    return account_flags, leaves[np.lexsort((leaves["key_lo"], leaves["key_hi"]))]
+
+
+def decode_slab_top_leaves(b: bytes, n: int) -> Tuple[AccountFlag, np.ndarray]:
+    """Decodes the `n` best leaves of a slab, best first (highest key for
+    bids, lowest for asks), only visiting the nodes on the way to them."""
+    b = strip_padding(b)
+    account_flags = _slab_account_flags(b)
+    _, _, _, _, root, leaf_count = struct.unpack_from(_SLAB_HEAD_FMT, b)
+    ascending = AccountFlag.ASKS in account_flags
+
+    leaves: List[bytes] = []
+    stack = [root] if leaf_count > 0 else []
+    while stack and len(leaves) < n:
+        offset = _SLAB_HEAD_SIZE + stack.pop() * SLAB_NODE_SIZE
+        tag = struct.unpack_from("<I", b, offset)[0]
+        if tag == _SLAB_LEAF_TAG:
+            leaves.append(b[offset : offset + SLAB_NODE_SIZE])  # noqa: E203
+        elif tag == _SLAB_INNER_TAG:
+            left, right = struct.unpack_from("<II", b, offset + 24)
+            stack.extend((right, left) if ascending else (left, right))
+
+    return account_flags, np.frombuffer(b"".join(leaves), dtype=SLAB_LEAF_DTYPE)
 
-        self.asks = [
-            Order._make(
-                (
-                    *o,
-                    util.lots_to_price(o.key >> 64, **kw),  # type: ignore
-                    util.lots_to_size(
-                        o.quantity,  # type: ignore
-                        decimals=mkt.base_decimals,
-                        lot_size=mkt.base_lot_size,
-                    ),
-                    "ask",
-                )  # type: ignore
+
+class OrderbookSide:
+    """One side of an orderbook, best price first.
+
+    Prices and sizes are NumPy arrays. `Order` objects are only built when
+    the side is iterated or indexed."""
+
+    side: Literal["bid", "ask"]
+    leaves: np.ndarray
+    price: np.ndarray
+    size: np.ndarray
+
+    def __init__(self, leaves: np.ndarray, mkt: Market, side: Literal["bid", "ask"]):
+        self.side = side
+        self.leaves = leaves
+        # Same as `util.lots_to_price` and `util.lots_to_size`, up to float rounding
+        self.price = (
+            leaves["key_hi"].astype(np.float64)
+            * mkt.quote_lot_size
+            * 10.0 ** (mkt.base_decimals - mkt.quote_decimals)
+            / mkt.base_lot_size
+        )
+        self.size = (
+            leaves["quantity"].astype(np.float64)
+            * mkt.base_lot_size
+            / 10**mkt.base_decimals
+        )
+        self._orders: Optional[List[Order]] = None
+        self._orders_by_control: dict[bytes, List[Order]] = {}
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    def _order(self, i: int) -> Order:
+        leaf = self.leaves[i]
+        return Order(
+            owner_slot=int(leaf["owner_slot"]),
+            fee_tier=int(leaf["fee_tier"]),
+            order_id=u128(int(leaf["key_hi"]) << 64 | int(leaf["key_lo"])),
+            control=PublicKey(leaf["control"].tobytes()),
+            size_lots=int(leaf["quantity"]),
+            client_order_id=int(leaf["client_order_id"]),
+            price=float(self.price[i]),
+            size=float(self.size[i]),
+            side=self.side,
+        )
+
+    @property
+    def orders(self) -> List[Order]:
+        """All orders, built on first access."""
+        if self._orders is None:
+            self._orders = [self._order(i) for i in range(len(self))]
+        return self._orders
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(self.orders)
+
+    def __getitem__(self, i):
+        if self._orders is not None or isinstance(i, slice):
+            return self.orders[i]
+        return self._order(range(len(self))[i])
+
+    def orders_of(self, control: PublicKey) -> List[Order]:
+        """Orders placed by the specified control account, without building
+        the others. Indexed by control key once scanned."""
+        key = bytes(control)
+        if key not in self._orders_by_control:
+            control_bytes = np.frombuffer(key, dtype=np.uint8)
+            matches = np.flatnonzero(
+                (self.leaves["control"] == control_bytes).all(axis=1)
             )
-            for o in asks
-        ]
+            self._orders_by_control[key] = [self._order(i) for i in matches]
+        return self._orders_by_control[key]
+
+
+class Orderbook:
+    bids: OrderbookSide
+    asks: OrderbookSide
+
+    def __init__(self, bids: np.ndarray, asks: np.ndarray, mkt: Market):
+        """Builds an orderbook from the leaves of both slabs, as sorted
+        by `decode_slab_leaves`."""
+        self.bids = OrderbookSide(bids[::-1], mkt, "bid")
+        self.asks = OrderbookSide(asks, mkt, "ask")
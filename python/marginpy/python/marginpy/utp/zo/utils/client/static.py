@@ -0,0 +1,104 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from anchorpy import Program
+from solana.publickey import PublicKey
+from solana.rpc.commitment import Commitment
+
+
+@dataclass
+class ZoStaticData:
+    """Raw 01 accounts holding effectively static metadata: the State
+    (collaterals, perp markets, vaults) and the dex markets (lot sizes,
+    bids/asks/event queues)."""
+
+    state_key: PublicKey
+    state: bytes
+    dex_markets: dict[PublicKey, bytes]
+    fetched_at: datetime
+
+    @staticmethod
+    async def fetch(
+        program: Program,
+        state_key: PublicKey,
+        *,
+        commitment: Optional[Commitment] = None,
+    ) -> "ZoStaticData":
+        """Fetch the State, then the dex markets it lists."""
+        conn = program.provider.connection
+        res: Any = await conn.get_account_info(
+            state_key, encoding="base64", commitment=commitment
+        )
+        if not res["result"]["value"]:
+            raise ValueError(f"state account {state_key} does not exist")
+        state = base64.b64decode(res["result"]["value"]["data"][0])
+
+        ks = [
+            m.dex_market
+            for m in program.coder.accounts.decode(state).perp_markets
+            if m.dex_market != PublicKey(0)
+        ]
+        res = await conn.get_multiple_accounts(
+            ks, encoding="base64", commitment=commitment
+        )
+        return ZoStaticData(
+            state_key=state_key,
+            state=state,
+            dex_markets={
+                k: base64.b64decode(v["data"][0])
+                for k, v in zip(ks, res["result"]["value"])
+            },
+            fetched_at=datetime.now(),
+        )
+
+    def decode_state(self, program: Program) -> Any:
+        return program.coder.accounts.decode(self.state)
+
+    def save(self, path: str):
+        """Persist to a JSON file, see `load`."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "state_key": str(self.state_key),
+                    "state": base64.b64encode(self.state).decode(),
+                    "dex_markets": {
+                        str(k): base64.b64encode(v).decode()
+                        for k, v in self.dex_markets.items()
+                    },
+                    "fetched_at": self.fetched_at.isoformat(),
+                },
+                f,
+            )
+
+    @staticmethod
+    def load(
+        path: str, state_key: PublicKey, max_age: Optional[float] = None
+    ) -> Optional["ZoStaticData"]:
+        """Load from a JSON file written by `save`. Returns `None` if the
+        file is missing, unreadable, holds another state's data or was
+        fetched more than `max_age` seconds ago."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                d = json.load(f)
+            if PublicKey(d["state_key"]) != state_key:
+                return None
+            fetched_at = datetime.fromisoformat(d["fetched_at"])
+            if (
+                max_age is not None
+                and (datetime.now() - fetched_at).total_seconds() > max_age
+            ):
+                return None
+            return ZoStaticData(
+                state_key=state_key,
+                state=base64.b64decode(d["state"]),
+                dex_markets={
+                    PublicKey(k): base64.b64decode(v)
+                    for k, v in d["dex_markets"].items()
+                },
+                fetched_at=fetched_at,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -3,6 +3,7 @@ from typing import Tuple
 
 import solana.system_program
 from anchorpy import Context, Program
+from marginpy.utils.pda import find_program_address
 from marginpy.utp.zo.utils.client.types import PerpType
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
@@ -87,7 +88,7 @@ def margin_pda(
     state: PublicKey,
     program_id: PublicKey,
 ) -> Tuple[PublicKey, int]:
-    return PublicKey.find_program_address(
+    return find_program_address(
         [
             owner.__bytes__(),
             state.__bytes__(),
@@ -100,7 +101,7 @@ def margin_pda(
 def open_orders_pda(
     *, control: PublicKey, dex_market: PublicKey, program_id: PublicKey
 ) -> Tuple[PublicKey, int]:
-    return PublicKey.find_program_address(
+    return find_program_address(
         [control.__bytes__(), dex_market.__bytes__()], program_id
     )
 
@@ -110,7 +111,7 @@ def state_signer_pda(
     state: PublicKey,
     program_id: PublicKey,
 ) -> Tuple[PublicKey, int]:
-    return PublicKey.find_program_address(
+    return find_program_address(
         [
             state.__bytes__(),
         ],
@@ -1,11 +1,21 @@
 import asyncio
-import json
-import os
 from datetime import datetime
 from datetime import timezone as tz
-from typing import Any, Callable, Generic, List, Literal, TypeVar, Union
-
-from anchorpy import Idl, Program, Provider, Wallet
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from anchorpy import Program, Provider, Wallet
+from marginpy.utils.idl import ZO_IDL_PATH, get_program
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
@@ -14,7 +24,8 @@ from solana.rpc.types import TxOpts
 
 from . import types, util
 from .config import Config, configs
-from .dex import Market, Order, Orderbook
+from .dex import Market, Order, Orderbook, OrderbookSide
+from .static import ZoStaticData
 from .types import CollateralInfo, FundingInfo, MarketInfo, PositionInfo
 
 T = TypeVar("T")
@@ -37,6 +48,12 @@ class ZoIndexer(Generic[T]):
     def __getitem__(self, i: str or int or PublicKey) -> T:
         return self.d[self.m(i)]
 
+    def __contains__(self, i: Union[str, int, PublicKey]) -> bool:
+        try:
+            return self.m(i) in self.d
+        except (KeyError, ValueError):
+            return False
+
 
 class Zo:
     _program: Program
@@ -50,11 +67,17 @@ class Zo:
 
     dex_markets: dict[str, Market]
     _orders: dict[str, list[Order]]
+    _orderbook_cache: dict[str, tuple[str, str, Orderbook]]
 
     _markets_map: dict[str or int, str]
     _collaterals_map: dict[str or int, str]
+    _markets_by_address: dict[PublicKey, str]
+    _collaterals_by_mint: dict[PublicKey, str]
+    _market_indices: dict[str, int]
 
     state: Any
+    _static: Optional[ZoStaticData]
+    _static_cache_path: Optional[str]
     state_signer: PublicKey
     cache: Any
     margin: Any
@@ -69,6 +92,8 @@ class Zo:
         state_signer,
         margin,
         margin_key,
+        static: Optional[ZoStaticData] = None,
+        static_cache_path: Optional[str] = None,
     ):
         self._program = program
         self.config = config
@@ -76,6 +101,18 @@ class Zo:
         self.state_signer = state_signer
         self.margin = margin
         self.margin_key = margin_key
+        self.control = None
+        self._orderbook = {}
+        self._orders = {}
+        self._orderbook_cache = {}
+        self._static = None
+        self._static_cache_path = static_cache_path
+        self.dex_markets = {}
+        if static is not None:
+            self.__apply_static(static, state)
+        elif state is not None:
+            # The dex markets are fetched along with the static data on refresh
+            self.__reload_collaterals()
 
     @staticmethod
     async def new(
@@ -90,6 +127,9 @@ class Zo:
             skip_confirmation=False,
             skip_preflight=False,
         ),
+        load_orders: bool = True,
+        static_cache_path: Optional[str] = None,
+        static_max_age: Optional[float] = None,
     ):
         """Create a new client instance.
 
@@ -103,6 +143,14 @@ class Zo:
             create_margin: Whether to create the associated margin
                 account if it doesn't already exist.
             tx_opts: The transaction options.
+            load_orders: Whether to load the orderbooks and open orders of
+                every market on refresh. Orderbooks can otherwise be loaded
+                per market with `load_orderbooks`.
+            static_cache_path: JSON file the State and dex markets are
+                loaded from if present, and saved to otherwise. Stale files
+                are updated by `refresh(reload_static=True)`.
+            static_max_age: Age in seconds past which the file at
+                `static_cache_path` is ignored and fetched again.
         """
 
         if cluster not in configs.keys():
@@ -113,16 +161,23 @@ class Zo:
         if url is None:
             url = config.cluster_url
 
-        idl_path = os.path.join(os.path.dirname(__file__), "../idl.json")
-        with open(idl_path) as f:
-            raw_idl = json.load(f)
-
-        idl = Idl.from_json(raw_idl)
         wallet = Wallet(payer) if payer is not None else Wallet.local()
         provider = Provider(conn, wallet, opts=tx_opts)
-        program = Program(idl, config.zo_program_id, provider=provider)
+        program = get_program(config.zo_program_id, provider, ZO_IDL_PATH)
+
+        static = None
+        if static_cache_path is not None:
+            static = ZoStaticData.load(
+                static_cache_path, config.zo_state_id, max_age=static_max_age
+            )
+        if static is None:
+            static = await ZoStaticData.fetch(
+                program, config.zo_state_id, commitment=tx_opts.preflight_commitment
+            )
+            if static_cache_path is not None:
+                static.save(static_cache_path)
 
-        state = await program.account["State"].fetch(config.zo_state_id)
+        state = static.decode_state(program)
         state_signer, state_signer_nonce = util.state_signer_pda(
             state=config.zo_state_id, program_id=config.zo_program_id
         )
@@ -145,8 +200,12 @@ class Zo:
             state_signer,
             margin,
             margin_pk,
+            static=static,
+            static_cache_path=static_cache_path,
+        )
+        await zo.refresh(
+            commitment=tx_opts.preflight_commitment, load_orders=load_orders
         )
-        await zo.refresh(commitment=tx_opts.preflight_commitment)
         return zo
 
     @property
@@ -165,6 +224,11 @@ class Zo:
     def wallet(self) -> Wallet:
         return self.provider.wallet
 
+    @property
+    def static_timestamp(self) -> Optional[datetime]:
+        """Time the State and dex markets were fetched, `None` if not yet."""
+        return self._static.fetched_at if self._static is not None else None
+
     @property
     def collaterals(self):
         """List of collaterals and their metadata."""
@@ -177,7 +241,7 @@ class Zo:
 
     @property
     def orderbook(self):
-        """Current state of the orderbook."""
+        """Current state of the loaded orderbooks."""
         return ZoIndexer(self._orderbook, lambda k: self.markets_map(k))
 
     @property
@@ -195,52 +259,68 @@ class Zo:
         """Currently active orders."""
         return ZoIndexer(self._orders, lambda k: self.markets_map(k))
 
-    async def refresh(self, *, commitment: Commitment = Processed):
-        """Refresh the loaded accounts to see updates."""
-        self.state, self.cache, _ = await asyncio.gather(
-            self._program.account["State"].fetch(self.config.zo_state_id, commitment),
+    async def refresh(
+        self,
+        *,
+        commitment: Commitment = Processed,
+        load_orders: bool = True,
+        reload_static: bool = False,
+    ):
+        """Refresh the loaded accounts to see updates.
+
+        The State and dex markets are effectively static and loaded once, on
+        the first refresh if not passed at construction, so only the Cache,
+        margin and control accounts (and books) are fetched.
+
+        Args:
+            commitment: Commitment used for the fetches.
+            load_orders: Whether to also reload the orderbooks and open orders
+                of every market. Instruction builders only need the market
+                metadata, so skipping this saves one large fetch and decode.
+            reload_static: Whether to also re-fetch the State and dex markets,
+                e.g. after markets or collaterals were listed.
+        """
+        if reload_static or self._static is None:
+            await self.__reload_static(commitment=commitment)
+
+        self.cache, _ = await asyncio.gather(
             self._program.account["Cache"].fetch(self.state.cache, commitment),
-            self.__refresh_margin(),
+            self.refresh_margin(commitment=commitment),
         )
 
-        self.__reload_collaterals()
         self.__reload_markets()
         self.__reload_balances()
         self.__reload_positions()
-        await self.__reload_dex_markets(commitment=commitment)
-        await self.__reload_orders(commitment=commitment)
+        if load_orders:
+            await self.load_orderbooks(commitment=commitment)
 
     def collaterals_map(self, k: str or int or PublicKey) -> str:
         if isinstance(k, PublicKey):
-            for i, c in enumerate(self.state.collaterals):
-                if c.mint == k:
-                    return self._collaterals_map[i]
-            raise ValueError("")
+            if k not in self._collaterals_by_mint:
+                raise ValueError(f"no collateral with mint {k}")
+            return self._collaterals_by_mint[k]
         else:
             return self._collaterals_map[k]
 
     def markets_map(self, k: str or int or PublicKey) -> str:
         if isinstance(k, PublicKey):
-            for i, m in enumerate(self.state.perp_markets):
-                if m.dex_market == k:
-                    return self._markets_map[i]
-            raise ValueError("")
+            if k not in self._markets_by_address:
+                raise ValueError(f"no market with dex market {k}")
+            return self._markets_by_address[k]
         else:
             return self._markets_map[k]
 
     def _get_open_orders_info(self, key: int or str, /):
         if isinstance(key, str):
-            for k, v in self._markets_map.items():
-                if v == key and isinstance(k, int):
-                    key = k
-                    break
-            else:
-                ValueError("")
+            if key not in self._market_indices:
+                raise ValueError(f"unknown market {key}")
+            key = self._market_indices[key]
         o = self.control.open_orders_agg[key]
         return o if o.key != PublicKey(0) else None
 
     def __reload_collaterals(self):
         map = {}
+        by_mint = {}
         collaterals = {}
 
         for i, c in enumerate(self.state.collaterals):
@@ -250,6 +330,7 @@ class Zo:
             symbol = util.decode_symbol(c.oracle_symbol)
             map[symbol] = symbol
             map[i] = symbol
+            by_mint.setdefault(c.mint, symbol)
 
             collaterals[symbol] = CollateralInfo(
                 mint=c.mint,
@@ -270,12 +351,18 @@ class Zo:
             )
 
         self._collaterals_map = map
+        self._collaterals_by_mint = by_mint
         self._collaterals = collaterals
 
     def __reload_markets(self):
         map = {}
+        by_address = {}
+        indices = {}
         markets = {}
 
+        # The last oracle of a symbol wins, as with a reversed scan
+        oracles = {util.decode_symbol(o.symbol): o for o in self.cache.oracles}
+
         for i, m in enumerate(self.state.perp_markets):
             if m.dex_market == PublicKey(0):
                 break
@@ -283,13 +370,12 @@ class Zo:
             symbol = util.decode_symbol(m.symbol)
             map[symbol] = symbol
             map[i] = symbol
+            by_address.setdefault(m.dex_market, symbol)
+            indices.setdefault(symbol, i)
 
-            oracle = None
-            for o in reversed(self.cache.oracles):
-                if util.decode_symbol(m.oracle_symbol) == util.decode_symbol(o.symbol):
-                    oracle = o
-                    break
-            else:
+            oracle_symbol = util.decode_symbol(m.oracle_symbol)
+            oracle = oracles.get(oracle_symbol)
+            if oracle is None:
                 raise IndexError(f"oracle for market {symbol} not found")
 
             mark = self.cache.marks[i]
@@ -318,7 +404,7 @@ class Zo:
             markets[symbol] = MarketInfo(
                 address=m.dex_market,
                 symbol=symbol,
-                oracle_symbol=util.decode_symbol(m.oracle_symbol),
+                oracle_symbol=oracle_symbol,
                 perp_type=types.perp_type_to_str(m.perp_type, program=self._program),
                 base_decimals=m.asset_decimals,
                 base_lot_size=m.asset_lot_size,
@@ -334,6 +420,8 @@ class Zo:
             )
 
         self._markets_map = map
+        self._markets_by_address = by_address
+        self._market_indices = indices
         self._markets = markets
 
     def __reload_balances(self):
@@ -387,53 +475,174 @@ class Zo:
         self._position = positions
         pass
 
-    async def __reload_dex_markets(self, *, commitment: None or Commitment = None):
-        ks = [
-            m.dex_market
-            for m in self.state.perp_markets
-            if m.dex_market != PublicKey(0)
-        ]
-        res: Any = await self.connection.get_multiple_accounts(
-            ks, encoding="base64", commitment=commitment
+    async def __reload_static(self, *, commitment: Optional[Commitment] = None):
+        static = await ZoStaticData.fetch(
+            self._program, self.config.zo_state_id, commitment=commitment
         )
-        res = res["result"]["value"]
-        self.dex_markets = {
-            self._markets_map[i]: Market.from_base64(res[i]["data"][0])
-            for i in range(len(self._markets))
-        }
+        self.__apply_static(static)
+        if self._static_cache_path is not None:
+            static.save(self._static_cache_path)
+
+    def __apply_static(self, static: ZoStaticData, state: Any = None):
+        self._static = static
+        self.state = state if state is not None else static.decode_state(self._program)
+        self.__reload_collaterals()
+
+        # Funding and open interest of the dex markets are as of this load,
+        # only their addresses and lot sizes are relied upon
+        dex_markets = {}
+        for m in self.state.perp_markets:
+            if m.dex_market == PublicKey(0):
+                break
+            dex_markets[util.decode_symbol(m.symbol)] = Market.from_bytes(
+                static.dex_markets[m.dex_market]
+            )
+        self.dex_markets = dex_markets
+
+    async def load_orderbooks(
+        self,
+        markets: Optional[Iterable[Union[str, int, PublicKey]]] = None,
+        *,
+        commitment: Optional[Commitment] = None,
+    ):
+        """Load the orderbooks and open orders of some markets only.
+
+        Books whose account data did not change since the last load are not
+        decoded again: the last data of each book is kept for comparison.
+
+        Args:
+            markets: Markets to load. Defaults to every market.
+            commitment: Commitment used for the fetch.
+        """
+        if markets is None:
+            symbols = [self._markets_map[i] for i in range(len(self._markets))]
+        else:
+            symbols = [self.markets_map(m) for m in markets]
 
-    async def __reload_orders(self, *, commitment: None or Commitment = None):
         ks: List[Union[PublicKey, str]] = []
-        for i in range(len(self._markets)):
-            mkt = self.dex_markets[self._markets_map[i]]
+        for s in symbols:
+            mkt = self.dex_markets[s]
             ks.extend((mkt.bids, mkt.asks))
 
         res: Any = await self.connection.get_multiple_accounts(
             ks, encoding="base64", commitment=commitment
         )
         res = res["result"]["value"]
-        orders = self.margin and {}
-        orderbook = {}
 
-        for i in range(len(self._markets)):
-            mkt = self.dex_markets[self._markets_map[i]]
-            ob = mkt._decode_orderbook_from_base64(
-                res[2 * i]["data"][0], res[2 * i + 1]["data"][0]
+        for i, s in enumerate(symbols):
+            ob = self.__decode_orderbook(
+                s, res[2 * i]["data"][0], res[2 * i + 1]["data"][0]
             )
-            orderbook[self._markets_map[i]] = ob
+            self._orderbook[s] = ob
 
             if self.margin is not None:
-                os = []
-                for slab in [ob.bids, ob.asks]:
-                    for o in slab:
-                        if o.control == self.margin.control:
-                            os.append(o)
-                orders[self._markets_map[i]] = os
+                self._orders[s] = self.__own_orders(s, ob)
 
-        self._orderbook = orderbook
-        self._orders = orders
+    async def load_own_orders(self, *, commitment: Optional[Commitment] = None):
+        """Load the open orders of the margin account.
+
+        Only the orderbooks of the markets where the control account reports
+        orders are fetched, the other markets having no open orders.
+        """
+        symbols = []
+        for i in range(len(self._markets)):
+            s = self._markets_map[i]
+            if self.__has_open_orders(s):
+                symbols.append(s)
+            else:
+                self._orders[s] = []
+
+        if len(symbols) > 0:
+            await self.load_orderbooks(symbols, commitment=commitment)
+
+    def __has_open_orders(self, symbol: str) -> bool:
+        if self.control is None:
+            return True
+        oo = self._get_open_orders_info(symbol)
+        return oo is not None and oo.order_count > 0
+
+    def __own_orders(self, symbol: str, ob: Orderbook) -> list[Order]:
+        if not self.__has_open_orders(symbol):
+            return []
+        return ob.bids.orders_of(self.margin.control) + ob.asks.orders_of(
+            self.margin.control
+        )
+
+    def __decode_orderbook(self, symbol: str, bids: str, asks: str) -> Orderbook:
+        # Comparing the raw data is a memcmp, cheaper than hashing it
+        cached = self._orderbook_cache.get(symbol)
+        if cached is not None and cached[0] == bids and cached[1] == asks:
+            return cached[2]
+
+        ob = self.dex_markets[symbol]._decode_orderbook_from_base64(bids, asks)
+        self._orderbook_cache[symbol] = (bids, asks, ob)
+        return ob
+
+    async def get_orderbook(
+        self,
+        market: Union[str, int, PublicKey],
+        *,
+        commitment: Optional[Commitment] = None,
+    ) -> Orderbook:
+        """Load and return the orderbook of one market."""
+        await self.load_orderbooks([market], commitment=commitment)
+        return self._orderbook[self.markets_map(market)]
+
+    async def depth(
+        self,
+        market: Union[str, int, PublicKey],
+        n: int,
+        *,
+        commitment: Optional[Commitment] = None,
+    ) -> Tuple[OrderbookSide, OrderbookSide]:
+        """Fetch the `n` best bids and asks of a market, best first.
+
+        Only the top of each slab tree is walked, instead of decoding the
+        whole orderbook.
+        """
+        mkt = self.dex_markets[self.markets_map(market)]
+        res: Any = await self.connection.get_multiple_accounts(
+            [mkt.bids, mkt.asks], encoding="base64", commitment=commitment
+        )
+        bids, asks = res["result"]["value"]
+        return (
+            mkt._decode_orderbook_top_from_base64(bids["data"][0], n),
+            mkt._decode_orderbook_top_from_base64(asks["data"][0], n),
+        )
+
+    async def best_bid(
+        self,
+        market: Union[str, int, PublicKey],
+        *,
+        commitment: Optional[Commitment] = None,
+    ) -> Optional[Order]:
+        """Fetch the best bid of a market, without decoding the orderbook."""
+        mkt = self.dex_markets[self.markets_map(market)]
+        return await self.__best_order(mkt, mkt.bids, commitment=commitment)
+
+    async def best_ask(
+        self,
+        market: Union[str, int, PublicKey],
+        *,
+        commitment: Optional[Commitment] = None,
+    ) -> Optional[Order]:
+        """Fetch the best ask of a market, without decoding the orderbook."""
+        mkt = self.dex_markets[self.markets_map(market)]
+        return await self.__best_order(mkt, mkt.asks, commitment=commitment)
+
+    async def __best_order(
+        self, mkt: Market, slab: PublicKey, *, commitment: Optional[Commitment] = None
+    ) -> Optional[Order]:
+        res: Any = await self.connection.get_account_info(
+            slab, encoding="base64", commitment=commitment
+        )
+        side = mkt._decode_orderbook_top_from_base64(
+            res["result"]["value"]["data"][0], 1
+        )
+        return side[0] if len(side) > 0 else None
 
-    async def __refresh_margin(self, *, commitment: None or Commitment = None):
+    async def refresh_margin(self, *, commitment: Optional[Commitment] = None):
+        """Refresh the margin and control accounts only."""
         if self.margin_key is not None:
             self.margin, self.control = await asyncio.gather(
                 self._program.account["Margin"].fetch(self.margin_key, commitment),
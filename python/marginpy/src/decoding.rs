@@ -0,0 +1,337 @@
+use crate::utp_observation::AccountData;
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyBytes;
+
+/// Anchor account discriminators
+const MARGINFI_ACCOUNT_DISCRIMINATOR: [u8; 8] = *b"C\xb2\x82m~r\x1c*";
+const MARGINFI_GROUP_DISCRIMINATOR: [u8; 8] = *b"\xb6\x17\xad\xf0\x97\xce\xb6C";
+
+const MAX_UTPS: usize = 32;
+const UTP_ADDRESS_BOOK_SIZE: usize = 4;
+/// `UTPAccountConfig.reserved_space`, 32 `u32`
+const UTP_ACCOUNT_CONFIG_RESERVED_SPACE_SIZE: usize = 32 * 4;
+/// `Bank.reserved_space`, 31 `u128`
+const BANK_RESERVED_SPACE_SIZE: usize = 31 * 16;
+
+/// I80F48 fractional bits
+const I80F48_DIVISOR: f64 = (1u64 << 48) as f64;
+
+/// Converts wrapped I80F48 bits to a float, exactly like `wrapped_fixed_to_float`.
+///
+/// Both the division and the rounding to 6 decimals are correctly rounded, as in Python.
+fn wrapped_fixed_to_float(bits: i128) -> f64 {
+    let value = bits as f64 / I80F48_DIVISOR;
+    format!("{:.6}", value).parse().unwrap_or(value)
+}
+
+/// Sequential reader over Borsh-serialized account data.
+struct Reader<'a> {
+    data: &'a [u8],
+    offset: usize,
+}
+
+impl<'a> Reader<'a> {
+    fn new(data: &'a [u8], discriminator: &[u8; 8]) -> Result<Self, String> {
+        if data.get(..discriminator.len()) != Some(discriminator.as_slice()) {
+            return Err("The discriminator for this account is invalid".to_string());
+        }
+        Ok(Self {
+            data,
+            offset: discriminator.len(),
+        })
+    }
+
+    fn take<const N: usize>(&mut self) -> Result<[u8; N], String> {
+        let bytes = self
+            .data
+            .get(self.offset..self.offset + N)
+            .ok_or_else(|| format!("Account data too short: {} bytes", self.data.len()))?;
+        self.offset += N;
+        Ok(bytes.try_into().unwrap())
+    }
+
+    fn skip(&mut self, n: usize) {
+        self.offset += n;
+    }
+
+    fn pubkey(&mut self) -> Result<[u8; 32], String> {
+        self.take::<32>()
+    }
+
+    fn wrapped_i80f48(&mut self) -> Result<f64, String> {
+        Ok(wrapped_fixed_to_float(i128::from_le_bytes(self.take()?)))
+    }
+
+    fn i64(&mut self) -> Result<i64, String> {
+        Ok(i64::from_le_bytes(self.take()?))
+    }
+
+    fn u8(&mut self) -> Result<u8, String> {
+        Ok(self.take::<1>()?[0])
+    }
+
+    fn bool(&mut self) -> Result<bool, String> {
+        Ok(self.u8()? != 0)
+    }
+}
+
+fn to_py_bytes<'p>(py: Python<'p>, pubkey: &[u8; 32]) -> &'p PyBytes {
+    PyBytes::new(py, pubkey)
+}
+
+/// Decoded `UTPAccountConfig`, without reserved space.
+///
+/// Addresses are raw 32-byte public keys.
+#[pyclass]
+#[derive(Clone)]
+pub struct UtpAccountConfigRaw {
+    address: [u8; 32],
+    authority_seed: [u8; 32],
+    #[pyo3(get)]
+    authority_bump: u8,
+    utp_address_book: [[u8; 32]; UTP_ADDRESS_BOOK_SIZE],
+}
+
+impl UtpAccountConfigRaw {
+    fn read(reader: &mut Reader) -> Result<Self, String> {
+        let config = Self {
+            address: reader.pubkey()?,
+            authority_seed: reader.pubkey()?,
+            authority_bump: reader.u8()?,
+            utp_address_book: [
+                reader.pubkey()?,
+                reader.pubkey()?,
+                reader.pubkey()?,
+                reader.pubkey()?,
+            ],
+        };
+        reader.skip(UTP_ACCOUNT_CONFIG_RESERVED_SPACE_SIZE);
+        Ok(config)
+    }
+}
+
+#[pymethods]
+impl UtpAccountConfigRaw {
+    #[getter]
+    fn address<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.address)
+    }
+
+    #[getter]
+    fn authority_seed<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.authority_seed)
+    }
+
+    #[getter]
+    fn utp_address_book<'p>(&self, py: Python<'p>) -> Vec<&'p PyBytes> {
+        self.utp_address_book
+            .iter()
+            .map(|address| to_py_bytes(py, address))
+            .collect()
+    }
+}
+
+/// Decoded marginfi account, without reserved space.
+///
+/// Wrapped I80F48 fields are converted to floats the same way as `wrapped_fixed_to_float`.
+/// Addresses are raw 32-byte public keys.
+#[pyclass]
+pub struct MarginfiAccountRaw {
+    authority: [u8; 32],
+    marginfi_group: [u8; 32],
+    #[pyo3(get)]
+    deposit_record: f64,
+    #[pyo3(get)]
+    borrow_record: f64,
+    #[pyo3(get)]
+    active_utps: Vec<bool>,
+    #[pyo3(get)]
+    utp_account_config: Vec<UtpAccountConfigRaw>,
+}
+
+impl MarginfiAccountRaw {
+    fn read(reader: &mut Reader) -> Result<Self, String> {
+        Ok(Self {
+            authority: reader.pubkey()?,
+            marginfi_group: reader.pubkey()?,
+            deposit_record: reader.wrapped_i80f48()?,
+            borrow_record: reader.wrapped_i80f48()?,
+            active_utps: (0..MAX_UTPS)
+                .map(|_| reader.bool())
+                .collect::<Result<_, _>>()?,
+            utp_account_config: (0..MAX_UTPS)
+                .map(|_| UtpAccountConfigRaw::read(reader))
+                .collect::<Result<_, _>>()?,
+        })
+    }
+}
+
+#[pymethods]
+impl MarginfiAccountRaw {
+    #[getter]
+    fn authority<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.authority)
+    }
+
+    #[getter]
+    fn marginfi_group<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.marginfi_group)
+    }
+}
+
+/// Decoded marginfi group bank, without reserved space.
+#[pyclass]
+#[derive(Clone)]
+pub struct BankRaw {
+    #[pyo3(get)]
+    scaling_factor_c: f64,
+    #[pyo3(get)]
+    fixed_fee: f64,
+    #[pyo3(get)]
+    interest_fee: f64,
+    #[pyo3(get)]
+    deposit_accumulator: f64,
+    #[pyo3(get)]
+    borrow_accumulator: f64,
+    #[pyo3(get)]
+    last_update: i64,
+    #[pyo3(get)]
+    total_deposits_record: f64,
+    #[pyo3(get)]
+    total_borrows_record: f64,
+    mint: [u8; 32],
+    vault: [u8; 32],
+    #[pyo3(get)]
+    vault_authority_pda_bump: u8,
+    insurance_vault: [u8; 32],
+    #[pyo3(get)]
+    insurance_vault_authority_pda_bump: u8,
+    #[pyo3(get)]
+    insurance_vault_outstanding_transfers: f64,
+    fee_vault: [u8; 32],
+    #[pyo3(get)]
+    fee_vault_authority_pda_bump: u8,
+    #[pyo3(get)]
+    fee_vault_outstanding_transfers: f64,
+    #[pyo3(get)]
+    init_margin_ratio: f64,
+    #[pyo3(get)]
+    maint_margin_ratio: f64,
+    #[pyo3(get)]
+    account_deposit_limit: f64,
+    #[pyo3(get)]
+    lp_deposit_limit: f64,
+}
+
+impl BankRaw {
+    fn read(reader: &mut Reader) -> Result<Self, String> {
+        let bank = Self {
+            scaling_factor_c: reader.wrapped_i80f48()?,
+            fixed_fee: reader.wrapped_i80f48()?,
+            interest_fee: reader.wrapped_i80f48()?,
+            deposit_accumulator: reader.wrapped_i80f48()?,
+            borrow_accumulator: reader.wrapped_i80f48()?,
+            last_update: reader.i64()?,
+            total_deposits_record: reader.wrapped_i80f48()?,
+            total_borrows_record: reader.wrapped_i80f48()?,
+            mint: reader.pubkey()?,
+            vault: reader.pubkey()?,
+            vault_authority_pda_bump: reader.u8()?,
+            insurance_vault: reader.pubkey()?,
+            insurance_vault_authority_pda_bump: reader.u8()?,
+            insurance_vault_outstanding_transfers: reader.wrapped_i80f48()?,
+            fee_vault: reader.pubkey()?,
+            fee_vault_authority_pda_bump: reader.u8()?,
+            fee_vault_outstanding_transfers: reader.wrapped_i80f48()?,
+            init_margin_ratio: reader.wrapped_i80f48()?,
+            maint_margin_ratio: reader.wrapped_i80f48()?,
+            account_deposit_limit: reader.wrapped_i80f48()?,
+            lp_deposit_limit: reader.wrapped_i80f48()?,
+        };
+        reader.skip(BANK_RESERVED_SPACE_SIZE);
+        Ok(bank)
+    }
+}
+
+#[pymethods]
+impl BankRaw {
+    #[getter]
+    fn mint<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.mint)
+    }
+
+    #[getter]
+    fn vault<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.vault)
+    }
+
+    #[getter]
+    fn insurance_vault<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.insurance_vault)
+    }
+
+    #[getter]
+    fn fee_vault<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.fee_vault)
+    }
+}
+
+/// Decoded marginfi group, without reserved space.
+#[pyclass]
+pub struct MarginfiGroupRaw {
+    admin: [u8; 32],
+    #[pyo3(get)]
+    bank: BankRaw,
+    #[pyo3(get)]
+    paused: bool,
+}
+
+impl MarginfiGroupRaw {
+    fn read(reader: &mut Reader) -> Result<Self, String> {
+        Ok(Self {
+            admin: reader.pubkey()?,
+            bank: BankRaw::read(reader)?,
+            paused: reader.bool()?,
+        })
+    }
+}
+
+#[pymethods]
+impl MarginfiGroupRaw {
+    #[getter]
+    fn admin<'p>(&self, py: Python<'p>) -> &'p PyBytes {
+        to_py_bytes(py, &self.admin)
+    }
+}
+
+/// Decodes marginfi account data, skipping `reserved_space`.
+///
+/// Data sliced right before `reserved_space` is accepted.
+#[pyfunction]
+fn decode_marginfi_account(data: AccountData) -> PyResult<MarginfiAccountRaw> {
+    Reader::new(data.0, &MARGINFI_ACCOUNT_DISCRIMINATOR)
+        .and_then(|mut reader| MarginfiAccountRaw::read(&mut reader))
+        .map_err(PyValueError::new_err)
+}
+
+/// Decodes marginfi group data, skipping `reserved_space`.
+///
+/// Data sliced right before `reserved_space` is accepted.
+#[pyfunction]
+fn decode_marginfi_group(data: AccountData) -> PyResult<MarginfiGroupRaw> {
+    Reader::new(data.0, &MARGINFI_GROUP_DISCRIMINATOR)
+        .and_then(|mut reader| MarginfiGroupRaw::read(&mut reader))
+        .map_err(PyValueError::new_err)
+}
+
+pub(crate) fn create_decoding_mod(py: Python<'_>) -> PyResult<&PyModule> {
+    let m = PyModule::new(py, "decoding")?;
+    m.add_function(wrap_pyfunction!(decode_marginfi_account, m)?)?;
+    m.add_function(wrap_pyfunction!(decode_marginfi_group, m)?)?;
+    m.add_class::<MarginfiAccountRaw>()?;
+    m.add_class::<MarginfiGroupRaw>()?;
+    m.add_class::<BankRaw>()?;
+    m.add_class::<UtpAccountConfigRaw>()?;
+    Ok(m)
+}
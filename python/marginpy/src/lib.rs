@@ -1,6 +1,8 @@
+pub mod decoding;
 pub mod utp_observation;
 
 // use pyo3::exceptions::PyValueError;
+use decoding::create_decoding_mod;
 use pyo3::prelude::*;
 use std::collections::HashMap;
 use utp_observation::create_utp_observation_mod;
@@ -36,7 +38,8 @@ impl From<PyErrWrapper> for PyErr {
 #[pymodule]
 fn marginpy(py: Python, m: &PyModule) -> PyResult<()> {
     let utp_observation_mod = create_utp_observation_mod(py)?;
-    let submodules = [utp_observation_mod];
+    let decoding_mod = create_decoding_mod(py)?;
+    let submodules = [utp_observation_mod, decoding_mod];
     let modules: HashMap<String, &PyModule> = submodules
         .iter()
         .map(|x| (format!("marginpy.{}", x.name().unwrap()), *x))
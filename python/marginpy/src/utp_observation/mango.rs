@@ -1,27 +1,20 @@
-use crate::utp_observation::ObservationRaw;
+use crate::utp_observation::{
+    cast_account, now_timestamp, AccountData, ObservationBatchRaw, ObservationRaw,
+};
 use mango_protocol::state::{
     HealthCache, MangoAccount, MangoCache, MangoGroup, UserActiveAssets, MAX_PAIRS,
 };
 use marginfi_common::mango;
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use serum_dex::state::OpenOrders;
-use std::time::{SystemTime, UNIX_EPOCH};
-
-#[pyfunction]
-fn get_observation(
-    mango_group_data: &[u8],
-    mango_account_data: &[u8],
-    mango_cache_data: &[u8],
-) -> PyResult<ObservationRaw> {
-    let timestamp = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap()
-        .as_secs();
-
-    let mango_group: &MangoGroup = bytemuck::from_bytes(mango_group_data);
-    let mango_account: &MangoAccount = bytemuck::from_bytes(mango_account_data);
-    let mango_cache: &MangoCache = bytemuck::from_bytes(mango_cache_data);
 
+fn observe(
+    mango_group: &MangoGroup,
+    mango_cache: &MangoCache,
+    mango_account: &MangoAccount,
+    timestamp: u64,
+) -> Result<ObservationRaw, String> {
     let active_assets = UserActiveAssets::new(mango_group, mango_account, vec![]);
     let mut health_cache = HealthCache::new(active_assets);
     let open_orders_accounts: Vec<Option<&OpenOrders>> = vec![None; MAX_PAIRS];
@@ -32,43 +25,63 @@ fn get_observation(
             mango_account,
             &open_orders_accounts,
         )
-        .unwrap();
+        .map_err(|e| format!("{:?}", e))?;
 
-    let free_collateral: i128 = mango::get_free_collateral(&mut health_cache, mango_group)
-        .unwrap()
-        .to_num();
-    let is_empty: bool = mango::is_empty(&mut health_cache, mango_group).unwrap();
-    let is_rebalance_deposit_valid: bool =
-        mango::is_rebalance_deposit_valid(&mut health_cache, mango_group).unwrap();
-    let max_rebalance_deposit_amount: i128 =
-        mango::get_max_rebalance_deposit_amount(&mut health_cache, mango_group)
-            .unwrap()
-            .to_num();
-    let init_margin_requirement: i128 =
-        mango::get_init_margin_requirement(&mut health_cache, mango_group)
-            .unwrap()
-            .to_num();
-    let equity: i128 = mango::get_equity(&mut health_cache, mango_group)
-        .unwrap()
-        .to_num();
-    let liquidation_value: i128 = mango::get_liquidation_value(&mut health_cache, mango_group)
-        .unwrap()
-        .to_num();
+    let observation =
+        mango::get_observation(&mut health_cache, mango_group).map_err(|e| e.to_string())?;
+
+    Ok(ObservationRaw::from_observation(observation, timestamp))
+}
 
-    Ok(ObservationRaw {
-        timestamp,
-        free_collateral,
-        is_empty,
-        is_rebalance_deposit_valid,
-        max_rebalance_deposit_amount,
-        init_margin_requirement,
-        equity,
-        liquidation_value,
+#[pyfunction]
+fn get_observation(
+    py: Python<'_>,
+    mango_group_data: AccountData,
+    mango_account_data: AccountData,
+    mango_cache_data: AccountData,
+) -> PyResult<ObservationRaw> {
+    py.allow_threads(move || {
+        let mango_group: &MangoGroup = cast_account(mango_group_data.0)?;
+        let mango_account: &MangoAccount = cast_account(mango_account_data.0)?;
+        let mango_cache: &MangoCache = cast_account(mango_cache_data.0)?;
+        observe(mango_group, mango_cache, mango_account, now_timestamp())
     })
+    .map_err(PyValueError::new_err)
+}
+
+/// Observes many Mango accounts of the same group, parsing the group and cache only once.
+///
+/// The GIL is released while computing. Accounts that cannot be observed are reported
+/// in the `errors` column instead of failing the whole batch.
+#[pyfunction]
+fn get_observations(
+    py: Python<'_>,
+    mango_group_data: AccountData,
+    mango_cache_data: AccountData,
+    mango_accounts_data: Vec<AccountData>,
+) -> PyResult<ObservationBatchRaw> {
+    let mango_group: &MangoGroup =
+        cast_account(mango_group_data.0).map_err(PyValueError::new_err)?;
+    let mango_cache: &MangoCache =
+        cast_account(mango_cache_data.0).map_err(PyValueError::new_err)?;
+
+    Ok(py.allow_threads(move || {
+        let timestamp = now_timestamp();
+        let mut batch = ObservationBatchRaw::with_capacity(timestamp, mango_accounts_data.len());
+        for mango_account_data in mango_accounts_data {
+            batch.push(
+                cast_account(mango_account_data.0).and_then(|mango_account| {
+                    observe(mango_group, mango_cache, mango_account, timestamp)
+                }),
+            );
+        }
+        batch
+    }))
 }
 
 pub(crate) fn create_mango_mod(py: Python<'_>) -> PyResult<&PyModule> {
     let m = PyModule::new(py, "mango")?;
     m.add_function(wrap_pyfunction!(get_observation, m)?)?;
+    m.add_function(wrap_pyfunction!(get_observations, m)?)?;
     Ok(m)
 }
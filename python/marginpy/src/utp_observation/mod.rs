@@ -2,8 +2,12 @@ pub mod mango;
 pub mod zo;
 
 use self::{mango::create_mango_mod, zo::create_zo_mod};
+use bytemuck::Pod;
+use marginfi_common::observation::Observation;
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
 use std::collections::HashMap;
+use std::time::{SystemTime, UNIX_EPOCH};
 
 #[allow(dead_code)]
 #[pyclass]
@@ -26,6 +30,122 @@ pub struct ObservationRaw {
     pub liquidation_value: i128,
 }
 
+/// Struct-of-arrays observations of many accounts sharing the same UTP group/state.
+///
+/// Column `i` of every field belongs to the `i`-th input account. Accounts that could not be
+/// observed have zeroed metrics and their error message in `errors`.
+#[pyclass]
+pub struct ObservationBatchRaw {
+    #[pyo3(get)]
+    pub timestamp: u64,
+    #[pyo3(get)]
+    pub free_collateral: Vec<i128>,
+    #[pyo3(get)]
+    pub is_empty: Vec<bool>,
+    #[pyo3(get)]
+    pub is_rebalance_deposit_valid: Vec<bool>,
+    #[pyo3(get)]
+    pub max_rebalance_deposit_amount: Vec<i128>,
+    #[pyo3(get)]
+    pub init_margin_requirement: Vec<i128>,
+    #[pyo3(get)]
+    pub equity: Vec<i128>,
+    #[pyo3(get)]
+    pub liquidation_value: Vec<i128>,
+    #[pyo3(get)]
+    pub errors: Vec<Option<String>>,
+}
+
+impl ObservationBatchRaw {
+    pub fn with_capacity(timestamp: u64, capacity: usize) -> Self {
+        Self {
+            timestamp,
+            free_collateral: Vec::with_capacity(capacity),
+            is_empty: Vec::with_capacity(capacity),
+            is_rebalance_deposit_valid: Vec::with_capacity(capacity),
+            max_rebalance_deposit_amount: Vec::with_capacity(capacity),
+            init_margin_requirement: Vec::with_capacity(capacity),
+            equity: Vec::with_capacity(capacity),
+            liquidation_value: Vec::with_capacity(capacity),
+            errors: Vec::with_capacity(capacity),
+        }
+    }
+
+    pub fn push(&mut self, observation: Result<ObservationRaw, String>) {
+        let (observation, error) = match observation {
+            Ok(observation) => (observation, None),
+            Err(error) => (ObservationRaw::empty(self.timestamp), Some(error)),
+        };
+        self.free_collateral.push(observation.free_collateral);
+        self.is_empty.push(observation.is_empty);
+        self.is_rebalance_deposit_valid
+            .push(observation.is_rebalance_deposit_valid);
+        self.max_rebalance_deposit_amount
+            .push(observation.max_rebalance_deposit_amount);
+        self.init_margin_requirement
+            .push(observation.init_margin_requirement);
+        self.equity.push(observation.equity);
+        self.liquidation_value.push(observation.liquidation_value);
+        self.errors.push(error);
+    }
+}
+
+impl ObservationRaw {
+    pub fn from_observation(observation: Observation, timestamp: u64) -> Self {
+        Self {
+            timestamp,
+            free_collateral: observation.free_collateral.to_num(),
+            is_empty: observation.is_empty,
+            is_rebalance_deposit_valid: observation.is_rebalance_deposit_valid,
+            max_rebalance_deposit_amount: observation.max_rebalance_deposit_amount.to_num(),
+            init_margin_requirement: observation.init_margin_requirement.to_num(),
+            equity: observation.equity.to_num(),
+            liquidation_value: observation.liquidation_value.to_num(),
+        }
+    }
+
+    pub fn empty(timestamp: u64) -> Self {
+        Self {
+            timestamp,
+            free_collateral: 0,
+            is_empty: true,
+            is_rebalance_deposit_valid: false,
+            max_rebalance_deposit_amount: 0,
+            init_margin_requirement: 0,
+            equity: 0,
+            liquidation_value: 0,
+        }
+    }
+}
+
+pub fn now_timestamp() -> u64 {
+    SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .unwrap()
+        .as_secs()
+}
+
+/// Raw account data passed from Python.
+///
+/// `bytes` are borrowed without copy. Other buffer objects (`bytearray`, `memoryview`, `mmap`...)
+/// are copied once into `bytes`, as the buffer protocol is not part of the abi3 API.
+pub struct AccountData<'a>(pub &'a [u8]);
+
+impl<'a> FromPyObject<'a> for AccountData<'a> {
+    fn extract(obj: &'a PyAny) -> PyResult<Self> {
+        if let Ok(bytes) = obj.downcast::<PyBytes>() {
+            return Ok(Self(bytes.as_bytes()));
+        }
+        let bytes: &PyBytes = obj.py().get_type::<PyBytes>().call1((obj,))?.downcast()?;
+        Ok(Self(bytes.as_bytes()))
+    }
+}
+
+/// Casts account bytes to a zero-copy account struct, without panicking on malformed data.
+pub fn cast_account<T: Pod>(data: &[u8]) -> Result<&T, String> {
+    bytemuck::try_from_bytes(data).map_err(|e| format!("{:?}", e))
+}
+
 pub fn create_utp_observation_mod(py: Python<'_>) -> PyResult<&PyModule> {
     let utp_observation_mod = PyModule::new(py, "utp_observation")?;
     let mango_mod = create_mango_mod(py)?;
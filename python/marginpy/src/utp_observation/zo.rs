@@ -1,63 +1,181 @@
-use crate::utp_observation::ObservationRaw;
-use bytemuck::from_bytes;
-use marginfi_common::zo;
+use crate::utp_observation::{
+    cast_account, now_timestamp, AccountData, ObservationBatchRaw, ObservationRaw,
+};
+use marginfi_common::zo::{self, MarginContext};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use std::time::{SystemTime, UNIX_EPOCH};
 use zo_abi::{Cache, Control, Margin, State};
 
+/// Anchor account discriminator length
+const DISCRIMINATOR_LEN: usize = 8;
+
+fn cast_anchor_account<T: bytemuck::Pod>(data: &[u8]) -> Result<&T, String> {
+    cast_account(data.get(DISCRIMINATOR_LEN..).unwrap_or_default())
+}
+
+fn observe(
+    zo_margin: &Margin,
+    zo_control: &Control,
+    zo_state: &State,
+    zo_cache: &Cache,
+    timestamp: u64,
+) -> Result<ObservationRaw, String> {
+    let observation = zo::get_observation(zo_margin, zo_control, zo_state, zo_cache)
+        .map_err(|e| e.to_string())?;
+
+    Ok(ObservationRaw::from_observation(observation, timestamp))
+}
+
 #[pyfunction]
 fn get_observation(
+    py: Python<'_>,
+    zo_margin_data: AccountData,
+    zo_control_data: AccountData,
+    zo_state_data: AccountData,
+    zo_cache_data: AccountData,
+) -> PyResult<ObservationRaw> {
+    py.allow_threads(move || {
+        let zo_margin: &Margin = cast_anchor_account(zo_margin_data.0)?;
+        let zo_control: &Control = cast_anchor_account(zo_control_data.0)?;
+        let zo_state: &State = cast_anchor_account(zo_state_data.0)?;
+        let zo_cache: &Cache = cast_anchor_account(zo_cache_data.0)?;
+        observe(zo_margin, zo_control, zo_state, zo_cache, now_timestamp())
+    })
+    .map_err(PyValueError::new_err)
+}
+
+fn observe_with_context(
     zo_margin_data: &[u8],
     zo_control_data: &[u8],
-    zo_state_data: &[u8],
-    zo_cache_data: &[u8],
-) -> PyResult<ObservationRaw> {
-    let timestamp = SystemTime::now()
-        .duration_since(UNIX_EPOCH)
-        .unwrap()
-        .as_secs();
-
-    let zo_margin: &Margin = from_bytes(&zo_margin_data[8..]);
-    let zo_control: &Control = from_bytes(&zo_control_data[8..]);
-    let zo_state: &State = from_bytes(&zo_state_data[8..]);
-    let zo_cache: &Cache = from_bytes(&zo_cache_data[8..]);
-
-    let free_collateral: i128 = zo::get_free_collateral(zo_margin, zo_control, zo_state, zo_cache)
-        .unwrap()
-        .to_num();
-    let is_empty: bool = zo::is_empty(zo_margin, zo_control, zo_state, zo_cache).unwrap();
-    let is_rebalance_deposit_valid: bool =
-        zo::is_rebalance_deposit_valid(zo_margin, zo_control, zo_state, zo_cache).unwrap();
-    let max_rebalance_deposit_amount: i128 =
-        zo::get_max_rebalance_deposit_amount(zo_margin, zo_control, zo_state, zo_cache)
-            .unwrap()
-            .to_num();
-    let init_margin_requirement: i128 =
-        zo::get_init_margin_requirement(zo_margin, zo_control, zo_state, zo_cache)
-            .unwrap()
-            .to_num();
-    let equity: i128 = zo::get_equity(zo_margin, zo_control, zo_state, zo_cache)
-        .unwrap()
-        .to_num();
-    let liquidation_value: i128 =
-        zo::get_liquidation_value(zo_margin, zo_control, zo_state, zo_cache)
-            .unwrap()
-            .to_num();
-
-    Ok(ObservationRaw {
-        timestamp,
-        free_collateral,
-        is_empty,
-        is_rebalance_deposit_valid,
-        max_rebalance_deposit_amount,
-        init_margin_requirement,
-        equity,
-        liquidation_value,
+    context: &MarginContext,
+    timestamp: u64,
+) -> Result<ObservationRaw, String> {
+    let zo_margin: &Margin = cast_anchor_account(zo_margin_data)?;
+    let zo_control: &Control = cast_anchor_account(zo_control_data)?;
+    let observation = zo::get_observation_with_context(zo_margin, zo_control, context)
+        .map_err(|e| e.to_string())?;
+
+    Ok(ObservationRaw::from_observation(observation, timestamp))
+}
+
+fn observe_batch(
+    context: &MarginContext,
+    zo_margins_data: Vec<AccountData>,
+    zo_controls_data: Vec<AccountData>,
+) -> ObservationBatchRaw {
+    let timestamp = now_timestamp();
+    let mut batch = ObservationBatchRaw::with_capacity(timestamp, zo_margins_data.len());
+    for (zo_margin_data, zo_control_data) in zo_margins_data.into_iter().zip(zo_controls_data) {
+        batch.push(observe_with_context(
+            zo_margin_data.0,
+            zo_control_data.0,
+            context,
+            timestamp,
+        ));
+    }
+    batch
+}
+
+fn check_batch_lengths(
+    zo_margins_data: &[AccountData],
+    zo_controls_data: &[AccountData],
+) -> PyResult<()> {
+    if zo_margins_data.len() != zo_controls_data.len() {
+        return Err(PyValueError::new_err(format!(
+            "Got {} margin accounts but {} control accounts",
+            zo_margins_data.len(),
+            zo_controls_data.len()
+        )));
+    }
+    Ok(())
+}
+
+fn prepare_context(zo_state_data: &[u8], zo_cache_data: &[u8]) -> PyResult<MarginContext> {
+    let zo_state: &State = cast_anchor_account(zo_state_data).map_err(PyValueError::new_err)?;
+    let zo_cache: &Cache = cast_anchor_account(zo_cache_data).map_err(PyValueError::new_err)?;
+
+    Ok(MarginContext::new(zo_state, zo_cache))
+}
+
+/// Observes many 01 margin/control pairs under the same state, preparing the state and cache only once.
+///
+/// The GIL is released while computing. Accounts that cannot be observed are reported
+/// in the `errors` column instead of failing the whole batch.
+#[pyfunction]
+fn get_observations(
+    py: Python<'_>,
+    zo_state_data: AccountData,
+    zo_cache_data: AccountData,
+    zo_margins_data: Vec<AccountData>,
+    zo_controls_data: Vec<AccountData>,
+) -> PyResult<ObservationBatchRaw> {
+    check_batch_lengths(&zo_margins_data, &zo_controls_data)?;
+
+    py.allow_threads(move || {
+        let context = prepare_context(zo_state_data.0, zo_cache_data.0)?;
+        Ok(observe_batch(&context, zo_margins_data, zo_controls_data))
     })
 }
 
+/// 01 state and cache, prepared once and reusable across observations.
+///
+/// Oracle prices, weights and funding indexes are resolved at construction,
+/// so each observation only walks the account's own positions.
+#[pyclass]
+struct ObservationContext {
+    context: MarginContext,
+}
+
+#[pymethods]
+impl ObservationContext {
+    #[new]
+    fn new(
+        py: Python<'_>,
+        zo_state_data: AccountData,
+        zo_cache_data: AccountData,
+    ) -> PyResult<Self> {
+        py.allow_threads(move || {
+            Ok(Self {
+                context: prepare_context(zo_state_data.0, zo_cache_data.0)?,
+            })
+        })
+    }
+
+    fn get_observation(
+        &self,
+        py: Python<'_>,
+        zo_margin_data: AccountData,
+        zo_control_data: AccountData,
+    ) -> PyResult<ObservationRaw> {
+        let context = &self.context;
+        py.allow_threads(move || {
+            observe_with_context(
+                zo_margin_data.0,
+                zo_control_data.0,
+                context,
+                now_timestamp(),
+            )
+        })
+        .map_err(PyValueError::new_err)
+    }
+
+    fn get_observations(
+        &self,
+        py: Python<'_>,
+        zo_margins_data: Vec<AccountData>,
+        zo_controls_data: Vec<AccountData>,
+    ) -> PyResult<ObservationBatchRaw> {
+        check_batch_lengths(&zo_margins_data, &zo_controls_data)?;
+
+        let context = &self.context;
+        Ok(py.allow_threads(move || observe_batch(context, zo_margins_data, zo_controls_data)))
+    }
+}
+
 pub(crate) fn create_zo_mod(py: Python<'_>) -> PyResult<&PyModule> {
     let m = PyModule::new(py, "zo")?;
     m.add_function(wrap_pyfunction!(get_observation, m)?)?;
+    m.add_function(wrap_pyfunction!(get_observations, m)?)?;
+    m.add_class::<ObservationContext>()?;
     Ok(m)
 }
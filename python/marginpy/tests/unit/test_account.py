@@ -1,12 +1,21 @@
+import asyncio
+import base64
+
 from anchorpy import Program, Provider, Wallet
 from marginpy import Environment, MarginfiAccount, MarginfiClient, MarginfiConfig
+from marginpy.account import (
+    MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET,
+    MARGINFI_ACCOUNT_SIZE,
+)
 from marginpy.types import UtpData, UtpIndex
 from marginpy.utils.data_conversion import b64str_to_bytes
 from marginpy.utils.misc import load_idl
+from marginpy.utp import UtpObservationError
 from marginpy.utp.mango import UtpMangoAccount
-from pytest import approx, mark
+from pytest import approx, mark, raises
 from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
+from solana.transaction import AccountMeta
 
 from tests.fixtures import REAL_ACCOUNT_PUBKEY_2
 from tests.utils import (
@@ -14,6 +23,8 @@ from tests.utils import (
     load_marginfi_account_data,
     load_marginfi_group,
     load_sample_account_info,
+    load_sample_account_info_raw,
+    make_observation,
 )
 
 
@@ -24,6 +35,15 @@ class TestMarginfiAccountUnit:
         account_data = b64str_to_bytes(account_info.data[0])
         MarginfiAccount.decode(account_data)
 
+    def test_decode_without_reserved_space(self):
+        _, account_info = load_sample_account_info("marginfi_account_2")
+        account_data = b64str_to_bytes(account_info.data[0])
+        assert len(account_data) == MARGINFI_ACCOUNT_SIZE
+        sliced_data = account_data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET]
+        assert MarginfiAccount.decode(sliced_data) == MarginfiAccount.decode(
+            account_data
+        )
+
     def test_from_account_data_raw_factory(self):
         account_address, account_info = load_sample_account_info()
         config = MarginfiConfig(Environment.DEVNET)
@@ -101,3 +121,139 @@ class TestMarginfiAccountUnit:
             is_active=data_decoded.active_utps[UtpIndex.MANGO],
         )
         assert MarginfiAccount._pack_utp_data(data_decoded, UtpIndex.MANGO) == res_exp
+
+
+@mark.unit
+@mark.asyncio
+class TestMarginfiAccountObserveUnit:
+    async def test_observe_utps_concurrent(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+
+        # Each observation only completes once all have started, i.e. when run concurrently:
+        # sequential observations would time out instead
+        started = []
+        all_started = asyncio.Event()
+
+        for utp in account.active_utps:
+
+            async def observe(equity=float(utp.index.value + 1)):
+                started.append(equity)
+                if len(started) == len(account.active_utps):
+                    all_started.set()
+                await all_started.wait()
+                return make_observation(equity)
+
+            utp.observe = observe
+
+        observations = await account.observe_utps(timeout=5)
+        assert sorted(started) == [1, 2]
+        assert observations[UtpIndex.MANGO].equity == 1
+        assert observations[UtpIndex.ZO].equity == 2
+        assert account.observation_cache == observations
+
+    async def test_observe_utps_partial_failure(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+
+        async def observe_ok():
+            return make_observation(1)
+
+        async def observe_stuck():
+            await asyncio.sleep(10)
+
+        account.mango.observe = observe_ok
+        account.zo.observe = observe_stuck
+
+        with raises(asyncio.TimeoutError):
+            await account.observe_utps(timeout=0.1)
+        assert list(account.observation_cache) == [UtpIndex.MANGO]
+
+        observations = await account.observe_utps(timeout=0.1, raise_on_error=False)
+        assert list(observations) == [UtpIndex.MANGO]
+
+    async def test_observe_utps_several_failures(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+
+        async def observe_invalid():
+            raise ValueError("invalid account data")
+
+        async def observe_stuck():
+            await asyncio.sleep(10)
+
+        account.mango.observe = observe_invalid
+        account.zo.observe = observe_stuck
+
+        with raises(UtpObservationError, match="Mango.*01") as exc_info:
+            await account.observe_utps(timeout=0.1)
+        assert isinstance(exc_info.value.errors[UtpIndex.MANGO], ValueError)
+        assert isinstance(exc_info.value.errors[UtpIndex.ZO], asyncio.TimeoutError)
+        assert exc_info.value.__cause__ is exc_info.value.errors[UtpIndex.MANGO]
+        assert account.observation_cache == {}
+
+    async def test_observe_utps_cancelled(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+
+        async def observe_ok():
+            return make_observation(1)
+
+        async def observe_cancelled():
+            raise asyncio.CancelledError()
+
+        account.mango.observe = observe_ok
+        account.zo.observe = observe_cancelled
+
+        with raises(asyncio.CancelledError):
+            await account.observe_utps(timeout=5, raise_on_error=False)
+
+    async def test_reload_single_round_trip(self, monkeypatch):
+        _, account = load_marginfi_account("marginfi_account_2")
+        fixtures = {}
+        for name in ["marginfi_group_2", "marginfi_account_2"]:
+            account_info_raw = load_sample_account_info_raw(name)
+            fixtures[PublicKey(account_info_raw["pubkey"])] = account_info_raw[
+                "account"
+            ]
+
+        requests = []
+
+        async def get_multiple_accounts(pubkeys, commitment=None):
+            requests.append(pubkeys)
+            value = [
+                fixtures.get(
+                    pubkey,
+                    {"data": [base64.b64encode(bytes(pubkey)).decode(), "base64"]},
+                )
+                for pubkey in pubkeys
+            ]
+            return {"result": {"context": {"slot": 1}, "value": value}}
+
+        monkeypatch.setattr(
+            account.client.program.provider.connection,
+            "get_multiple_accounts",
+            get_multiple_accounts,
+        )
+
+        observed = {}
+        for utp in account.active_utps:
+            pubkeys = [PublicKey(bytes([utp.index.value + 1] * 32))]
+
+            async def get_observation_accounts(pubkeys=pubkeys):
+                return [
+                    AccountMeta(pubkey=pubkey, is_signer=False, is_writable=False)
+                    for pubkey in pubkeys
+                ]
+
+            def observe_from_data(pubkeys, accounts_data, utp_index=utp.index):
+                observed[utp_index] = (pubkeys, accounts_data)
+                return make_observation(utp_index.value)
+
+            utp.get_observation_accounts = get_observation_accounts
+            utp.observe_from_data = observe_from_data
+
+        await account.reload(observe_utps=True)
+
+        assert len(requests) == 1
+        assert len(requests[0]) == 4
+        for pubkeys, accounts_data in observed.values():
+            assert accounts_data == [bytes(pubkey) for pubkey in pubkeys]
+        assert list(account.observation_cache) == [UtpIndex.MANGO, UtpIndex.ZO]
+        assert account.deposits == approx(143, 0.000001)
@@ -0,0 +1,165 @@
+import asyncio
+import base64
+
+from marginpy.account import MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET
+from marginpy.types import UtpIndex
+from marginpy.utils.data_conversion import b64str_to_bytes
+from pytest import mark
+from solana.publickey import PublicKey
+from solana.rpc.types import DataSliceOpts
+
+from tests.utils import load_marginfi_account, load_sample_account_info_raw
+
+
+@mark.unit
+@mark.asyncio
+class TestMarginfiClientUnit:
+    async def test_iter_marginfi_accounts(self, monkeypatch):
+        _, account = load_marginfi_account("marginfi_account_2")
+        client = account.client
+        connection = client.program.provider.connection
+        group_info = load_sample_account_info_raw("marginfi_group_2")["account"]
+        account_info = load_sample_account_info_raw("marginfi_account_2")["account"]
+        addresses = [str(PublicKey(bytes([i + 1] * 32))) for i in range(10)]
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_program_accounts(*args, **kwargs):
+            return {"result": [{"pubkey": address} for address in addresses]}
+
+        async def get_account_info(*args, **kwargs):
+            return {"result": {"context": {"slot": 1}, "value": group_info}}
+
+        async def get_multiple_accounts(pubkeys, commitment=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {
+                "result": {
+                    "context": {"slot": 1},
+                    "value": [account_info for _ in pubkeys],
+                }
+            }
+
+        monkeypatch.setattr(connection, "get_program_accounts", get_program_accounts)
+        monkeypatch.setattr(connection, "get_account_info", get_account_info)
+        monkeypatch.setattr(connection, "get_multiple_accounts", get_multiple_accounts)
+
+        chunks = [
+            chunk
+            async for chunk in client.iter_marginfi_accounts(
+                chunk_size=3, max_concurrency=2
+            )
+        ]
+
+        assert sorted(len(chunk) for chunk in chunks) == [1, 3, 3, 3]
+        assert max_in_flight == 2
+        assert sorted(str(a.pubkey) for chunk in chunks for a in chunk) == sorted(
+            addresses
+        )
+
+    async def test_load_all_marginfi_accounts(self, monkeypatch):
+        _, account = load_marginfi_account("marginfi_account_2")
+        client = account.client
+        connection = client.program.provider.connection
+        group_info = load_sample_account_info_raw("marginfi_group_2")["account"]
+        account_info_raw = load_sample_account_info_raw("marginfi_account_2")
+        data = b64str_to_bytes(account_info_raw["account"]["data"][0])
+        sliced_data = base64.b64encode(data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET])
+
+        requests = []
+
+        async def get_program_accounts(*args, data_slice=None, **kwargs):
+            requests.append(data_slice)
+            return {
+                "result": [
+                    {
+                        "pubkey": account_info_raw["pubkey"],
+                        "account": {"data": [sliced_data.decode(), "base64"]},
+                    }
+                ]
+            }
+
+        async def get_account_info(*args, **kwargs):
+            return {"result": {"context": {"slot": 1}, "value": group_info}}
+
+        monkeypatch.setattr(connection, "get_program_accounts", get_program_accounts)
+        monkeypatch.setattr(connection, "get_account_info", get_account_info)
+
+        [loaded_account] = await client.load_all_marginfi_accounts()
+
+        assert requests == [
+            DataSliceOpts(offset=0, length=MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET)
+        ]
+        assert loaded_account.pubkey == account.pubkey
+        assert loaded_account.deposits == account.deposits
+        assert loaded_account.zo.address == account.zo.address
+
+    async def test_load_all_marginfi_accounts_arrays(self, monkeypatch):
+        _, account = load_marginfi_account("marginfi_account_2")
+        client = account.client
+        connection = client.program.provider.connection
+        account_info_raw = load_sample_account_info_raw("marginfi_account_2")
+        data = b64str_to_bytes(account_info_raw["account"]["data"][0])
+        sliced_data = base64.b64encode(
+            data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET]
+        ).decode()
+
+        async def get_program_accounts(*args, **kwargs):
+            return {
+                "result": [
+                    {
+                        "pubkey": account_info_raw["pubkey"],
+                        "account": {"data": [sliced_data, "base64"]},
+                    }
+                ]
+                * 3
+            }
+
+        monkeypatch.setattr(connection, "get_program_accounts", get_program_accounts)
+
+        arrays = await client.load_all_marginfi_accounts_arrays()
+
+        assert len(arrays) == 3
+        assert arrays.addresses == [account.pubkey] * 3
+        assert arrays.authority_pubkey(2) == account.authority
+        assert arrays.utp_address_pubkey(0, UtpIndex.ZO.value) == account.zo.address
+
+    async def test_load_all_marginfi_account_snapshots(self, monkeypatch):
+        _, account = load_marginfi_account("marginfi_account_2")
+        client = account.client
+        connection = client.program.provider.connection
+        group_info = load_sample_account_info_raw("marginfi_group_2")["account"]
+        account_info_raw = load_sample_account_info_raw("marginfi_account_2")
+        data = b64str_to_bytes(account_info_raw["account"]["data"][0])
+        sliced_data = base64.b64encode(
+            data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET]
+        ).decode()
+
+        async def get_program_accounts(*args, **kwargs):
+            return {
+                "result": [
+                    {
+                        "pubkey": account_info_raw["pubkey"],
+                        "account": {"data": [sliced_data, "base64"]},
+                    }
+                ]
+                * 3
+            }
+
+        async def get_account_info(*args, **kwargs):
+            return {"result": {"context": {"slot": 1}, "value": group_info}}
+
+        monkeypatch.setattr(connection, "get_program_accounts", get_program_accounts)
+        monkeypatch.setattr(connection, "get_account_info", get_account_info)
+
+        snapshots = await client.load_all_marginfi_account_snapshots()
+
+        assert len(snapshots) == 3
+        assert all(snapshot.group is snapshots[0].group for snapshot in snapshots)
+        assert snapshots[0].pubkey == account.pubkey
+        assert snapshots[0].deposits == account.deposits
+        assert snapshots[0].to_account().zo.address == account.zo.address
@@ -0,0 +1,75 @@
+from marginpy.account import (
+    MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET,
+    MARGINFI_ACCOUNT_SIZE,
+    MarginfiAccount,
+)
+from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.types import UtpIndex
+from marginpy.utils.columnar import (
+    MARGINFI_ACCOUNT_DTYPE,
+    MARGINFI_ACCOUNT_FULL_DTYPE,
+    decode_marginfi_accounts,
+    i80f48_to_int,
+)
+from marginpy.utils.data_conversion import b64str_to_bytes, wrapped_fixed_to_float
+from pytest import approx, mark, raises
+
+from tests.utils import load_sample_account_info
+
+
+def _load_data(name: str) -> bytes:
+    return b64str_to_bytes(load_sample_account_info(name)[1].data[0])
+
+
+@mark.unit
+class TestColumnarUnit:
+    def test_dtype_sizes(self):
+        assert MARGINFI_ACCOUNT_DTYPE.itemsize == MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET
+        assert MARGINFI_ACCOUNT_FULL_DTYPE.itemsize == MARGINFI_ACCOUNT_SIZE
+
+    def test_decode_marginfi_accounts(self):
+        accounts_data = [
+            _load_data("marginfi_account_1"),
+            _load_data("marginfi_account_2"),
+        ]
+        expected = [MarginfiAccount.decode(data) for data in accounts_data]
+
+        for data in [
+            accounts_data,
+            [data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET] for data in accounts_data],
+            b"".join(accounts_data),
+            b"".join(
+                data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET] for data in accounts_data
+            ),
+        ]:
+            arrays = decode_marginfi_accounts(data)
+            assert len(arrays) == 2
+            for i, account_data in enumerate(expected):
+                assert arrays.authority_pubkey(i) == account_data.authority
+                assert arrays.deposit_record[i] == approx(
+                    wrapped_fixed_to_float(account_data.deposit_record)
+                    / COLLATERAL_SCALING_FACTOR
+                )
+                assert arrays.borrow_record[i] == approx(
+                    wrapped_fixed_to_float(account_data.borrow_record)
+                    / COLLATERAL_SCALING_FACTOR
+                )
+                assert arrays.active_utps[i].tolist() == account_data.active_utps
+                for utp_index in UtpIndex:
+                    assert (
+                        arrays.utp_address_pubkey(i, utp_index.value)
+                        == account_data.utp_account_config[utp_index.value].address
+                    )
+                assert (
+                    i80f48_to_int(arrays.raw["deposit_record"])[i]
+                    == account_data.deposit_record.bits >> 48
+                )
+
+    def test_decode_marginfi_accounts_throw(self):
+        account_data = _load_data("marginfi_account_2")
+        with raises(Exception):
+            decode_marginfi_accounts([account_data[:100]])
+        with raises(Exception):
+            decode_marginfi_accounts(account_data[:-1])
+        with raises(Exception):
+            decode_marginfi_accounts([_load_data("marginfi_group_2")])
@@ -1,4 +1,18 @@
-from pytest import approx, mark
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.utils.columnar import I80F48_DTYPE
+from marginpy.utils.fixed import (
+    I80F48,
+    I80F48_FRACTIONAL_BITS,
+    I80F48_ONE_BITS,
+    bits_mul,
+    bits_to_float,
+    i80f48_bits,
+)
+from pytest import approx, mark, raises
 
 from tests.utils import load_marginfi_account
 
@@ -10,3 +24,67 @@ def test_fixed_conversion() -> None:
     _, account = load_marginfi_account("marginfi_account_2")
 
     assert account.deposits == approx(143, 0.000001)
+
+
+@mark.unit
+def test_fixed_arithmetic() -> None:
+    """Test exact I80F48 arithmetic."""
+
+    one_third = I80F48(I80F48_ONE_BITS) / 3
+    assert one_third * 3 == I80F48(I80F48_ONE_BITS - 1)
+    assert (one_third * I80F48.from_int(3)).bits == I80F48_ONE_BITS - 1
+    assert I80F48.from_number(0.5) + 1 == I80F48.from_number(Fraction(3, 2))
+    assert -I80F48.from_number(1.5) < I80F48.from_int(-1)
+    assert (-I80F48.from_number(1.5)).floor() == -2
+    assert int(-I80F48.from_number(1.5)) == -1
+    assert I80F48.from_number(Decimal("0.1")).to_float() == approx(0.1, abs=1e-14)
+
+    with raises(Exception):
+        I80F48(1 << 127)
+    with raises(ZeroDivisionError):
+        I80F48.from_int(1) / 0
+
+
+@mark.unit
+def test_fixed_account_balances() -> None:
+    """Test exact balances against float ones."""
+
+    _, account = load_marginfi_account("marginfi_account_2")
+    bank = account.group.bank
+
+    deposits = account.deposits_fixed
+    assert (
+        deposits.bits
+        == (
+            account._deposit_record_fixed.bits  # pylint: disable=protected-access
+            * bank.deposit_accumulator_fixed.bits
+        )
+        >> I80F48_FRACTIONAL_BITS
+    )
+    assert deposits.to_float() / COLLATERAL_SCALING_FACTOR == approx(account.deposits)
+
+    balances = account.compute_balances_fixed()
+    assert balances.assets == deposits
+    assert balances.equity == deposits - account.borrows_fixed
+
+
+@mark.unit
+def test_fixed_batch() -> None:
+    """Test the vectorized form against scalar I80F48 arithmetic."""
+
+    values = [
+        I80F48.from_number(value)
+        for value in [0, 1, -1, 142.915073, -(2**70) / 3, 2**78 / 7]
+    ]
+    raw = np.array(
+        [(value.bits & (2**64 - 1), value.bits >> 64) for value in values],
+        dtype=I80F48_DTYPE,
+    )
+    factor = I80F48.from_number(1.0008)
+
+    bits = i80f48_bits(raw)
+    assert bits.tolist() == [value.bits for value in values]
+    assert bits_mul(bits, factor.bits).tolist() == [
+        (value * factor).bits for value in values
+    ]
+    assert bits_to_float(bits).tolist() == [value.to_float() for value in values]
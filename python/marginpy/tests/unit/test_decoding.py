@@ -0,0 +1,64 @@
+from marginpy import decoding
+from marginpy.account import MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET, MarginfiAccount
+from marginpy.group import MarginfiGroup
+from marginpy.utils.data_conversion import b64str_to_bytes, wrapped_fixed_to_float
+from pytest import mark, raises
+
+from tests.utils import load_sample_account_info
+
+
+def _load_data(name: str) -> bytes:
+    return b64str_to_bytes(load_sample_account_info(name)[1].data[0])
+
+
+@mark.unit
+class TestDecodingUnit:
+    @mark.parametrize("name", ["marginfi_account_1", "marginfi_account_2"])
+    def test_decode_marginfi_account(self, name):
+        data = _load_data(name)
+        expected = MarginfiAccount.decode(data)
+
+        for encoded in [data, data[:MARGINFI_ACCOUNT_RESERVED_SPACE_OFFSET]]:
+            decoded = decoding.decode_marginfi_account(encoded)
+            assert decoded.authority == bytes(expected.authority)
+            assert decoded.marginfi_group == bytes(expected.marginfi_group)
+            assert decoded.deposit_record == wrapped_fixed_to_float(
+                expected.deposit_record
+            )
+            assert decoded.borrow_record == wrapped_fixed_to_float(
+                expected.borrow_record
+            )
+            assert decoded.active_utps == expected.active_utps
+            for config, expected_config in zip(
+                decoded.utp_account_config, expected.utp_account_config
+            ):
+                assert config.address == bytes(expected_config.address)
+                assert config.authority_seed == bytes(expected_config.authority_seed)
+                assert config.authority_bump == expected_config.authority_bump
+                assert config.utp_address_book == [
+                    bytes(address) for address in expected_config.utp_address_book
+                ]
+
+    @mark.parametrize("name", ["marginfi_group_1", "marginfi_group_2"])
+    def test_decode_marginfi_group(self, name):
+        data = _load_data(name)
+        expected = MarginfiGroup.decode(data)
+
+        decoded = decoding.decode_marginfi_group(data)
+        assert decoded.admin == bytes(expected.admin)
+        assert decoded.paused == expected.paused
+        assert decoded.bank.mint == bytes(expected.bank.mint)
+        assert decoded.bank.fee_vault == bytes(expected.bank.fee_vault)
+        assert decoded.bank.last_update == expected.bank.last_update
+        assert decoded.bank.deposit_accumulator == wrapped_fixed_to_float(
+            expected.bank.deposit_accumulator
+        )
+        assert decoded.bank.lp_deposit_limit == wrapped_fixed_to_float(
+            expected.bank.lp_deposit_limit
+        )
+
+    def test_decode_throw(self):
+        with raises(ValueError):
+            decoding.decode_marginfi_account(_load_data("marginfi_group_2"))
+        with raises(ValueError):
+            decoding.decode_marginfi_account(_load_data("marginfi_account_2")[:100])
@@ -0,0 +1,76 @@
+import asyncio
+import base64
+
+from pytest import mark
+
+from tests.utils import load_marginfi_account, load_sample_account_info_raw
+
+
+def _mock_group_fetch(monkeypatch, connection, slots):
+    group_info = load_sample_account_info_raw("marginfi_group_2")["account"]
+    fetches = []
+
+    async def get_multiple_accounts(pubkeys, commitment=None):
+        fetches.append(pubkeys)
+        await asyncio.sleep(0.01)
+        return {
+            "result": {
+                "context": {"slot": slots[min(len(fetches), len(slots)) - 1]},
+                "value": [group_info],
+            }
+        }
+
+    monkeypatch.setattr(connection, "get_multiple_accounts", get_multiple_accounts)
+    return fetches
+
+
+@mark.unit
+@mark.asyncio
+class TestMarginfiGroupCacheUnit:
+    async def test_get_group_ttl(self, monkeypatch):
+        _, account = load_marginfi_account("marginfi_account_2")
+        client = account.client
+        fetches = _mock_group_fetch(
+            monkeypatch, client.program.provider.connection, [10, 20]
+        )
+
+        group = await client.get_group()
+        assert group is client.group
+        assert not fetches
+
+        client.group_cache.invalidate()
+        groups = await asyncio.gather(*[client.get_group() for _ in range(5)])
+        assert len(fetches) == 1
+        assert all(g is groups[0] for g in groups)
+        assert client.group_cache.slot == 10
+
+        # Same data is not decoded again
+        assert await client.refresh_group() is groups[0]
+        assert len(fetches) == 2
+        assert client.group_cache.slot == 20
+
+    async def test_update_slot_tracking(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+        cache = account.client.group_cache
+        data = base64.b64decode(
+            load_sample_account_info_raw("marginfi_group_2")["account"]["data"][0]
+        )
+        refreshes = []
+        cache.add_refresh_hook(lambda group, slot: refreshes.append(slot))
+
+        group = cache.update_from_account_data_raw(data, 100)
+        assert cache.group is group
+        assert cache.slot == 100
+        assert refreshes == [100]
+
+        # Data read at an older slot is decoded, but does not replace the cached group
+        changed_data = data[:-1] + bytes([data[-1] ^ 1])
+        older_group = cache.update_from_account_data_raw(changed_data, 50)
+        assert older_group is not group
+        assert cache.group is group
+        assert cache.slot == 100
+        assert refreshes == [100]
+
+        newer_group = cache.update_from_account_data_raw(changed_data, 150)
+        assert cache.group is newer_group
+        assert refreshes == [100, 150]
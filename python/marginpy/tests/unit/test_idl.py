@@ -0,0 +1,38 @@
+from anchorpy import Provider, Wallet
+from marginpy import Environment, MarginfiConfig
+from marginpy.utils.idl import ZO_IDL_PATH, IdlRegistry
+from pytest import mark
+from solana.rpc.async_api import AsyncClient
+
+from tests.config import DEVNET_URL
+
+
+@mark.unit
+class TestIdlRegistry:
+    def test_get_idl_cached(self):
+        registry = IdlRegistry()
+        idl = registry.get_idl()
+        assert registry.get_idl() is idl
+        assert registry.get_idl(ZO_IDL_PATH) is not idl
+        assert registry.get_accounts_coder() is registry.get_accounts_coder()
+
+    def test_invalidate(self):
+        registry = IdlRegistry()
+        idl = registry.get_idl()
+        zo_idl = registry.get_idl(ZO_IDL_PATH)
+        registry.invalidate(ZO_IDL_PATH)
+        assert registry.get_idl() is idl
+        assert registry.get_idl(ZO_IDL_PATH) is not zo_idl
+        registry.invalidate()
+        assert registry.get_idl() is not idl
+
+    def test_get_program(self):
+        registry = IdlRegistry()
+        config = MarginfiConfig(Environment.DEVNET)
+        provider_1 = Provider(AsyncClient(DEVNET_URL), Wallet.dummy())
+        provider_2 = Provider(AsyncClient(DEVNET_URL), Wallet.dummy())
+        program = registry.get_program(config.program_id, provider_1)
+        assert registry.get_program(config.program_id, provider_1) is program
+        other_program = registry.get_program(config.program_id, provider_2)
+        assert other_program is not program
+        assert other_program.idl is program.idl
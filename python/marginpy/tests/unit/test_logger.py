@@ -0,0 +1,26 @@
+import logging
+
+from marginpy.logger import get_context_logger, get_logger
+from pytest import mark
+
+
+@mark.unit
+class TestLoggerUnit:
+    def test_get_logger_cached(self):
+        logger = get_logger("marginpy.test.TestLogger")
+        assert get_logger("marginpy.test.TestLogger") is logger
+        get_logger("marginpy.test.Other")
+
+        # Handler installed once, on the top-level logger only
+        assert not logger.handlers
+        assert len(logging.getLogger("marginpy").handlers) == 1
+
+    def test_context_logger(self, caplog):
+        logger = get_context_logger("marginpy.test.TestLogger", account="abc")
+        with caplog.at_level(logging.INFO, logger="marginpy.test.TestLogger"):
+            logger.info("Deposited %s", 10)
+
+        [record] = caplog.records
+        assert record.name == "marginpy.test.TestLogger"
+        assert record.getMessage() == "[account=abc] Deposited 10"
+        assert record.account == "abc"  # type: ignore
@@ -0,0 +1,35 @@
+import mango
+from marginpy import Environment
+from marginpy.utp.mango.config import MangoConfig
+from marginpy.utp.mango.context import MangoContextCache
+from pytest import mark
+
+
+@mark.unit
+class TestMangoContextCache:
+    def test_get_context_cached(self):
+        cache = MangoContextCache()
+        config = MangoConfig(Environment.DEVNET)
+        context = cache.get_context(config)
+        assert cache.get_context(MangoConfig(Environment.DEVNET)) is context
+        cache.invalidate(config)
+        assert cache.get_context(config) is not context
+        cache.invalidate()
+
+    def test_get_group_ttl(self, monkeypatch):
+        loads = []
+
+        def load(context):
+            loads.append(context)
+            return object()
+
+        monkeypatch.setattr(mango.Group, "load", load)
+
+        cache = MangoContextCache(ttl=60)
+        config = MangoConfig(Environment.DEVNET)
+        group = cache.get_group(config)
+        assert cache.get_group(config) is group
+        assert len(loads) == 1
+        assert cache.get_group(config, max_age=0) is not group
+        assert len(loads) == 2
+        cache.invalidate()
@@ -0,0 +1,34 @@
+from marginpy import Environment, MarginfiConfig
+from marginpy.types import BankVaultType
+from marginpy.utils.pda import (
+    clear_pda_cache,
+    find_program_address,
+    get_bank_authority,
+)
+from pytest import mark
+from solana.publickey import PublicKey
+
+
+@mark.unit
+class TestPda:
+    def test_find_program_address(self):
+        config = MarginfiConfig(Environment.DEVNET)
+        seeds = [b"seed", bytes(config.group_pk)]
+        expected = PublicKey.find_program_address(seeds, config.program_id)
+        clear_pda_cache()
+        assert find_program_address(seeds, config.program_id) == expected
+        assert find_program_address(seeds, config.program_id) == expected
+
+    def test_get_bank_authority(self):
+        config = MarginfiConfig(Environment.DEVNET)
+        liquidity_vault_authority = get_bank_authority(
+            config.group_pk, config.program_id
+        )
+        insurance_vault_authority = get_bank_authority(
+            config.group_pk, config.program_id, BankVaultType.INSURANCE_VAULT
+        )
+        assert liquidity_vault_authority != insurance_vault_authority
+        assert (
+            get_bank_authority(config.group_pk, config.program_id)
+            == liquidity_vault_authority
+        )
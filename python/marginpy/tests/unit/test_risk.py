@@ -0,0 +1,106 @@
+from math import inf
+
+import numpy as np
+from marginpy.constants import COLLATERAL_SCALING_FACTOR
+from marginpy.risk import UtpObservationArrays, compute_group_risk
+from marginpy.types import EquityType, MarginRequirement, UtpIndex
+from marginpy.utils.columnar import decode_marginfi_accounts
+from marginpy.utils.data_conversion import b64str_to_bytes
+from pytest import approx, mark, raises
+
+from tests.utils import (
+    load_marginfi_account,
+    load_sample_account_info,
+    make_observation,
+)
+
+
+def _load_accounts_arrays(n_accounts: int):
+    data = b64str_to_bytes(load_sample_account_info("marginfi_account_2")[1].data[0])
+    return decode_marginfi_accounts([data] * n_accounts)
+
+
+@mark.unit
+class TestGroupRiskUnit:
+    def test_compute_group_risk(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+        arrays = _load_accounts_arrays(3)
+        deposit_record = account._deposit_record  # pylint: disable=protected-access
+        borrow_records = [0, deposit_record / 100, deposit_record * 10]
+        arrays.borrow_record[:] = borrow_records
+        observations = [
+            [make_observation(1), make_observation(2), None],
+            [make_observation(3), make_observation(4), make_observation(5)],
+        ]
+
+        risk = compute_group_risk(
+            arrays,
+            account.group.bank,
+            {
+                utp_index: UtpObservationArrays.from_observations(
+                    observations[utp_index.value]
+                )
+                for utp_index in UtpIndex
+            },
+        )
+
+        for i, borrow_record in enumerate(borrow_records):
+            account._borrow_record = borrow_record  # pylint: disable=protected-access
+            for utp in account.all_utps:
+                observation = observations[utp.index.value][i]
+                utp._cached_observation = (  # pylint: disable=protected-access
+                    observation if observation is not None else make_observation(0)
+                )
+
+            balances = account.compute_balances(EquityType.INIT_REQ_ADJUSTED)
+            assert risk.assets[i] == approx(balances.assets)
+            assert risk.liabilities[i] == approx(balances.liabilities)
+            assert risk.equity[i] == approx(balances.equity)
+            for mreq_type in MarginRequirement:
+                requirement = account.compute_margin_requirement(mreq_type)
+                assert risk.requirements[mreq_type][i] == approx(requirement)
+                assert risk.health[mreq_type][i] == approx(
+                    balances.equity / requirement if requirement > 0 else inf
+                )
+
+        assert risk.is_fully_observed.tolist() == [True, True, False]
+        assert risk.below(MarginRequirement.MAINTENANCE).tolist() == [2]
+        assert risk.rank(MarginRequirement.INITIAL).tolist() == [2, 1, 0]
+        assert risk.rank(MarginRequirement.INITIAL, limit=1).tolist() == [2]
+
+    def test_compute_group_risk_missing_observations(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+        arrays = _load_accounts_arrays(2)
+
+        risk = compute_group_risk(arrays, account.group.bank, {})
+        assert not risk.is_fully_observed.any()
+        assert np.array_equal(risk.assets, risk.deposits)
+
+        with raises(Exception):
+            compute_group_risk(
+                arrays,
+                account.group.bank,
+                {
+                    UtpIndex.MANGO: UtpObservationArrays.from_observations(
+                        [make_observation(1)]
+                    )
+                },
+            )
+
+    def test_compute_group_risk_exact(self):
+        _, account = load_marginfi_account("marginfi_account_2")
+        arrays = _load_accounts_arrays(2)
+        bank = account.group.bank
+
+        risk = compute_group_risk(arrays, bank, {}, exact=True)
+        approximate = compute_group_risk(arrays, bank, {})
+
+        assert (
+            risk.deposits.tolist()
+            == [account.deposits_fixed.to_float() / COLLATERAL_SCALING_FACTOR] * 2
+        )
+        assert risk.deposits == approx(approximate.deposits)
+        for mreq_type in MarginRequirement:
+            assert risk.requirements[mreq_type] == approx(
+                approximate.requirements[mreq_type]
+            )
@@ -0,0 +1,70 @@
+from marginpy.snapshot import MarginfiAccountSnapshot
+from marginpy.types import UtpIndex
+from marginpy.utils.columnar import decode_marginfi_accounts
+from marginpy.utils.data_conversion import b64str_to_bytes
+from pytest import mark, raises
+from solana.publickey import PublicKey
+
+from tests.utils import load_marginfi_account, load_sample_account_info
+
+
+def _load_snapshots(n_accounts: int):
+    address, account = load_marginfi_account("marginfi_account_2")
+    data = b64str_to_bytes(load_sample_account_info("marginfi_account_2")[1].data[0])
+    arrays = decode_marginfi_accounts(
+        [data] * n_accounts, addresses=[address] * n_accounts
+    )
+    return account, MarginfiAccountSnapshot.from_arrays(
+        arrays, account.client, account.group
+    )
+
+
+@mark.unit
+class TestMarginfiAccountSnapshotUnit:
+    def test_from_arrays(self):
+        account, snapshots = _load_snapshots(2)
+
+        assert len(snapshots) == 2
+        for snapshot in snapshots:
+            assert snapshot.pubkey == account.pubkey
+            assert snapshot.authority == account.authority
+            assert snapshot.group is account.group
+            assert snapshot.deposits == account.deposits
+            assert snapshot.borrows == account.borrows
+            assert snapshot.deposits_fixed == account.deposits_fixed
+            assert snapshot.active_utps == [utp.index for utp in account.active_utps]
+
+    def test_to_account(self):
+        account, [snapshot] = _load_snapshots(1)
+
+        loaded_account = snapshot.to_account()
+        assert loaded_account.pubkey == account.pubkey
+        assert loaded_account.deposits == account.deposits
+        for utp_index in UtpIndex:
+            assert snapshot.get_utp_data(utp_index).account_config == (
+                account.all_utps[
+                    utp_index.value
+                ]._utp_config  # pylint: disable=protected-access
+            )
+        assert loaded_account.zo.address == account.zo.address
+        assert loaded_account.mango.is_active == account.mango.is_active
+
+    def test_immutable(self):
+        _, [snapshot] = _load_snapshots(1)
+
+        with raises(AttributeError):
+            snapshot._active_utps = 0  # pylint: disable=protected-access
+        with raises(AttributeError):
+            snapshot.extra = 0  # pylint: disable=attribute-defined-outside-init
+        assert not hasattr(snapshot, "__dict__")
+
+    def test_from_arrays_foreign_group(self):
+        address, account = load_marginfi_account("marginfi_account_2")
+        data = b64str_to_bytes(
+            load_sample_account_info("marginfi_account_2")[1].data[0]
+        )
+        arrays = decode_marginfi_accounts([data], addresses=[address])
+        account.group._pubkey = PublicKey(bytes(32))  # pylint: disable=protected-access
+
+        with raises(Exception):
+            MarginfiAccountSnapshot.from_arrays(arrays, account.client, account.group)
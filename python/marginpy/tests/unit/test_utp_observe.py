@@ -45,3 +45,63 @@ class TestMarginfiAccountUnit:
             utp_observation.zo.get_observation(
                 b"00000000", b"00000000", b"00000000", b"00000000"
             )
+
+    def test_observe_mango_batch(self):
+        mango_group = b64str_to_bytes(
+            load_sample_account_info("mango_group")[1].data[0]
+        )
+        mango_account = b64str_to_bytes(
+            load_sample_account_info("mango_account")[1].data[0]
+        )
+        mango_cache = b64str_to_bytes(
+            load_sample_account_info("mango_cache")[1].data[0]
+        )
+        batch = utp_observation.mango.get_observations(
+            mango_group, mango_cache, [mango_account, b"", mango_account]
+        )
+        assert batch.free_collateral == [197962693, 0, 197962693]
+        assert batch.errors[0] is None
+        assert "SizeMismatch" in batch.errors[1]
+
+    def test_observe_zo_batch(self):
+        zo_margin = b64str_to_bytes(load_sample_account_info("zo_margin")[1].data[0])
+        zo_control = b64str_to_bytes(load_sample_account_info("zo_control")[1].data[0])
+        zo_state = b64str_to_bytes(load_sample_account_info("zo_state")[1].data[0])
+        zo_cache = b64str_to_bytes(load_sample_account_info("zo_cache")[1].data[0])
+        batch = utp_observation.zo.get_observations(
+            zo_state, zo_cache, [zo_margin, zo_margin], [zo_control, b"00000000"]
+        )
+        assert batch.free_collateral == [85091195, 0]
+        assert batch.errors[0] is None
+        assert "SizeMismatch" in batch.errors[1]
+
+    def test_observe_zo_buffer_inputs(self):
+        zo_margin = b64str_to_bytes(load_sample_account_info("zo_margin")[1].data[0])
+        zo_control = b64str_to_bytes(load_sample_account_info("zo_control")[1].data[0])
+        zo_state = b64str_to_bytes(load_sample_account_info("zo_state")[1].data[0])
+        zo_cache = b64str_to_bytes(load_sample_account_info("zo_cache")[1].data[0])
+        assert (
+            utp_observation.zo.get_observation(
+                memoryview(zo_margin),
+                bytearray(zo_control),
+                zo_state,
+                memoryview(zo_cache),
+            ).free_collateral
+            == 85091195
+        )
+
+    def test_observe_zo_prepared_context(self):
+        zo_margin = b64str_to_bytes(load_sample_account_info("zo_margin")[1].data[0])
+        zo_control = b64str_to_bytes(load_sample_account_info("zo_control")[1].data[0])
+        zo_state = b64str_to_bytes(load_sample_account_info("zo_state")[1].data[0])
+        zo_cache = b64str_to_bytes(load_sample_account_info("zo_cache")[1].data[0])
+        context = utp_observation.zo.ObservationContext(zo_state, zo_cache)
+        for _ in range(2):
+            assert (
+                context.get_observation(zo_margin, zo_control).free_collateral
+                == 85091195
+            )
+        batch = context.get_observations([zo_margin], [zo_control])
+        assert batch.free_collateral == [85091195]
+        with raises(ValueError):
+            utp_observation.zo.ObservationContext(zo_state, b"")
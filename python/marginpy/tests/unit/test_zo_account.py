@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from marginpy.constants import ZO_CLIENT_MAX_AGE, ZO_STATIC_MAX_AGE
+from marginpy.utp.zo import account as zo_account
+from pytest import mark
+from solana.publickey import PublicKey
+
+from tests.utils import load_marginfi_account
+
+
+def _stub_zo_new(monkeypatch):
+    """
+    Stubs `Zo.new`, recording the keyword arguments of every call.
+
+    Returns:
+        Tuple[list, list]: `Zo.new` calls, and `Zo.refresh` calls of all the clients created
+    """
+
+    new_calls = []
+    refresh_calls = []
+
+    async def new(**kwargs):
+        new_calls.append(kwargs)
+
+        async def refresh(**refresh_kwargs):
+            refresh_calls.append(refresh_kwargs)
+
+        return SimpleNamespace(
+            margin_key=kwargs["margin_pk"],
+            margin=SimpleNamespace(control=PublicKey(1)),
+            state=SimpleNamespace(cache=PublicKey(2)),
+            state_signer=PublicKey(3),
+            markets={"SOL-PERP": SimpleNamespace(address=PublicKey(4))},
+            collaterals={PublicKey(6): SimpleNamespace(vault=PublicKey(7))},
+            static_timestamp=datetime.now(),
+            refresh=refresh,
+        )
+
+    monkeypatch.setattr(zo_account.Zo, "new", new)
+    return new_calls, refresh_calls
+
+
+@mark.unit
+class TestUtpZoAccountUnit:
+    @mark.asyncio
+    async def test_instruction_builders_share_client(self, monkeypatch):
+        new_calls, refresh_calls = _stub_zo_new(monkeypatch)
+        _, marginfi_account = load_marginfi_account()
+        utp = marginfi_account.zo
+
+        await utp.make_create_perp_open_orders_ix("SOL-PERP")
+        await utp.make_settle_funds_ix("SOL-PERP")
+        await utp.get_observation_accounts()
+
+        assert len(new_calls) == 1
+        assert new_calls[0]["margin_pk"] == utp.address
+        assert new_calls[0]["load_orders"] is False
+        assert not refresh_calls
+
+    @mark.asyncio
+    async def test_refresh_after_max_age(self, monkeypatch):
+        new_calls, refresh_calls = _stub_zo_new(monkeypatch)
+        _, marginfi_account = load_marginfi_account()
+        utp = marginfi_account.zo
+
+        zo = await utp.get_zo_client()
+        expired = datetime.now() - timedelta(seconds=ZO_CLIENT_MAX_AGE + 1)
+        utp._zo_client_timestamp = expired  # pylint: disable=protected-access
+
+        assert await utp.get_zo_client() is zo
+        assert len(new_calls) == 1
+        assert len(refresh_calls) == 1
+
+        assert await utp.get_zo_client() is zo
+        assert len(refresh_calls) == 1
+
+    @mark.asyncio
+    async def test_reload_on_margin_change(self, monkeypatch):
+        new_calls, _ = _stub_zo_new(monkeypatch)
+        _, marginfi_account = load_marginfi_account()
+        utp = marginfi_account.zo
+
+        zo = await utp.get_zo_client()
+        other_zo = await utp.get_zo_client(PublicKey(5))
+
+        assert other_zo is not zo
+        assert other_zo.margin_key == PublicKey(5)
+        assert [call["margin_pk"] for call in new_calls] == [utp.address, PublicKey(5)]
+
+    @mark.asyncio
+    async def test_refresh_forwards_load_orders(self, monkeypatch):
+        new_calls, refresh_calls = _stub_zo_new(monkeypatch)
+        _, marginfi_account = load_marginfi_account()
+        utp = marginfi_account.zo
+
+        await utp.refresh(load_orders=True)
+        assert new_calls[-1]["load_orders"] is True
+
+        await utp.refresh(load_orders=True)
+        await utp.refresh()
+        assert [call["load_orders"] for call in refresh_calls] == [True, False]
+
+    @mark.asyncio
+    async def test_reload_static_after_max_age(self, monkeypatch):
+        _, refresh_calls = _stub_zo_new(monkeypatch)
+        _, marginfi_account = load_marginfi_account()
+        utp = marginfi_account.zo
+
+        zo = await utp.get_zo_client()
+        await utp.refresh()
+        zo.static_timestamp = datetime.now() - timedelta(seconds=ZO_STATIC_MAX_AGE + 1)
+        await utp.refresh()
+
+        assert [call["reload_static"] for call in refresh_calls] == [False, True]
+
+    @mark.asyncio
+    async def test_reload_static_on_unknown_symbol(self, monkeypatch):
+        _, refresh_calls = _stub_zo_new(monkeypatch)
+        _, marginfi_account = load_marginfi_account()
+        utp = marginfi_account.zo
+
+        await utp.get_zo_client()
+        await utp.get_zo_client(market_symbol="SOL-PERP", collateral_mint=PublicKey(6))
+        assert not refresh_calls
+
+        await utp.get_zo_client(market_symbol="BTC-PERP")
+        await utp.get_zo_client(collateral_mint=PublicKey(8))
+        assert [call["reload_static"] for call in refresh_calls] == [True, True]
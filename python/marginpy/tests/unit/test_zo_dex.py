@@ -0,0 +1,246 @@
+import random
+from base64 import b64encode
+from types import SimpleNamespace
+from typing import Optional
+
+from marginpy.utp.zo.utils.client import util
+from marginpy.utp.zo.utils.client.dex import (
+    AccountFlag,
+    Orderbook,
+    Slab,
+    decode_slab_leaves,
+    decode_slab_top_leaves,
+)
+from marginpy.utp.zo.utils.client.zo import Zo
+from pytest import approx, mark, raises
+from solana.publickey import PublicKey
+
+from tests.utils import ZO_MARKET, make_slab_data
+
+_CONTROLS = [PublicKey(bytes([i + 1] * 32)) for i in range(3)]
+
+
+def _make_leaves(n_leaves: int):
+    rng = random.Random(n_leaves)
+    return [
+        (
+            rng.randrange(1, 10_000) << 64 | rng.randrange(2**64),
+            rng.randrange(1, 1_000),
+            rng.choice(_CONTROLS),
+        )
+        for _ in range(n_leaves)
+    ]
+
+
+def _make_zo(slabs: dict, control: PublicKey, fetched: Optional[list] = None) -> Zo:
+    """Zo with a single SOL-PERP market, its bids and asks being the slabs at keys 1 and 2.
+    Fetched keys are appended to `fetched` if specified."""
+
+    def account(key):
+        if fetched is not None:
+            fetched.append(key)
+        return {"data": [b64encode(slabs[key]).decode(), "base64"]}
+
+    async def get_multiple_accounts(keys, **_):
+        return {"result": {"value": [account(key) for key in keys]}}
+
+    async def get_account_info(key, **_):
+        return {"result": {"value": account(key)}}
+
+    connection = SimpleNamespace(
+        get_multiple_accounts=get_multiple_accounts,
+        get_account_info=get_account_info,
+    )
+    zo = Zo(
+        SimpleNamespace(provider=SimpleNamespace(connection=connection)),
+        None,
+        None,
+        None,
+        SimpleNamespace(control=control),
+        None,
+    )
+    # pylint: disable=protected-access
+    zo._markets = {"SOL-PERP": None}
+    zo._markets_map = {0: "SOL-PERP", "SOL-PERP": "SOL-PERP"}
+    zo._market_indices = {"SOL-PERP": 0}
+    zo.dex_markets = {
+        "SOL-PERP": ZO_MARKET._replace(bids=PublicKey(1), asks=PublicKey(2))
+    }
+    return zo
+
+
+def _legacy_orders(slab: Slab, descending: bool):
+    kw = {
+        "base_decimals": ZO_MARKET.base_decimals,
+        "quote_decimals": ZO_MARKET.quote_decimals,
+        "base_lot_size": ZO_MARKET.base_lot_size,
+        "quote_lot_size": ZO_MARKET.quote_lot_size,
+    }
+    leaves = reversed(slab) if descending else iter(slab)
+    return [
+        (
+            leaf.key,
+            leaf.control,
+            leaf.quantity,
+            util.lots_to_price(leaf.key >> 64, **kw),
+            util.lots_to_size(
+                leaf.quantity,
+                decimals=ZO_MARKET.base_decimals,
+                lot_size=ZO_MARKET.base_lot_size,
+            ),
+        )
+        for leaf in leaves
+    ]
+
+
+@mark.unit
+class TestZoDexUnit:
+    def test_decode_orderbook(self):
+        bids_data = make_slab_data(AccountFlag.BIDS, _make_leaves(50))
+        asks_data = make_slab_data(AccountFlag.ASKS, _make_leaves(30))
+
+        _, bids = decode_slab_leaves(bids_data)
+        _, asks = decode_slab_leaves(asks_data)
+        orderbook = Orderbook(bids, asks, ZO_MARKET)
+
+        for side, slab_data, descending in [
+            (orderbook.bids, bids_data, True),
+            (orderbook.asks, asks_data, False),
+        ]:
+            expected = _legacy_orders(Slab.from_bytes(slab_data), descending)
+            assert len(side) == len(expected)
+            assert side.price.tolist() == approx([e[3] for e in expected])
+            assert side.size.tolist() == approx([e[4] for e in expected])
+            assert [
+                (o.order_id, o.control, o.size_lots, o.price, o.size) for o in side
+            ] == [(e[0], e[1], e[2], approx(e[3]), approx(e[4])) for e in expected]
+
+        assert orderbook.bids[0].price == orderbook.bids.price.max()
+        assert orderbook.asks[-1].price == orderbook.asks.price.max()
+
+    def test_orders_of(self):
+        leaves = _make_leaves(40)
+        _, asks = decode_slab_leaves(make_slab_data(AccountFlag.ASKS, leaves))
+        orderbook = Orderbook(asks[:0], asks, ZO_MARKET)
+
+        orders = orderbook.asks.orders_of(_CONTROLS[0])
+        assert [o.order_id for o in orders] == sorted(
+            key for key, _, control in leaves if control == _CONTROLS[0]
+        )
+        assert orderbook.asks._orders is None  # pylint: disable=protected-access
+        assert orderbook.asks.orders_of(_CONTROLS[0]) is orders
+
+    def test_decode_invalid_slab(self):
+        with raises(ValueError):
+            decode_slab_leaves(make_slab_data(AccountFlag.BIDS | AccountFlag.ASKS, []))
+
+    def test_decode_slab_top_leaves(self):
+        for side, leaves in [
+            (AccountFlag.BIDS, _make_leaves(50)),
+            (AccountFlag.ASKS, _make_leaves(30)),
+            (AccountFlag.ASKS, []),
+        ]:
+            slab_data = make_slab_data(side, leaves)
+            _, all_leaves = decode_slab_leaves(slab_data)
+            if side == AccountFlag.BIDS:
+                all_leaves = all_leaves[::-1]
+            for n in [0, 1, 5, 100]:
+                account_flags, top = decode_slab_top_leaves(slab_data, n)
+                assert account_flags == AccountFlag.INITIALIZED | side
+                assert len(top) == min(n, len(leaves))
+                assert (top == all_leaves[:n]).all()
+
+    @mark.asyncio
+    async def test_load_orderbooks(self):
+        slabs = {
+            PublicKey(1): make_slab_data(AccountFlag.BIDS, _make_leaves(20)),
+            PublicKey(2): make_slab_data(AccountFlag.ASKS, _make_leaves(10)),
+        }
+        zo = _make_zo(slabs, _CONTROLS[0])
+
+        orderbook = await zo.get_orderbook("SOL-PERP")
+        assert len(orderbook.bids) == 20 and len(orderbook.asks) == 10
+        assert zo.orders["SOL-PERP"] == orderbook.bids.orders_of(
+            _CONTROLS[0]
+        ) + orderbook.asks.orders_of(_CONTROLS[0])
+
+        await zo.load_orderbooks()
+        assert zo.orderbook["SOL-PERP"] is orderbook
+
+        slabs[PublicKey(2)] = make_slab_data(AccountFlag.ASKS, _make_leaves(5))
+        await zo.load_orderbooks(["SOL-PERP"])
+        assert zo.orderbook["SOL-PERP"] is not orderbook
+        assert len(zo.orderbook["SOL-PERP"].asks) == 5
+
+        best_bid = await zo.best_bid("SOL-PERP")
+        best_ask = await zo.best_ask("SOL-PERP")
+        assert best_bid == zo.orderbook["SOL-PERP"].bids[0]
+        assert best_ask == zo.orderbook["SOL-PERP"].asks[0]
+
+        bids, asks = await zo.depth("SOL-PERP", 3)
+        assert list(bids) == zo.orderbook["SOL-PERP"].bids[:3]
+        assert list(asks) == zo.orderbook["SOL-PERP"].asks[:3]
+
+    @mark.asyncio
+    async def test_load_own_orders(self):
+        slabs = {
+            PublicKey(1): make_slab_data(AccountFlag.BIDS, _make_leaves(20)),
+            PublicKey(2): make_slab_data(AccountFlag.ASKS, _make_leaves(10)),
+        }
+        fetched = []
+        zo = _make_zo(slabs, _CONTROLS[0], fetched)
+        open_orders_info = SimpleNamespace(key=PublicKey(3), order_count=0)
+        zo.control = SimpleNamespace(open_orders_agg=[open_orders_info])
+
+        await zo.load_own_orders()
+        assert not fetched
+        assert zo.orders["SOL-PERP"] == []
+
+        open_orders_info.order_count = 2
+        await zo.load_own_orders()
+        assert fetched == [PublicKey(1), PublicKey(2)]
+        orderbook = zo.orderbook["SOL-PERP"]
+        assert zo.orders["SOL-PERP"] == orderbook.bids.orders_of(
+            _CONTROLS[0]
+        ) + orderbook.asks.orders_of(_CONTROLS[0])
+        assert len(zo.orders["SOL-PERP"]) > 0
+
+    def test_collaterals_map(self):
+        def collateral(mint: PublicKey, symbol: str):
+            return SimpleNamespace(
+                mint=mint,
+                oracle_symbol=SimpleNamespace(
+                    data=list(symbol.encode().ljust(8, b"\0"))
+                ),
+                decimals=6,
+                weight=1000,
+                liq_fee=0,
+                is_borrowable=True,
+                optimal_util=0,
+                optimal_rate=0,
+                max_rate=0,
+                og_fee=0,
+                is_swappable=False,
+                serum_open_orders=PublicKey(0),
+                max_deposit=0,
+                dust_threshold=0,
+            )
+
+        zo = Zo(None, None, None, None, None, None)
+        zo.state = SimpleNamespace(
+            collaterals=[
+                collateral(PublicKey(1), "USDC"),
+                collateral(PublicKey(2), "SOL"),
+                collateral(PublicKey(0), ""),
+            ],
+            vaults=[PublicKey(3), PublicKey(4), PublicKey(0)],
+        )
+        zo._Zo__reload_collaterals()  # pylint: disable=protected-access
+
+        assert zo.collaterals_map(PublicKey(2)) == "SOL"
+        assert zo.collaterals_map(1) == "SOL"
+        assert zo.collaterals[PublicKey(1)].vault == PublicKey(3)
+        assert PublicKey(2) in zo.collaterals
+        assert PublicKey(0) not in zo.collaterals and "BTC" not in zo.collaterals
+        with raises(ValueError):
+            zo.collaterals_map(PublicKey(0))
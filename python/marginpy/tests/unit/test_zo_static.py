@@ -0,0 +1,141 @@
+import struct
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from marginpy.utp.zo.utils.client.dex import AccountFlag
+from marginpy.utp.zo.utils.client.static import ZoStaticData
+from marginpy.utp.zo.utils.client.zo import Zo
+from pytest import mark
+from solana.publickey import PublicKey
+
+
+def _symbol(symbol: str):
+    return SimpleNamespace(data=list(symbol.encode().ljust(24, b"\0")))
+
+
+def _make_market_data(bids: PublicKey, asks: PublicKey) -> bytes:
+    return (
+        b"serum"
+        + struct.pack(
+            "<Q32sQ32s32s32s32s4Q16s5Q32s32s1032x",
+            AccountFlag.INITIALIZED | AccountFlag.MARKET | AccountFlag.PERMISSIONED,
+            bytes(32),
+            0,
+            bytes(32),
+            bytes(32),
+            bytes(bids),
+            bytes(asks),
+            100,
+            10,
+            0,
+            0,
+            bytes(16),
+            0,
+            0,
+            0,
+            8,
+            0,
+            bytes(32),
+            bytes(32),
+        )
+        + b"padding"
+    )
+
+
+@mark.unit
+class TestZoStaticUnit:
+    def test_save_load(self, tmp_path):
+        static = ZoStaticData(
+            state_key=PublicKey(1),
+            state=b"state",
+            dex_markets={PublicKey(2): b"market"},
+            fetched_at=datetime.now() - timedelta(seconds=60),
+        )
+        path = str(tmp_path / "zo_static.json")
+        static.save(path)
+
+        assert ZoStaticData.load(path, PublicKey(1)) == static
+        assert ZoStaticData.load(path, PublicKey(1), max_age=120) == static
+        assert ZoStaticData.load(path, PublicKey(1), max_age=30) is None
+        assert ZoStaticData.load(path, PublicKey(3)) is None
+        assert ZoStaticData.load(str(tmp_path / "missing.json"), PublicKey(1)) is None
+
+    def test_apply_static(self):
+        state = SimpleNamespace(
+            collaterals=[
+                SimpleNamespace(
+                    mint=PublicKey(0), oracle_symbol=_symbol(""), decimals=0
+                )
+            ],
+            vaults=[],
+            perp_markets=[
+                SimpleNamespace(symbol=_symbol("SOL-PERP"), dex_market=PublicKey(2)),
+                SimpleNamespace(symbol=_symbol(""), dex_market=PublicKey(0)),
+            ],
+        )
+        static = ZoStaticData(
+            state_key=PublicKey(1),
+            state=b"",
+            dex_markets={PublicKey(2): _make_market_data(PublicKey(3), PublicKey(4))},
+            fetched_at=datetime.now(),
+        )
+
+        zo = Zo(None, None, state, None, None, None, static=static)
+
+        assert zo.state is state
+        assert list(zo.dex_markets) == ["SOL-PERP"]
+        assert zo.dex_markets["SOL-PERP"].bids == PublicKey(3)
+        assert zo.dex_markets["SOL-PERP"].asks == PublicKey(4)
+        assert zo.dex_markets["SOL-PERP"].base_lot_size == 100
+
+    @mark.asyncio
+    async def test_refresh_without_static(self, monkeypatch):
+        state = SimpleNamespace(
+            cache=PublicKey(5),
+            collaterals=[
+                SimpleNamespace(
+                    mint=PublicKey(0), oracle_symbol=_symbol(""), decimals=0
+                )
+            ],
+            vaults=[],
+            perp_markets=[
+                SimpleNamespace(symbol=_symbol(""), dex_market=PublicKey(0)),
+            ],
+        )
+        static = ZoStaticData(
+            state_key=PublicKey(1),
+            state=b"",
+            dex_markets={},
+            fetched_at=datetime.now(),
+        )
+        fetched = []
+
+        async def fetch(program, state_key, **_):
+            fetched.append(state_key)
+            return static
+
+        async def fetch_cache(key, commitment):
+            return SimpleNamespace(oracles=[], marks=[])
+
+        monkeypatch.setattr(ZoStaticData, "fetch", fetch)
+        program = SimpleNamespace(
+            account={"Cache": SimpleNamespace(fetch=fetch_cache)},
+            coder=SimpleNamespace(accounts=SimpleNamespace(decode=lambda _: state)),
+        )
+        zo = Zo(
+            program,
+            SimpleNamespace(zo_state_id=PublicKey(1)),
+            state,
+            None,
+            None,
+            None,
+        )
+
+        assert len(zo.collaterals) == 0
+        assert zo.dex_markets == {}
+
+        await zo.refresh(load_orders=False)
+        await zo.refresh(load_orders=False)
+        assert fetched == [PublicKey(1)]
+        assert len(zo.markets) == 0
+        assert zo.static_timestamp == static.fetched_at
@@ -1,5 +1,7 @@
 import json
 import os
+import struct
+from datetime import datetime
 from typing import List, Tuple
 
 import spl.token.instructions as spl_token_ixs
@@ -25,6 +27,8 @@ from marginpy.types import BankVaultType, GroupConfig
 from marginpy.utils.data_conversion import b64str_to_bytes, json_to_account_info
 from marginpy.utils.misc import load_idl
 from marginpy.utils.pda import get_bank_authority
+from marginpy.utp.observation import UtpObservation
+from marginpy.utp.zo.utils.client.dex import AccountFlag, Market
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
@@ -241,17 +245,107 @@ def load_marginfi_account(
     return account_address, marginfi_account
 
 
+# --- UTP observation
+
+
+def make_observation(equity: float) -> UtpObservation:
+    return UtpObservation(
+        timestamp=datetime.now(),
+        equity=equity,
+        free_collateral=equity,
+        init_margin_requirement=0,
+        liquidation_value=equity,
+        is_rebalance_deposit_needed=False,
+        max_rebalance_deposit_amount=0,
+        is_empty=False,
+    )
+
+
+# --- 01 orderbook
+
+# Dex market with 8 base decimals, 6 quote decimals and the keys zeroed
+ZO_MARKET = Market(
+    *([0] * 7),
+    base_lot_size=100,
+    quote_lot_size=10,
+    fee_rate_bps=0,
+    referrer_rebates_accrued=0,
+    funding_index=0,
+    last_updated=0,
+    strike=0,
+    perp_type=0,
+    base_decimals=8,
+    open_interest=0,
+    open_orders_authority=None,
+    prune_authority=None,
+)
+
+
+def make_slab_data(
+    side: AccountFlag, leaves: List[Tuple[int, int, PublicKey]]
+) -> bytes:
+    """
+    Builds 01 slab data holding the specified (key, quantity, control) leaves, as a balanced tree
+    stored in post-order after a free node.
+    """
+
+    nodes: List[bytes] = [struct.pack("<II64x", 3, 0)]
+
+    def build(sorted_leaves) -> int:
+        if len(sorted_leaves) == 1:
+            key, quantity, control = sorted_leaves[0]
+            nodes.append(
+                struct.pack(
+                    "<IBBxx16s32sQQ",
+                    2,
+                    len(nodes) % 256,
+                    1,
+                    key.to_bytes(16, "little"),
+                    bytes(control),
+                    quantity,
+                    key & 0xFF,
+                )
+            )
+            return len(nodes) - 1
+        middle = len(sorted_leaves) // 2
+        left = build(sorted_leaves[:middle])
+        right = build(sorted_leaves[middle:])
+        nodes.append(struct.pack("<II16sII40x", 1, 0, bytes(16), left, right))
+        return len(nodes) - 1
+
+    root = build(sorted(leaves)) if leaves else 0
+    head = struct.pack(
+        "<QQQIIQ",
+        AccountFlag.INITIALIZED | side,
+        len(nodes),
+        1,
+        0,
+        root,
+        len(leaves),
+    )
+    # Trailing uninitialized node, as left by the bump allocator
+    return b"serum" + head + b"".join(nodes) + bytes(72) + b"padding"
+
+
 # --- Misc
 
 
-def load_sample_account_info(
-    name: str = "marginfi_account_2",
-) -> Tuple[PublicKey, AccountInfo]:
+def load_sample_account_info_raw(name: str = "marginfi_account_2") -> dict:
+    """
+    Loads a fixture account as stored, i.e. its `pubkey` and its RPC-encoded `account`.
+    """
+
     account_data_path = os.path.join(
         os.path.dirname(__file__), f"fixtures/accounts/{name}.json"
     )
-    with open(account_data_path) as f:
-        account_info_raw = json.load(f)
+    with open(account_data_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_sample_account_info(
+    name: str = "marginfi_account_2",
+) -> Tuple[PublicKey, AccountInfo]:
+    account_info_raw = load_sample_account_info_raw(name)
     account_address = PublicKey(account_info_raw["pubkey"])
     account_info = json_to_account_info(account_info_raw["account"])
     return account_address, account_info
@@ -0,0 +1,79 @@
+// mango.rs
+#![feature(test)]
+
+extern crate test;
+
+use mango_protocol::state::{
+    HealthCache, MangoAccount, MangoCache, MangoGroup, UserActiveAssets, MAX_PAIRS,
+};
+use marginfi_common::mango;
+use serum_dex::state::OpenOrders;
+use std::fs::read_to_string;
+use test::Bencher;
+
+const FIXTURES_DIR: &str = "../../python/marginpy/tests/fixtures/accounts";
+
+fn load_fixture<T: bytemuck::Pod>(name: &str) -> T {
+    let raw = read_to_string(format!("{}/{}.json", FIXTURES_DIR, name)).unwrap();
+    let account_info: serde_json::Value = serde_json::from_str(&raw).unwrap();
+    let data = base64::decode(account_info["account"]["data"][0].as_str().unwrap()).unwrap();
+
+    bytemuck::pod_read_unaligned(&data)
+}
+
+fn load() -> (Box<MangoGroup>, Box<MangoAccount>, Box<MangoCache>) {
+    (
+        Box::new(load_fixture("mango_group")),
+        Box::new(load_fixture("mango_account")),
+        Box::new(load_fixture("mango_cache")),
+    )
+}
+
+fn init_health_cache(
+    mango_group: &MangoGroup,
+    mango_account: &MangoAccount,
+    mango_cache: &MangoCache,
+) -> HealthCache {
+    let active_assets = UserActiveAssets::new(mango_group, mango_account, vec![]);
+    let mut health_cache = HealthCache::new(active_assets);
+    let open_orders_accounts: Vec<Option<&OpenOrders>> = vec![None; MAX_PAIRS];
+    health_cache
+        .init_vals_with_orders_vec(
+            mango_group,
+            mango_cache,
+            mango_account,
+            &open_orders_accounts,
+        )
+        .unwrap();
+    health_cache
+}
+
+/// Every observation metric, one helper at a time, as the observation used to
+#[bench]
+fn bench_observation_separately(b: &mut Bencher) {
+    let (mango_group, mango_account, mango_cache) = load();
+
+    b.iter(|| {
+        let health_cache = &mut init_health_cache(&mango_group, &mango_account, &mango_cache);
+        (
+            mango::get_free_collateral(health_cache, &mango_group).unwrap(),
+            mango::is_empty(health_cache, &mango_group).unwrap(),
+            mango::is_rebalance_deposit_valid(health_cache, &mango_group).unwrap(),
+            mango::get_max_rebalance_deposit_amount(health_cache, &mango_group).unwrap(),
+            mango::get_init_margin_requirement(health_cache, &mango_group).unwrap(),
+            mango::get_equity(health_cache, &mango_group).unwrap(),
+            mango::get_liquidation_value(health_cache, &mango_group).unwrap(),
+        )
+    })
+}
+
+/// Every observation metric, from a single evaluation of the health components
+#[bench]
+fn bench_observation_fused(b: &mut Bencher) {
+    let (mango_group, mango_account, mango_cache) = load();
+
+    b.iter(|| {
+        let health_cache = &mut init_health_cache(&mango_group, &mango_account, &mango_cache);
+        mango::get_observation(health_cache, &mango_group).unwrap()
+    })
+}
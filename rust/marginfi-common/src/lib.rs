@@ -1,4 +1,5 @@
 pub mod constants;
 pub mod errors;
 pub mod mango;
+pub mod observation;
 pub mod zo;
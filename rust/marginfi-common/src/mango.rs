@@ -1,4 +1,4 @@
-use crate::{constants::DUST_THRESHOLD_F, math_error};
+use crate::{constants::DUST_THRESHOLD_F, math_error, observation::Observation};
 use anyhow::Result;
 use fixed::types::I80F48;
 use mango_protocol::state::{HealthCache, HealthType, MangoGroup};
@@ -6,6 +6,37 @@ use std::cmp::max;
 
 /// Observation helpers
 
+/// Computes every observation metric from a single evaluation of the Init and Equity health components.
+///
+/// Equivalent to calling each of the helpers below, which re-evaluate the components every time.
+pub fn get_observation<'a>(
+    health_cache: &'a mut HealthCache,
+    mango_group: &'a MangoGroup,
+) -> Result<Observation> {
+    let (init_total_collateral, margin_requirement_init) =
+        health_cache.get_health_components(mango_group, HealthType::Init);
+    let (assets, liabilities) = health_cache.get_health_components(mango_group, HealthType::Equity);
+
+    let free_collateral_uncapped = init_total_collateral
+        .checked_sub(margin_requirement_init)
+        .ok_or_else(math_error!())?;
+    let max_rebalance_deposit_amount_uncapped = margin_requirement_init
+        .checked_sub(init_total_collateral)
+        .ok_or_else(math_error!())?;
+    let equity_uncapped = assets.checked_sub(liabilities).ok_or_else(math_error!())?;
+    let equity = max(I80F48::ZERO, equity_uncapped);
+
+    Ok(Observation {
+        free_collateral: max(I80F48::ZERO, free_collateral_uncapped),
+        is_empty: assets < DUST_THRESHOLD_F,
+        is_rebalance_deposit_valid: init_total_collateral <= margin_requirement_init,
+        max_rebalance_deposit_amount: max(I80F48::ZERO, max_rebalance_deposit_amount_uncapped),
+        init_margin_requirement: init_total_collateral,
+        equity,
+        liquidation_value: equity,
+    })
+}
+
 pub fn get_free_collateral<'a>(
     health_cache: &'a mut HealthCache,
     mango_group: &'a MangoGroup,
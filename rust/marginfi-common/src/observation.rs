@@ -0,0 +1,13 @@
+use fixed::types::I80F48;
+
+/// UTP health metrics, as observed by marginfi
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct Observation {
+    pub free_collateral: I80F48,
+    pub is_empty: bool,
+    pub is_rebalance_deposit_valid: bool,
+    pub max_rebalance_deposit_amount: I80F48,
+    pub init_margin_requirement: I80F48,
+    pub equity: I80F48,
+    pub liquidation_value: I80F48,
+}
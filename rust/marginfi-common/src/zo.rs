@@ -1,11 +1,53 @@
-use crate::{constants::DUST_THRESHOLD_F, math_error};
+use crate::{constants::DUST_THRESHOLD_F, math_error, observation::Observation};
 use anyhow::Result;
 use fixed::types::I80F48;
 use std::cmp::max;
 use zo_abi::{Cache, Control, Margin, State};
+pub use zo_utils::MarginContext;
+use zo_utils::MarginFactors;
 
 /// Observation helpers
 
+/// Computes every observation metric from a single pass over the 01 account.
+///
+/// Equivalent to calling each of the helpers below, without re-walking markets and collaterals.
+pub fn get_observation<'a>(
+    zo_margin: &'a Margin,
+    zo_control: &'a Control,
+    zo_state: &'a State,
+    zo_cache: &'a Cache,
+) -> Result<Observation> {
+    let factors = zo_utils::get_margin_factors(zo_margin, zo_control, zo_state, zo_cache)
+        .ok_or_else(math_error!())?;
+
+    Ok(observation_from_factors(factors))
+}
+
+/// Same as `get_observation`, against a state and cache prepared once for many accounts.
+pub fn get_observation_with_context<'a>(
+    zo_margin: &'a Margin,
+    zo_control: &'a Control,
+    context: &'a MarginContext,
+) -> Result<Observation> {
+    let factors = context
+        .get_margin_factors(zo_margin, zo_control)
+        .ok_or_else(math_error!())?;
+
+    Ok(observation_from_factors(factors))
+}
+
+fn observation_from_factors(factors: MarginFactors) -> Observation {
+    Observation {
+        free_collateral: max(I80F48::ZERO, factors.net_free_collateral),
+        is_empty: factors.mf < DUST_THRESHOLD_F,
+        is_rebalance_deposit_valid: factors.net_free_collateral.is_negative(),
+        max_rebalance_deposit_amount: max(I80F48::ZERO, factors.net_free_collateral),
+        init_margin_requirement: factors.imf,
+        equity: factors.mf,
+        liquidation_value: factors.mf,
+    }
+}
+
 pub fn get_free_collateral<'a>(
     zo_margin: &'a Margin,
     zo_control: &'a Control,
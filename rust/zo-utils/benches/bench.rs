@@ -6,7 +6,9 @@ extern crate test;
 use std::fs::read;
 use test::Bencher;
 use zo_abi::{Cache, Control, Margin, State};
-use zo_utils::{get_mf, get_net_free_collateral};
+use zo_utils::{
+    get_margin_factors, get_mf, get_net_free_collateral, MarginContext, MfReturnOption,
+};
 
 // function to benchmark must be annotated with `#[bench]`
 fn load() -> (Margin, Control, State, Cache) {
@@ -46,15 +48,7 @@ fn bench_mf(b: &mut Bencher) {
     // method of Bencher
     let (margin, control, state, cache) = &load();
 
-    b.iter(|| {
-        get_mf(
-            zo_utils::MfReturnOption::Omf,
-            margin,
-            control,
-            state,
-            cache,
-        )
-    })
+    b.iter(|| get_mf(zo_utils::MfReturnOption::Omf, margin, control, state, cache))
 }
 
 #[bench]
@@ -64,24 +58,92 @@ fn bench_get_fc_old(b: &mut Bencher) {
     let (margin, control, state, cache) = &load();
 
     b.iter(|| {
-        let omf = get_mf(
-            zo_utils::MfReturnOption::Omf,
-            margin,
-            control,
-            state,
-            cache,
-        )
-        .unwrap();
-
-        let imf = get_mf(
-            zo_utils::MfReturnOption::Imf,
-            margin,
-            control,
-            state,
-            cache,
-        )
-        .unwrap();
+        let omf = get_mf(zo_utils::MfReturnOption::Omf, margin, control, state, cache).unwrap();
+
+        let imf = get_mf(zo_utils::MfReturnOption::Imf, margin, control, state, cache).unwrap();
 
         let _fc = omf.checked_sub(imf).unwrap();
     })
 }
+
+/// Every margin factor, one `get_mf`/`get_net_free_collateral` call at a time, as the observation used to
+#[bench]
+fn bench_all_factors_separately(b: &mut Bencher) {
+    let (margin, control, state, cache) = &load();
+
+    b.iter(|| {
+        (
+            get_mf(MfReturnOption::Mf, margin, control, state, cache).unwrap(),
+            get_mf(MfReturnOption::Imf, margin, control, state, cache).unwrap(),
+            get_mf(MfReturnOption::Mmf, margin, control, state, cache).unwrap(),
+            get_mf(MfReturnOption::Omf, margin, control, state, cache).unwrap(),
+            get_mf(MfReturnOption::Cmf, margin, control, state, cache).unwrap(),
+            get_net_free_collateral(margin, control, state, cache).unwrap(),
+        )
+    })
+}
+
+/// Every margin factor, in a single pass
+#[bench]
+fn bench_all_factors_fused(b: &mut Bencher) {
+    let (margin, control, state, cache) = &load();
+
+    b.iter(|| get_margin_factors(margin, control, state, cache).unwrap())
+}
+
+const GROUP_SIZE: usize = 1_000;
+
+/// Whole-group scan: the observation metrics (Mf, Imf, net free collateral) of many accounts
+#[bench]
+fn bench_group_scan_separately(b: &mut Bencher) {
+    let (margin, control, state, cache) = &load();
+    let accounts = vec![(*margin, *control); GROUP_SIZE];
+
+    b.iter(|| {
+        accounts
+            .iter()
+            .map(|(margin, control)| {
+                (
+                    get_mf(MfReturnOption::Mf, margin, control, state, cache).unwrap(),
+                    get_mf(MfReturnOption::Imf, margin, control, state, cache).unwrap(),
+                    get_net_free_collateral(margin, control, state, cache).unwrap(),
+                )
+            })
+            .count()
+    })
+}
+
+#[bench]
+fn bench_group_scan_fused(b: &mut Bencher) {
+    let (margin, control, state, cache) = &load();
+    let accounts = vec![(*margin, *control); GROUP_SIZE];
+
+    b.iter(|| {
+        accounts
+            .iter()
+            .map(|(margin, control)| get_margin_factors(margin, control, state, cache).unwrap())
+            .count()
+    })
+}
+
+/// Whole-group scan against a state and cache prepared once
+#[bench]
+fn bench_group_scan_prepared(b: &mut Bencher) {
+    let (margin, control, state, cache) = &load();
+    let accounts = vec![(*margin, *control); GROUP_SIZE];
+
+    b.iter(|| {
+        let context = MarginContext::new(state, cache);
+        accounts
+            .iter()
+            .map(|(margin, control)| context.get_margin_factors(margin, control).unwrap())
+            .count()
+    })
+}
+
+#[bench]
+fn bench_prepare_context(b: &mut Bencher) {
+    let (_, _, state, cache) = &load();
+
+    b.iter(|| MarginContext::new(state, cache))
+}
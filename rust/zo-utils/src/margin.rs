@@ -343,6 +343,399 @@ pub fn get_net_free_collateral(
     Some(equity)
 }
 
+/// Every margin factor of an account, as computed by `get_mf` and `get_net_free_collateral`.
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub struct MarginFactors {
+    pub mf: I80F48,
+    pub imf: I80F48,
+    pub mmf: I80F48,
+    pub omf: I80F48,
+    pub cmf: I80F48,
+    pub net_free_collateral: I80F48,
+}
+
+impl MarginFactors {
+    pub fn get(&self, mf: MfReturnOption) -> I80F48 {
+        match mf {
+            MfReturnOption::Mf => self.mf,
+            MfReturnOption::Imf => self.imf,
+            MfReturnOption::Mmf => self.mmf,
+            MfReturnOption::Omf => self.omf,
+            MfReturnOption::Cmf => self.cmf,
+        }
+    }
+}
+
+/// Adds a weighted collateral position to a margin factor, the way `get_mf` does.
+fn add_weighted_collateral(
+    mf_value: I80F48,
+    weight: I80F48,
+    position: I80F48,
+    price: I80F48,
+    realized_pnl: I80F48,
+    i: usize,
+) -> Option<I80F48> {
+    if weight.is_zero() {
+        return Some(mf_value);
+    }
+
+    let mut mf_value = mf_value;
+    if i == 0 {
+        mf_value = mf_value.checked_add(realized_pnl.checked_mul(weight)?)?;
+
+        if position.is_zero() {
+            return Some(mf_value);
+        }
+    }
+
+    mf_value.checked_add(position.checked_mul(price.checked_mul(weight)?)?)
+}
+
+#[derive(Clone, Copy, Debug)]
+struct MarketContext {
+    price: Option<I80F48>,
+    imf_weight: I80F48,
+    mmf_weight: I80F48,
+    cmf_weight: I80F48,
+    funding_index: Option<I80F48>,
+    decimals_divisor: Option<I80F48>,
+}
+
+impl MarketContext {
+    fn new(state: &State, cache: &Cache, i: usize) -> Self {
+        let market = &state.perp_markets[i];
+        let price = match market.perp_type {
+            PerpType::Future => get_oracle(cache, &market.oracle_symbol).map(|o| o.price.into()),
+            PerpType::Square => Some(cache.marks[i].price.into()),
+            _ => Some(I80F48_ZERO),
+        };
+        let base_weight = I80F48::from_num(market.base_imf);
+
+        Self {
+            price,
+            imf_weight: base_weight.mul(INV_1000),
+            mmf_weight: base_weight.mul(INV_0500),
+            cmf_weight: base_weight.mul(INV_0625),
+            funding_index: I80F48::checked_from_num({ cache.funding_cache }[i]),
+            decimals_divisor: I80F48_POWERS_OF_TEN
+                .get(market.asset_decimals as usize)
+                .copied(),
+        }
+    }
+
+    fn calc_realized_pnl(&self, info: &OpenOrdersInfo, position: I80F48) -> Option<I80F48> {
+        let funding_diff = I80F48::from_num(info.funding_index).checked_sub(self.funding_index?)?;
+
+        if funding_diff.is_zero() {
+            return Some(info.realized_pnl.into());
+        }
+
+        let unrealized_funding = funding_diff
+            .checked_mul(position)?
+            .checked_div(self.decimals_divisor?)?;
+
+        unrealized_funding.checked_add(info.realized_pnl.into())
+    }
+}
+
+#[derive(Clone, Copy, Debug)]
+struct CollateralContext {
+    supply_price: Option<I80F48>,
+    borrow_price: Option<I80F48>,
+    /// Mf/Omf weight of non-negative positions
+    mf_weight: I80F48,
+    /// Net free collateral weight of non-negative positions
+    base_weight: I80F48,
+    /// Imf/Cmf weight of negative positions
+    imf_weight: Option<I80F48>,
+    /// Mmf weight of negative positions
+    mmf_weight: Option<I80F48>,
+}
+
+impl CollateralContext {
+    fn new(state: &State, cache: &Cache, i: usize) -> Self {
+        let weight = I80F48::from_num(state.collaterals[i].weight);
+        let unadjusted_price: Option<I80F48> =
+            get_oracle(cache, &state.collaterals[i].oracle_symbol).map(|o| o.price.into());
+        let supply_multiplier: I80F48 = cache.borrow_cache[i].supply_multiplier.into();
+        let borrow_multiplier: I80F48 = cache.borrow_cache[i].borrow_multiplier.into();
+
+        Self {
+            supply_price: unadjusted_price.and_then(|p| p.checked_mul(supply_multiplier)),
+            borrow_price: unadjusted_price.and_then(|p| p.checked_mul(borrow_multiplier)),
+            mf_weight: weight.mul(INV_1000),
+            base_weight: weight.div(I80F48_1000),
+            imf_weight: SPOT_IMF.checked_div(weight).map(|w| -w.sub(I80F48_ONE)),
+            mmf_weight: SPOT_MMF.checked_div(weight).map(|w| -w.sub(I80F48_ONE)),
+        }
+    }
+}
+
+/// 01 state and cache, digested once to compute the margin factors of many accounts.
+///
+/// Oracle prices, borrow/supply adjusted collateral prices, weights and funding indexes are
+/// resolved up front, so that evaluating an account only walks its own positions.
+/// Results are identical to `get_mf`/`get_net_free_collateral`, except that a missing oracle
+/// yields `None` instead of panicking. In particular, borrowing a zero-weight collateral leaves
+/// Mf and Omf defined while the other factors and the net free collateral are `None`.
+#[derive(Clone, Debug)]
+pub struct MarginContext {
+    markets: Vec<MarketContext>,
+    collaterals: Vec<CollateralContext>,
+}
+
+impl MarginContext {
+    pub fn new(state: &State, cache: &Cache) -> Self {
+        Self {
+            markets: (0..(state.total_markets as usize))
+                .map(|i| MarketContext::new(state, cache, i))
+                .collect(),
+            collaterals: (0..(state.total_collaterals as usize))
+                .map(|i| CollateralContext::new(state, cache, i))
+                .collect(),
+        }
+    }
+
+    /// Computes every `MfReturnOption` variant and the net free collateral in a single walk over
+    /// the account markets and collaterals.
+    ///
+    /// Returns `None` if any of the factors overflows or is undefined.
+    pub fn get_margin_factors(&self, margin: &Margin, control: &Control) -> Option<MarginFactors> {
+        self.compute_margin_factors(margin, control)?.complete()
+    }
+
+    pub fn get_mf(&self, mf: MfReturnOption, margin: &Margin, control: &Control) -> Option<I80F48> {
+        self.compute_margin_factors(margin, control)?.get(mf)
+    }
+
+    pub fn get_net_free_collateral(&self, margin: &Margin, control: &Control) -> Option<I80F48> {
+        self.compute_margin_factors(margin, control)?
+            .net_free_collateral
+    }
+
+    fn compute_margin_factors(
+        &self,
+        margin: &Margin,
+        control: &Control,
+    ) -> Option<PartialMarginFactors> {
+        compute_margin_factors(
+            self.markets.len(),
+            |i| self.markets[i],
+            self.collaterals.len(),
+            |i| self.collaterals[i],
+            margin,
+            control,
+        )
+    }
+}
+
+/// Margin factors as computed by `compute_margin_factors`.
+///
+/// Borrowing a zero-weight collateral leaves its Imf/Cmf and Mmf weights undefined, hence the
+/// Imf, Mmf, Cmf and net free collateral as well, as with `get_mf`/`get_net_free_collateral`.
+struct PartialMarginFactors {
+    mf: I80F48,
+    omf: I80F48,
+    imf: Option<I80F48>,
+    mmf: Option<I80F48>,
+    cmf: Option<I80F48>,
+    net_free_collateral: Option<I80F48>,
+}
+
+impl PartialMarginFactors {
+    fn get(&self, mf: MfReturnOption) -> Option<I80F48> {
+        match mf {
+            MfReturnOption::Mf => Some(self.mf),
+            MfReturnOption::Imf => self.imf,
+            MfReturnOption::Mmf => self.mmf,
+            MfReturnOption::Omf => Some(self.omf),
+            MfReturnOption::Cmf => self.cmf,
+        }
+    }
+
+    fn complete(self) -> Option<MarginFactors> {
+        Some(MarginFactors {
+            mf: self.mf,
+            imf: self.imf?,
+            mmf: self.mmf?,
+            omf: self.omf,
+            cmf: self.cmf?,
+            net_free_collateral: self.net_free_collateral?,
+        })
+    }
+}
+
+/// Walks the account markets and collaterals, resolving the context of the active ones only
+/// through `market_context`/`collateral_context`, either precomputed (`MarginContext`) or on demand.
+fn compute_margin_factors(
+    n_markets: usize,
+    market_context: impl Fn(usize) -> MarketContext,
+    n_collaterals: usize,
+    collateral_context: impl Fn(usize) -> CollateralContext,
+    margin: &Margin,
+    control: &Control,
+) -> Option<PartialMarginFactors> {
+    let mut imf_value = I80F48_ZERO;
+    let mut mmf_value = I80F48_ZERO;
+    let mut cmf_value = I80F48_ZERO;
+    // Mf and Omf only differ in the way unrealized PnL is accounted for, added at the end
+    let mut mf_omf_value = I80F48_ZERO;
+    // Net free collateral equity, before unrealized PnL and margin requirement (Imf)
+    let mut nfc_equity = I80F48_ZERO;
+
+    let mut unrealized_pnl = I80F48_ZERO;
+    let mut realized_pnl = I80F48_ZERO;
+
+    // Cleared when a zero-weight collateral is borrowed, Imf/Cmf and Mmf weights being undefined
+    let mut is_requirement_defined = true;
+
+    for i in 0..n_markets {
+        let info = control.open_orders_agg[i];
+        if info.pos_size == 0 && info.coin_on_asks == 0 && info.coin_on_bids == 0 {
+            continue;
+        }
+        let market = market_context(i);
+        let price = market.price?;
+        let position = I80F48::from(info.pos_size);
+
+        if info.pos_size != 0 {
+            unrealized_pnl =
+                unrealized_pnl.checked_add(calc_unrealized_pnl(&info, price, position)?)?;
+            realized_pnl = realized_pnl.checked_add(market.calc_realized_pnl(&info, position)?)?
+        }
+
+        let order_position = max(
+            position.checked_add(info.coin_on_bids.into())?.abs(),
+            position.checked_sub(info.coin_on_asks.into())?.abs(),
+        );
+        let mmf_weight = if position.is_negative() {
+            market.mmf_weight.neg()
+        } else {
+            market.mmf_weight
+        };
+
+        for (weight, mf_position, mf_value) in [
+            (market.imf_weight, order_position, &mut imf_value),
+            (market.cmf_weight, order_position, &mut cmf_value),
+            (mmf_weight, position, &mut mmf_value),
+        ] {
+            if weight.is_zero() {
+                continue;
+            }
+
+            let weighted_price = price.checked_mul(weight)?;
+            *mf_value = mf_value.checked_add(mf_position.checked_mul(weighted_price)?)?;
+        }
+    }
+
+    for i in 0..n_collaterals {
+        if margin.collateral[i].data == 0 && (i != 0 || realized_pnl.is_zero()) {
+            continue;
+        }
+        let collateral = collateral_context(i);
+
+        let position = I80F48::from(margin.collateral[i]);
+
+        // Imf and Cmf, as well as Mf and Omf, share the same collateral weights
+        let (price, mf_omf_weight, imf_cmf_weight, mmf_weight) = if position.is_negative() {
+            let (imf_cmf_weight, mmf_weight) = match (collateral.imf_weight, collateral.mmf_weight)
+            {
+                (Some(imf_cmf_weight), Some(mmf_weight)) => (imf_cmf_weight, mmf_weight),
+                _ => {
+                    is_requirement_defined = false;
+                    (I80F48_ZERO, I80F48_ZERO)
+                }
+            };
+            (
+                collateral.borrow_price?,
+                I80F48_ONE,
+                imf_cmf_weight,
+                mmf_weight,
+            )
+        } else {
+            (
+                collateral.supply_price?,
+                collateral.mf_weight,
+                I80F48_ZERO,
+                I80F48_ZERO,
+            )
+        };
+
+        mf_omf_value = add_weighted_collateral(
+            mf_omf_value,
+            mf_omf_weight,
+            position,
+            price,
+            realized_pnl,
+            i,
+        )?;
+        imf_value =
+            add_weighted_collateral(imf_value, imf_cmf_weight, position, price, realized_pnl, i)?;
+        cmf_value =
+            add_weighted_collateral(cmf_value, imf_cmf_weight, position, price, realized_pnl, i)?;
+        mmf_value =
+            add_weighted_collateral(mmf_value, mmf_weight, position, price, realized_pnl, i)?;
+
+        if !position.is_negative() {
+            if i == 0 {
+                nfc_equity =
+                    nfc_equity.checked_add(realized_pnl.checked_mul(collateral.base_weight)?)?;
+            }
+            nfc_equity = nfc_equity
+                .checked_add(position.checked_mul(price.checked_mul(collateral.base_weight)?)?)?;
+        } else {
+            if i == 0 {
+                nfc_equity = nfc_equity.checked_add(realized_pnl)?;
+            }
+            nfc_equity = nfc_equity.checked_add(position.checked_mul(price)?)?;
+        }
+    }
+
+    let mf_value = mf_omf_value.checked_add(unrealized_pnl)?;
+    let omf_value = mf_omf_value.checked_add(min(unrealized_pnl, I80F48_ZERO))?;
+    // The net free collateral margin requirement is exactly the Imf
+    let net_free_collateral = nfc_equity
+        .checked_add(min(unrealized_pnl, I80F48_ZERO))?
+        .checked_sub(imf_value)?;
+
+    let requirement = |value: I80F48| Some(value).filter(|_| is_requirement_defined);
+
+    Some(PartialMarginFactors {
+        mf: mf_value,
+        omf: omf_value,
+        imf: requirement(imf_value),
+        mmf: requirement(mmf_value),
+        cmf: requirement(cmf_value),
+        net_free_collateral: requirement(net_free_collateral),
+    })
+}
+
+/// Computes every `MfReturnOption` variant and the net free collateral in a single walk over
+/// markets and collaterals.
+///
+/// Results are identical to separate `get_mf`/`get_net_free_collateral` calls.
+/// Only the markets and collaterals the account is exposed to are resolved against the state and
+/// cache. To evaluate many accounts against the same state and cache, build a `MarginContext`
+/// once instead.
+/// Returns `None` if any of the factors overflows or is undefined, e.g. when borrowing a
+/// zero-weight collateral.
+pub fn get_margin_factors(
+    margin: &Margin,
+    control: &Control,
+    state: &State,
+    cache: &Cache,
+) -> Option<MarginFactors> {
+    compute_margin_factors(
+        state.total_markets as usize,
+        |i| MarketContext::new(state, cache, i),
+        state.total_collaterals as usize,
+        |i| CollateralContext::new(state, cache, i),
+        margin,
+        control,
+    )?
+    .complete()
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -379,6 +772,25 @@ mod tests {
 
         let fc = get_net_free_collateral(margin, control, state, cache).unwrap();
         assert_eq!(fc, fixed!(45393159772.68863455210041: I80F48));
+
+        assert_eq!(
+            get_margin_factors(margin, control, state, cache).unwrap(),
+            MarginFactors {
+                mf: mf_value,
+                imf: imf_value,
+                mmf: mmf_value,
+                omf: omf_value,
+                cmf: cmf_value,
+                net_free_collateral: fc,
+            }
+        );
+
+        let context = MarginContext::new(state, cache);
+        assert_eq!(
+            context.get_margin_factors(margin, control),
+            get_margin_factors(margin, control, state, cache)
+        );
+        assert_eq!(context.get_net_free_collateral(margin, control), Some(fc));
     }
 
     #[test]
@@ -417,5 +829,70 @@ mod tests {
         assert_eq!(omf_value, fixed!(80074390.04542256130746: I80F48));
         assert_eq!(cmf_value, fixed!(6382552.375285145411528: I80F48));
         assert_eq!(fc, fixed!(69857845.242125660013027: I80F48));
+
+        assert_eq!(
+            get_margin_factors(margin, control, state, cache).unwrap(),
+            MarginFactors {
+                mf: mf_value,
+                imf: imf_value,
+                mmf: mmf_value,
+                omf: omf_value,
+                cmf: cmf_value,
+                net_free_collateral: fc,
+            }
+        );
+
+        let context = MarginContext::new(state, cache);
+        assert_eq!(
+            context.get_margin_factors(margin, control),
+            get_margin_factors(margin, control, state, cache)
+        );
+        assert_eq!(context.get_net_free_collateral(margin, control), Some(fc));
+    }
+
+    #[test]
+    fn zero_weight_collateral_borrow() {
+        let zo_margin_data = read("../test-data/zo_margin-2").unwrap();
+        let zo_control_data = read("../test-data/zo_control-2").unwrap();
+        let zo_state_data = read("../test-data/zo_state-2").unwrap();
+        let zo_cache_data = read("../test-data/zo_cache-2").unwrap();
+
+        let mut margin: zo_abi::Margin =
+            *bytemuck::from_bytes::<zo_abi::Margin>(&zo_margin_data.as_slice()[8..]);
+        let control: &zo_abi::Control =
+            bytemuck::from_bytes::<zo_abi::Control>(&zo_control_data.as_slice()[8..]);
+        let mut state: zo_abi::State =
+            *bytemuck::from_bytes::<zo_abi::State>(&zo_state_data.as_slice()[8..]);
+        let cache: &zo_abi::Cache =
+            bytemuck::from_bytes::<zo_abi::Cache>(&zo_cache_data.as_slice()[8..]);
+
+        // Turn a deposit into a borrow of a collateral with no weight
+        let i = (0..(state.total_collaterals as usize))
+            .find(|&i| margin.collateral[i].data > 0)
+            .unwrap();
+        margin.collateral[i].data = -margin.collateral[i].data;
+        state.collaterals[i].weight = 0;
+
+        let context = MarginContext::new(&state, cache);
+        for mf in [MfReturnOption::Mf, MfReturnOption::Omf] {
+            let expected = get_mf(mf, &margin, control, &state, cache);
+            assert!(expected.is_some());
+            assert_eq!(context.get_mf(mf, &margin, control), expected);
+        }
+        for mf in [
+            MfReturnOption::Imf,
+            MfReturnOption::Mmf,
+            MfReturnOption::Cmf,
+        ] {
+            assert_eq!(get_mf(mf, &margin, control, &state, cache), None);
+            assert_eq!(context.get_mf(mf, &margin, control), None);
+        }
+        assert_eq!(
+            get_net_free_collateral(&margin, control, &state, cache),
+            None
+        );
+        assert_eq!(context.get_net_free_collateral(&margin, control), None);
+        assert_eq!(get_margin_factors(&margin, control, &state, cache), None);
+        assert_eq!(context.get_margin_factors(&margin, control), None);
     }
 }